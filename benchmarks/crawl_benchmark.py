@@ -0,0 +1,120 @@
+"""
+Crawl benchmark against the local synthetic catalog (utils.catalog_server).
+
+    python benchmarks/crawl_benchmark.py --pages 200 --products-per-page 20 --latency 0.005
+
+Reports pages/sec and products/sec for every crawl mode.
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import multiprocessing
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import requests
+
+from utils.catalog_server import CatalogServer
+from utils.extract import scrape_product
+from utils.workqueue import CrawlQueue, run_worker, merge_results
+
+
+def crawl_sequential(server):
+    return scrape_product(server.base_url, server.first_page_url, delay=0)
+
+
+def crawl_sequential_session(server):
+    with requests.Session() as session:
+        return scrape_product(server.base_url, server.first_page_url, delay=0, session=session)
+
+
+def crawl_workqueue(server, workers=4):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        queue_url = f"sqlite:///{os.path.join(tmp_dir, 'queue.db')}"
+        results_dir = os.path.join(tmp_dir, "results")
+        with CrawlQueue(queue_url) as queue:
+            queue.enqueue(range(1, server.pages + 1))
+
+        processes = [
+            multiprocessing.Process(target=run_worker, args=(queue_url, results_dir, server.base_url,
+                                                            server.first_page_url))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        return merge_results(queue_url)
+
+
+# Crawl mode name -> callable(server) returning the list of scraped products
+CRAWL_MODES = {
+    "sequential": crawl_sequential,
+    "sequential+session": crawl_sequential_session,
+    "workqueue-4": crawl_workqueue,
+}
+
+
+def run_benchmark(mode, crawl, server_options, repeat=1):
+    best = None
+    for _ in range(repeat):
+        with CatalogServer(**server_options) as server:
+            started = time.perf_counter()
+            products = crawl(server)
+            seconds = time.perf_counter() - started
+            result = {
+                "mode": mode,
+                "pages": server.stats["pages_served"],
+                "products": len(products),
+                "connections": server.stats["connections"],
+                "seconds": seconds,
+            }
+        if best is None or result["seconds"] < best["seconds"]:
+            best = result
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--products-per-page", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--link-past-end", action="store_true",
+                        help="Link the last page to a page that answers 404")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per mode; the fastest is reported")
+    parser.add_argument("--modes", default=",".join(CRAWL_MODES), help="Comma-separated crawl modes")
+    args = parser.parse_args(argv)
+
+    server_options = {
+        "pages": args.pages,
+        "products_per_page": args.products_per_page,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "error_rate": args.error_rate,
+        "link_past_end": args.link_past_end,
+    }
+
+    results = []
+    for mode in args.modes.split(","):
+        # scrape_product prints a line per page; keep the report readable
+        with open(os.devnull, "w") as devnull:
+            stdout, sys.stdout = sys.stdout, devnull
+            try:
+                results.append(run_benchmark(mode, CRAWL_MODES[mode], server_options, args.repeat))
+            finally:
+                sys.stdout = stdout
+
+    print(f"{'mode':<22}{'pages':>8}{'products':>10}{'conns':>8}{'seconds':>10}{'pages/s':>10}{'products/s':>12}")
+    for result in results:
+        seconds = result["seconds"]
+        print(f"{result['mode']:<22}{result['pages']:>8}{result['products']:>10}{result['connections']:>8}"
+              f"{seconds:>10.3f}{result['pages'] / seconds:>10.1f}{result['products'] / seconds:>12.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,48 @@
 import os
+import sys
+import time
+import signal
+import argparse
+import threading
 from dotenv import load_dotenv
 
-from utils.extract import scrape_product
-from utils.transform import transform_to_DataFrame
-from utils.load import store_to_postgre, save_to_csv, save_to_json
+from utils.pipeline import Pipeline
+from utils.scheduler import RunLock, run_scheduled
 
-def main():
-    # Load environment variables dari .env file
-    load_dotenv()
+# Modul tahap ETL (pandas, numpy, bs4, requests, psycopg2) di-import di dalam
+# fungsi yang membutuhkannya, sehingga run yang hanya menjalankan sebagian
+# tahap (misalnya hanya scraping) tidak membayar biaya import semuanya.
 
-    FIRST_PAGE_URL = 'https://fashion-studio.dicoding.dev/'
-    BASE_URL = 'https://fashion-studio.dicoding.dev/page{}'
+FIRST_PAGE_URL = 'https://fashion-studio.dicoding.dev/'
+BASE_URL = 'https://fashion-studio.dicoding.dev/page{}'
 
-    print("🔍 Memulai proses scraping data produk...")
-    raw_data = scrape_product(BASE_URL, FIRST_PAGE_URL)
+COMMANDS = ("run", "daemon", "replay", "pack", "reprocess", "partitions", "summaries", "crawl-worker",
+            "crawl-coordinator")
 
-    if not raw_data:
-        print("Tidak ada data yang berhasil diambil.")
-        return
+STAGES = ("extract", "transform", "csv", "json", "postgres")
+SINK_STAGES = ("csv", "json", "postgres")
+# Subcommand yang memuat data ke sink dan tidak boleh tumpang tindih dengan daemon
+LOCKED_COMMANDS = ("run", "replay", "crawl-coordinator")
+RAW_PRODUCTS_PATH = "raw_products.jsonl"
 
-    print(f"{len(raw_data)} produk berhasil diambil.")
 
-    print("Melakukan transformasi data...")
-    transformed_df = transform_to_DataFrame(raw_data)
+def parse_stages(value):
+    """Mem-parsing opsi --stages (daftar tahap dipisahkan koma) menjadi tuple berurutan."""
+    stages = {stage.strip() for stage in value.split(",") if stage.strip()}
+    unknown = stages - set(STAGES)
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"Tahap tidak dikenal: {', '.join(sorted(unknown))}. Pilihan: {', '.join(STAGES)}")
+    if not stages:
+        raise argparse.ArgumentTypeError("Pilih minimal satu tahap")
+    if "extract" in stages and stages & set(SINK_STAGES) and "transform" not in stages:
+        raise argparse.ArgumentTypeError("Tahap extract dan sink membutuhkan tahap transform di antaranya")
+    return tuple(stage for stage in STAGES if stage in stages)
 
-    print("Menyimpan data ke file lokal...")
-    save_to_csv(transformed_df, "products.csv")
-    save_to_json(transformed_df, "products.json")
 
-    print("Menyimpan data ke PostgreSQL...")
-    connection_params = {
+def get_connection_params():
+    """Membaca parameter koneksi PostgreSQL dari environment variables."""
+    return {
         "host": os.getenv("DB_HOST"),
         "database": os.getenv("DB_NAME"),
         "user": os.getenv("DB_USER"),
@@ -37,12 +50,731 @@ def main():
         "port": int(os.getenv("DB_PORT", 5432))  # fallback default port
     }
 
-    success = store_to_postgre(transformed_df, table_name="products", connection_params=connection_params)
 
-    if success:
+def run_etl(stages=STAGES, raw_path=RAW_PRODUCTS_PATH, input_path="products.csv", dedup_state=None,
+            archive_dir=None, replay_dir=None, workers=None, session=None, connection_pool=None,
+            dedup_cache=None, partitioned=False, postgres_workers=1, database_url=None,
+            google_sheet=None, google_credentials=None, google_sheet_state=None, exchange_rate=None,
+            rate_ttl=3600, output_dir=None, output_format="csv", partition_by=("Gender",), summaries=False):
+    """Menjalankan pipeline ETL: scraping, transformasi, deduplikasi, dan penyimpanan.
+
+    Args:
+        stages: Tahap yang dijalankan (subset dari STAGES). Jika extract dijalankan
+            tanpa transform, produk mentah disimpan ke raw_path; jika transform
+            dijalankan tanpa extract, produk mentah dibaca dari raw_path; jika
+            hanya sink yang dijalankan, data dibaca dari input_path.
+        raw_path: File JSON Lines produk mentah hasil scraping
+        input_path: File hasil transformasi yang disimpan ulang jika transform dilewati
+        dedup_state: File hash produk yang sudah dimuat pada run sebelumnya (opsional)
+        archive_dir: Folder arsip untuk menyimpan HTML mentah setiap halaman (opsional)
+        replay_dir: Folder arsip atau file pack yang diekstrak ulang sebagai pengganti scraping (opsional)
+        workers: Jumlah proses untuk ekstraksi ulang dari arsip
+        session: requests.Session yang dipakai ulang untuk scraping (opsional)
+        connection_pool: Pool koneksi PostgreSQL yang tetap terbuka antar run (opsional)
+        dedup_cache: Dictionary untuk menyimpan hash deduplikasi di memori antar run (opsional)
+        partitioned: Simpan ke tabel PostgreSQL yang dipartisi per bulan pada created_at
+        postgres_workers: Jumlah koneksi paralel untuk load PostgreSQL (lebih dari 1
+            memakai parallel_store_to_postgre)
+        database_url: URL database tujuan tahap postgres (misalnya sqlite:///products.db);
+            backend load dipilih dari URL (lihat utils.backends.get_backend)
+        google_sheet: ID spreadsheet tujuan; jika diisi, data juga dikirim ke Google Sheets
+        google_credentials: File kunci service account Google
+        google_sheet_state: File state hash blok agar hanya range yang berubah yang ditulis ulang
+        exchange_rate: Sumber kurs USD->IDR (lihat utils.exchange.get_rate_provider);
+            default env EXCHANGE_RATE_SOURCE, env USD_IDR_RATE, atau 16000
+        rate_ttl: Lama (detik) kurs disimpan di cache sebelum diambil ulang
+        output_dir: Folder dataset terpartisi (run_date=.../gender=.../part-N); jika diisi,
+            data juga ditulis ke sana (lihat utils.dataset.write_partitioned)
+        output_format: Format file dataset terpartisi: csv, jsonl, atau parquet
+        partition_by: Kolom partisi di bawah run_date
+        summaries: Perbarui tabel ringkasan products_summary dan products_run_summary
+            secara inkremental dari batch yang dimuat ke PostgreSQL
+    """
+    import uuid
+    from utils.records import save_raw_products, load_raw_products
+
+    sinks = [stage for stage in SINK_STAGES if stage in stages]
+    if google_sheet:
+        sinks.append("sheets")
+    if output_dir:
+        sinks.append("dataset")
+
+    if "extract" in stages:
+        if replay_dir:
+            from utils.archive import replay_archive, replay_pack
+            print(f"📦 Mengekstrak ulang data produk dari arsip {replay_dir}...")
+            if os.path.isfile(replay_dir):
+                raw_data = replay_pack(replay_dir, workers=workers)
+            else:
+                raw_data = replay_archive(replay_dir, workers=workers)
+        else:
+            from utils.extract import scrape_product
+            from utils.archive import PageArchive
+            print("🔍 Memulai proses scraping data produk...")
+            archive = PageArchive(archive_dir) if archive_dir else None
+            raw_data = scrape_product(BASE_URL, FIRST_PAGE_URL, archive=archive, session=session)
+
+        if not raw_data:
+            print("Tidak ada data yang berhasil diambil.")
+            return
+
+        print(f"{len(raw_data)} produk berhasil diambil.")
+
+        if "transform" not in stages:
+            save_raw_products(raw_data, raw_path)
+            print(f"✅ Produk mentah disimpan ke {raw_path}.")
+            return
+    elif "transform" in stages:
+        print(f"Membaca produk mentah dari {raw_path}...")
+        raw_data = load_raw_products(raw_path)
+
+    seen_hashes = None
+    if "transform" in stages:
+        from utils.transform import transform_to_DataFrame, optimize_dtypes, memory_footprint
+        from utils.dedup import drop_duplicate_products, load_seen_hashes
+
+        from utils.memo import format_cache_stats
+        from utils.exchange import resolve_rate
+
+        # Kurs diambil sekali per batch (melalui cache TTL) lalu dikalikan ke seluruh kolom harga
+        try:
+            rate = resolve_rate(exchange_rate, rate_ttl)
+        except Exception as e:
+            print(f"❌ Kurs USD->IDR tidak dapat diambil: {e}")
+            return
+        print(f"Kurs USD->IDR: {rate.rate:g} ({rate.source}, {rate.timestamp.isoformat()})")
+
+        print("Melakukan transformasi data...")
+        transformed_df = transform_to_DataFrame(raw_data, rate=rate)
+        # Cache parser/intern: rasio hit tinggi berarti biaya mengikuti jumlah nilai unik, bukan jumlah baris
+        for line in format_cache_stats():
+            print(f"   Cache {line}")
+
+        # Buang produk duplikat (dalam batch ini dan, jika ada state, dari run sebelumnya)
+        if dedup_cache is not None and "hashes" in dedup_cache:
+            seen_hashes = dedup_cache["hashes"]
+        else:
+            seen_hashes = load_seen_hashes(dedup_state) if dedup_state else None
+        total_rows = len(transformed_df)
+        transformed_df, seen_hashes = drop_duplicate_products(transformed_df, seen_hashes)
+        print(f"{total_rows - len(transformed_df)} produk duplikat dibuang, {len(transformed_df)} produk baru.")
+
+        if transformed_df.empty:
+            print("Tidak ada produk baru untuk disimpan.")
+            return
+
+        # Optimasi tipe data kolom sebelum disimpan ke semua sink
+        memory_before = memory_footprint(transformed_df)
+        transformed_df = optimize_dtypes(transformed_df)
+        memory_after = memory_footprint(transformed_df)
+        print(f"Memori DataFrame: {memory_before / 1024:.1f} KiB -> {memory_after / 1024:.1f} KiB "
+              f"({len(transformed_df)} baris)")
+    elif sinks:
+        import pandas as pd
+        from utils.reprocess import iter_file_chunks
+        print(f"Membaca data hasil transformasi dari {input_path}...")
+        transformed_df = pd.concat(iter_file_chunks(input_path), ignore_index=True)
+
+    if not sinks:
+        print("✅ Tahap yang dipilih selesai.")
+        return
+
+    results = {}
+    # Satu run_id per run untuk tabel ringkasan per run
+    run_id = uuid.uuid4().hex
+    if "csv" in sinks or "json" in sinks:
+        from utils.load import save_to_csv, save_to_json
+        print("Menyimpan data ke file lokal...")
+        if "csv" in sinks:
+            results["csv"] = save_to_csv(transformed_df, "products.csv")
+        if "json" in sinks:
+            results["json"] = save_to_json(transformed_df, "products.json")
+
+    if "postgres" in sinks and database_url:
+        from utils.backends import store_to_database
+        print("Menyimpan data ke database...")
+        results["postgres"] = store_to_database(transformed_df, database_url, table_name="products",
+                                                summaries=summaries, run_id=run_id)
+    elif "postgres" in sinks and postgres_workers > 1:
+        from utils.load import parallel_store_to_postgre
+        print(f"Menyimpan data ke PostgreSQL melalui {postgres_workers} koneksi...")
+        results["postgres"] = parallel_store_to_postgre(transformed_df, table_name="products",
+                                                        connection_params=get_connection_params(),
+                                                        workers=postgres_workers,
+                                                        partitioned=partitioned, summaries=summaries,
+                                                        run_id=run_id) is not None
+    elif "postgres" in sinks:
+        from utils.load import store_to_postgre
+        print("Menyimpan data ke PostgreSQL...")
+        results["postgres"] = store_to_postgre(transformed_df, table_name="products",
+                                               connection_params=get_connection_params(),
+                                               connection_pool=connection_pool,
+                                               partitioned=partitioned, summaries=summaries,
+                                               run_id=run_id)
+
+    if "dataset" in sinks:
+        from utils.dataset import write_partitioned
+        print(f"Menyimpan data ke dataset terpartisi {output_dir}...")
+        results["dataset"] = write_partitioned(transformed_df, output_dir, partition_by=partition_by,
+                                               file_format=output_format)
+
+    if "sheets" in sinks:
+        from utils.load import save_to_google_sheets
+        print("Menyimpan data ke Google Sheets...")
+        results["sheets"] = save_to_google_sheets(transformed_df, google_sheet,
+                                                  credentials_path=google_credentials,
+                                                  state_path=google_sheet_state)
+
+    # State deduplikasi hanya diperbarui jika semua sink berhasil, agar produk tidak hilang
+    if dedup_state and seen_hashes is not None and all(results.values()):
+        from utils.dedup import save_seen_hashes
+        save_seen_hashes(dedup_state, seen_hashes)
+        if dedup_cache is not None:
+            dedup_cache["hashes"] = seen_hashes
+
+    if all(results.values()):
         print("✅ Proses ETL selesai dengan sukses.")
     else:
-        print("⚠️ Penyimpanan ke database gagal.")
+        failed = ", ".join(name for name, saved in results.items() if not saved)
+        print(f"⚠️ Penyimpanan gagal: {failed}.")
+
+
+def run_etl_pipeline(sinks=SINK_STAGES, dedup_state=None, archive_dir=None, transform_workers=1,
+                     postgres_workers=1, queue_size=8, monitor_interval=5.0, partitioned=False,
+                     exchange_rate=None, rate_ttl=3600, output_dir=None, output_format="csv",
+                     partition_by=("Gender",), summaries=False, database_url=None, google_sheet=None,
+                     google_credentials=None, google_sheet_state=None):
+    """Menjalankan ETL sebagai pipeline bertahap: extract -> transform -> csv/json/postgres.
+
+    Setiap halaman hasil scraping langsung diteruskan ke tahap berikutnya melalui
+    antrean berukuran terbatas, sehingga sink yang lambat (misalnya PostgreSQL)
+    menahan tahap sebelumnya alih-alih menumpuk seluruh katalog di memori.
+
+    Args:
+        sinks: Sink yang dijalankan (subset dari SINK_STAGES)
+        dedup_state: File hash produk yang sudah dimuat pada run sebelumnya (opsional)
+        archive_dir: Folder arsip untuk menyimpan HTML mentah setiap halaman (opsional)
+        transform_workers: Jumlah thread tahap transformasi
+        postgres_workers: Jumlah thread (dan koneksi) tahap PostgreSQL
+        queue_size: Kapasitas antrean setiap tahap
+        monitor_interval: Interval (detik) pencetakan kedalaman antrean dan throughput
+        partitioned: Simpan ke tabel PostgreSQL yang dipartisi per bulan pada created_at
+        exchange_rate: Sumber kurs USD->IDR (lihat utils.exchange.get_rate_provider)
+        rate_ttl: Lama (detik) kurs disimpan di cache sebelum diambil ulang
+        output_dir: Folder dataset terpartisi; batch ditampung dan setiap flush menambah file part-N baru
+        output_format: Format file dataset terpartisi: csv, jsonl, atau parquet
+        partition_by: Kolom partisi di bawah run_date
+        summaries: Perbarui tabel ringkasan dari setiap batch; semua batch satu run
+            dijumlahkan pada run_id yang sama di products_run_summary
+        database_url: URL database tujuan tahap postgres (lihat utils.backends.get_backend);
+            tanpa URL, batch disimpan ke PostgreSQL dari koneksi DB_*
+        google_sheet: ID spreadsheet tujuan; batch dikumpulkan dan sheet ditulis sekali di akhir
+        google_credentials: File kunci service account Google
+        google_sheet_state: File state hash blok agar hanya range yang berubah yang ditulis ulang
+    """
+    import uuid
+    from utils.extract import iter_product_pages
+    from utils.archive import PageArchive
+    from utils.transform import transform_to_DataFrame, optimize_dtypes
+    from utils.exchange import resolve_rate
+    from utils.dedup import drop_duplicate_products, load_seen_hashes, save_seen_hashes
+    from utils.load import save_to_csv, JsonArrayWriter, store_to_postgre
+
+    archive = PageArchive(archive_dir) if archive_dir else None
+    connection_params = get_connection_params()
+    run_id = uuid.uuid4().hex
+
+    dedup_lock = threading.Lock()
+    seen = {"hashes": load_seen_hashes(dedup_state) if dedup_state else None}
+
+    def transform_batch(raw_products):
+        # Cache TTL: kurs hanya diambil ulang dari provider setelah kedaluwarsa
+        df = transform_to_DataFrame(raw_products, rate=resolve_rate(exchange_rate, rate_ttl))
+        with dedup_lock:
+            df, seen["hashes"] = drop_duplicate_products(df, seen["hashes"])
+        return optimize_dtypes(df) if not df.empty else None
+
+    csv_state = {"append": False}
+
+    def csv_sink(df):
+        # Batch pertama menimpa file dan menulis header, batch berikutnya ditambahkan
+        if not save_to_csv(df, "products.csv", append=csv_state["append"]):
+            raise RuntimeError("Gagal menyimpan batch ke products.csv")
+        csv_state["append"] = True
+
+    json_writer = JsonArrayWriter("products.json") if "json" in sinks else None
+
+    def json_sink(df):
+        if not json_writer.write(df):
+            raise RuntimeError("Gagal menyimpan batch ke products.json")
+
+    backend = None
+    if "postgres" in sinks and database_url:
+        from utils.backends import get_backend, PostgresCopyBackend
+        backend = get_backend(database_url)
+        if not isinstance(backend, PostgresCopyBackend):
+            # Backend SQLAlchemy (misalnya SQLite) tidak dibagi antar thread
+            postgres_workers = 1
+
+    def postgres_sink(df):
+        if backend is not None:
+            stored = backend.store(df, table_name="products", summaries=summaries, run_id=run_id)
+        else:
+            stored = store_to_postgre(df, table_name="products", connection_params=connection_params,
+                                      partitioned=partitioned, summaries=summaries, run_id=run_id)
+        if not stored:
+            raise RuntimeError("Gagal menyimpan batch ke database")
+
+    # Sheet berisi seluruh katalog (ditimpa per blok), jadi batch dikumpulkan dan ditulis sekali saat tahap selesai
+    sheet_batches = []
+
+    def sheets_sink(df):
+        sheet_batches.append(df)
+
+    def write_sheet():
+        import pandas as pd
+        from utils.load import save_to_google_sheets
+        if sheet_batches and not save_to_google_sheets(pd.concat(sheet_batches, ignore_index=True), google_sheet,
+                                                       credentials_path=google_credentials,
+                                                       state_path=google_sheet_state):
+            raise RuntimeError("Gagal menyimpan data ke Google Sheets")
+
+    pipeline = Pipeline(monitor_interval=monitor_interval)
+    extract = pipeline.add_source(
+        "extract", lambda: iter_product_pages(BASE_URL, FIRST_PAGE_URL, archive=archive))
+    transform = pipeline.add_stage(
+        "transform", transform_batch, extract, workers=transform_workers, queue_size=queue_size)
+    if "csv" in sinks:
+        pipeline.add_stage("csv", csv_sink, transform, queue_size=queue_size)
+    if "json" in sinks:
+        pipeline.add_stage("json", json_sink, transform, queue_size=queue_size, on_close=json_writer.close)
+    if "postgres" in sinks:
+        pipeline.add_stage("postgres", postgres_sink, transform, workers=postgres_workers, queue_size=queue_size,
+                           on_close=backend.close if backend is not None else None)
+    if output_dir:
+        from utils.dataset import PartitionedWriter
+        # Batch ditampung dan ditulis sekaligus, bukan satu file kecil per gender untuk setiap halaman
+        dataset_writer = PartitionedWriter(output_dir, partition_by=partition_by, file_format=output_format)
+
+        def dataset_sink(df):
+            if not dataset_writer.write(df):
+                raise RuntimeError(f"Gagal menyimpan batch ke dataset {output_dir}")
+
+        pipeline.add_stage("dataset", dataset_sink, transform, queue_size=queue_size, on_close=dataset_writer.close)
+    if google_sheet:
+        pipeline.add_stage("sheets", sheets_sink, transform, queue_size=queue_size, on_close=write_sheet)
+
+    print("🔍 Memulai pipeline ETL...")
+    stats = pipeline.run()
+
+    for name, stage_stats in stats.items():
+        print(f"{name}: {stage_stats['rows_processed']} baris diproses, {stage_stats['errors']} error, "
+              f"{stage_stats['rows_per_second']} baris/detik, sibuk {stage_stats['busy_seconds']} detik")
+
+    if any(stage_stats["errors"] for stage_stats in stats.values()):
+        print("⚠️ Sebagian batch gagal diproses atau disimpan.")
+        return
+
+    if dedup_state and seen["hashes"] is not None:
+        save_seen_hashes(dedup_state, seen["hashes"])
+    print("✅ Proses ETL selesai dengan sukses.")
+
+
+def run_daemon(args):
+    """Menjalankan ETL terjadwal dalam satu proses yang tetap hidup.
+
+    Proses, import library, session HTTP, pool koneksi PostgreSQL, dan cache
+    hash deduplikasi tetap "hangat" di antara run terjadwal, tidak seperti
+    `python main.py` yang diluncurkan ulang oleh cron setiap kali.
+    """
+    import requests
+    from utils.load import create_connection_pool, manage_partitions
+
+    session = requests.Session()
+    try:
+        connection_pool = create_connection_pool(get_connection_params(), maxconn=args.db_pool_size)
+    except Exception as e:
+        print(f"⚠️ Pool koneksi PostgreSQL gagal dibuat ({e}), setiap run akan membuka koneksi baru.")
+        connection_pool = None
+    dedup_cache = {}
+
+    stop_event = threading.Event()
+
+    def request_stop(signum, frame):
+        print("⏹️ Sinyal berhenti diterima, daemon berhenti setelah run yang sedang berjalan.")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    def job():
+        if args.retention_months is not None:
+            manage_partitions(connection_params=get_connection_params(), retention_months=args.retention_months)
+        run_etl(stages=args.stages, dedup_state=args.dedup_state, archive_dir=args.archive, session=session,
+                connection_pool=connection_pool, dedup_cache=dedup_cache,
+                partitioned=args.partitioned or args.retention_months is not None,
+                exchange_rate=args.exchange_rate, rate_ttl=args.rate_ttl, summaries=args.summary_tables)
+
+    print(f"⏰ Daemon ETL berjalan setiap {args.interval} detik.")
+    try:
+        stats = run_scheduled(job, args.interval, stop_event=stop_event, max_runs=args.max_runs,
+                              lock=RunLock(args.lock_file))
+    finally:
+        session.close()
+        if connection_pool is not None:
+            connection_pool.closeall()
+
+    print(f"Daemon berhenti: {stats['runs']} run, {stats['failures']} gagal, "
+          f"{stats['skipped_overlap'] + stats['skipped_missed']} jadwal dilewati.")
+
+
+def run_reprocess(args):
+    """Memproses ulang file products.csv/JSON Lines yang sudah ada secara bertahap (per chunk)."""
+    from utils.reprocess import reprocess_file
+
+    if not (args.csv or args.jsonl or args.postgres):
+        print("Tidak ada sink yang dipilih. Gunakan --csv, --jsonl, dan/atau --postgres.")
+        return
+
+    print(f"🔁 Memproses ulang {args.input} per {args.chunksize} baris...")
+    stats = reprocess_file(
+        args.input,
+        csv_path=args.csv,
+        jsonl_path=args.jsonl,
+        connection_params=get_connection_params() if args.postgres else None,
+        table_name=args.table,
+        chunksize=args.chunksize,
+        postgres_workers=args.postgres_workers,
+    )
+
+    print(f"{stats['chunks']} chunk diproses: {stats['rows_read']} baris dibaca, "
+          f"{stats['rows_written']} baris disimpan.")
+    if stats["failed_chunks"]:
+        print(f"⚠️ {stats['failed_chunks']} chunk gagal disimpan.")
+    else:
+        print("✅ Proses ulang selesai dengan sukses.")
+
+
+def run_crawl_worker(args):
+    """Mengambil halaman dari antrean crawl bersama sampai habis."""
+    from utils.workqueue import run_worker
+
+    stats = run_worker(args.queue, args.results, args.base_url, args.first_page_url, job=args.job,
+                       worker_id=args.worker_id, lease_seconds=args.lease_seconds)
+    print(f"Worker selesai: {stats['pages']} halaman, {stats['products']} produk, "
+          f"{stats['missing']} halaman kosong/404, {stats['errors']} error.")
+
+
+def run_crawl_coordinator(args):
+    """Mengisi antrean crawl, menunggu semua worker selesai, lalu menggabungkan hasilnya."""
+    import multiprocessing
+    from utils.workqueue import CrawlQueue, run_worker, wait_for_crawl, merge_results
+
+    with CrawlQueue(args.queue, args.job) as queue:
+        # Halaman yang selesai pada run sebelumnya diulang, agar hasil lama tidak dimuat ulang ke sink
+        queue.reset()
+        queue.enqueue(range(1, args.pages + 1))
+
+    started = time.perf_counter()
+    workers = [
+        multiprocessing.Process(
+            target=run_worker,
+            args=(args.queue, args.results, args.base_url, args.first_page_url),
+            kwargs={"job": args.job, "lease_seconds": args.lease_seconds},
+        )
+        for _ in range(args.workers)
+    ]
+    for worker in workers:
+        worker.start()
+    print(f"🔍 {args.pages} halaman diantrekan, {args.workers} worker lokal berjalan...")
+
+    counts = wait_for_crawl(args.queue, job=args.job, timeout=args.timeout)
+    for worker in workers:
+        # Setelah timeout, worker lokal yang masih berjalan dihentikan agar --timeout membatasi seluruh run
+        remaining = None if args.timeout is None else max(0.0, args.timeout - (time.perf_counter() - started))
+        worker.join(remaining)
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+    seconds = time.perf_counter() - started
+
+    products = merge_results(args.queue, args.raw_path, job=args.job)
+    print(f"{counts['done']} halaman ({len(products)} produk) dalam {seconds:.1f} detik "
+          f"({counts['done'] / seconds:.1f} halaman/detik), {counts['missing']} halaman kosong/404, "
+          f"{counts['failed']} gagal. Produk mentah disimpan ke {args.raw_path}.")
+
+    if not args.no_load and products:
+        run_etl(stages=tuple(stage for stage in STAGES if stage != "extract"), raw_path=args.raw_path,
+                dedup_state=args.dedup_state)
+
+
+def run_from_args(args):
+    """Menjalankan run_etl dengan opsi dari subcommand run."""
+    run_etl(stages=args.stages, raw_path=args.raw_path, input_path=args.input,
+            dedup_state=args.dedup_state, archive_dir=args.archive, partitioned=args.partitioned,
+            postgres_workers=args.postgres_workers, database_url=args.database_url,
+            google_sheet=args.google_sheet, google_credentials=args.google_credentials,
+            google_sheet_state=args.google_sheet_state, exchange_rate=args.exchange_rate,
+            rate_ttl=args.rate_ttl, output_dir=args.output_dir, output_format=args.output_format,
+            partition_by=args.partition_by, summaries=args.summary_tables)
+
+
+def add_exchange_rate_arguments(parser):
+    parser.add_argument("--exchange-rate",
+                        help="Sumber kurs USD->IDR: angka tetap, env[:NAMA], file:PATH, atau URL http(s) "
+                             "(default: env EXCHANGE_RATE_SOURCE, env USD_IDR_RATE, atau 16000)")
+    parser.add_argument("--rate-ttl", type=float, default=3600,
+                        help="Lama kurs disimpan di cache sebelum diambil ulang, dalam detik")
+
+
+def parse_columns(value):
+    """Mengurai daftar kolom yang dipisahkan koma, misalnya "Gender,Size"."""
+    return tuple(column.strip() for column in value.split(",") if column.strip())
+
+
+def add_lock_argument(parser):
+    parser.add_argument("--lock-file", default=".etl.lock",
+                        help="File lock untuk mencegah run yang tumpang tindih antar proses (juga dengan daemon)")
+
+
+def add_dataset_arguments(parser):
+    parser.add_argument("--output-dir",
+                        help="Folder dataset terpartisi gaya Hive (run_date=.../gender=.../part-N) dengan manifest")
+    parser.add_argument("--output-format", choices=("csv", "jsonl", "parquet"), default="csv",
+                        help="Format file dataset terpartisi (parquet membutuhkan pyarrow)")
+    parser.add_argument("--partition-by", type=parse_columns, default=("Gender",),
+                        help="Kolom partisi di bawah run_date, dipisahkan koma (default: Gender)")
+
+
+def add_summary_arguments(parser):
+    parser.add_argument("--summary-tables", action="store_true",
+                        help="Perbarui tabel ringkasan per gender/ukuran (products_summary, "
+                             "products_run_summary) secara inkremental saat load PostgreSQL")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="ETL pipeline data produk fashion-studio")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run", help="Menjalankan pipeline ETL lengkap (default)")
+    run_parser.add_argument("--stages", type=parse_stages, default=STAGES,
+                            help=f"Tahap yang dijalankan, dipisahkan koma (default: {','.join(STAGES)})")
+    run_parser.add_argument("--raw-path", default=RAW_PRODUCTS_PATH,
+                            help="File JSON Lines produk mentah, ditulis/dibaca jika extract atau transform dilewati")
+    run_parser.add_argument("--input", default="products.csv",
+                            help="File hasil transformasi yang disimpan ulang jika hanya tahap sink yang dijalankan")
+    run_parser.add_argument("--dedup-state", help="File .npy berisi hash produk yang sudah dimuat antar run")
+    run_parser.add_argument("--archive", help="Folder arsip untuk menyimpan HTML mentah setiap halaman")
+    run_parser.add_argument("--database-url", default=os.getenv("DATABASE_URL"),
+                            help="URL database tujuan tahap postgres, misalnya sqlite:///products.db "
+                                 "(default: env DATABASE_URL, atau koneksi DB_* jika kosong)")
+    run_parser.add_argument("--google-sheet", default=os.getenv("GOOGLE_SHEET_ID"),
+                            help="ID spreadsheet Google Sheets tujuan (default: env GOOGLE_SHEET_ID)")
+    run_parser.add_argument("--google-credentials", default=os.getenv("GOOGLE_APPLICATION_CREDENTIALS"),
+                            help="File kunci service account Google (default: env GOOGLE_APPLICATION_CREDENTIALS)")
+    run_parser.add_argument("--google-sheet-state",
+                            help="File state agar run berikutnya hanya menulis ulang range yang berubah")
+    run_parser.add_argument("--partitioned", action="store_true",
+                            help="Simpan ke tabel PostgreSQL yang dipartisi per bulan pada created_at")
+    add_exchange_rate_arguments(run_parser)
+    add_dataset_arguments(run_parser)
+    add_summary_arguments(run_parser)
+    add_lock_argument(run_parser)
+    run_parser.add_argument("--profile", metavar="DIR",
+                            help="Profil setiap tahap dengan cProfile dan simpan laporan .pstats/.collapsed ke DIR")
+    run_parser.add_argument("--profile-top", type=int, default=15,
+                            help="Jumlah fungsi terlama yang dicetak per tahap (--profile)")
+    run_parser.add_argument("--pipeline", action="store_true",
+                            help="Jalankan sebagai pipeline bertahap dengan antrean terbatas per tahap")
+    run_parser.add_argument("--transform-workers", type=int, default=1, help="Thread tahap transformasi (--pipeline)")
+    run_parser.add_argument("--postgres-workers", type=int, default=1,
+                            help="Thread tahap PostgreSQL (--pipeline) atau jumlah koneksi load paralel")
+    run_parser.add_argument("--queue-size", type=int, default=8, help="Kapasitas antrean per tahap (--pipeline)")
+    run_parser.add_argument("--monitor-interval", type=float, default=5.0,
+                            help="Interval laporan antrean/throughput dalam detik (--pipeline)")
+
+    daemon_parser = subparsers.add_parser(
+        "daemon", help="Menjalankan ETL terjadwal dalam proses yang tetap hidup")
+    daemon_parser.add_argument("--interval", type=float, default=3600, help="Jeda antar run dalam detik")
+    daemon_parser.add_argument("--stages", type=parse_stages, default=STAGES,
+                               help=f"Tahap yang dijalankan, dipisahkan koma (default: {','.join(STAGES)})")
+    daemon_parser.add_argument("--max-runs", type=int, help="Berhenti setelah sejumlah jadwal (default: tanpa batas)")
+    add_lock_argument(daemon_parser)
+    daemon_parser.add_argument("--db-pool-size", type=int, default=2, help="Jumlah maksimum koneksi PostgreSQL")
+    daemon_parser.add_argument("--dedup-state", help="File .npy berisi hash produk yang sudah dimuat antar run")
+    daemon_parser.add_argument("--archive", help="Folder arsip untuk menyimpan HTML mentah setiap halaman")
+    daemon_parser.add_argument("--partitioned", action="store_true",
+                               help="Simpan ke tabel PostgreSQL yang dipartisi per bulan pada created_at")
+    daemon_parser.add_argument("--retention-months", type=int,
+                               help="Hapus partisi yang lebih lama dari sejumlah bulan sebelum setiap run "
+                                    "(mengaktifkan --partitioned)")
+    add_exchange_rate_arguments(daemon_parser)
+    add_summary_arguments(daemon_parser)
+
+    replay_parser = subparsers.add_parser(
+        "replay", help="Menjalankan ETL dari arsip HTML mentah tanpa scraping ulang")
+    replay_parser.add_argument("archive", help="Folder arsip (run --archive) atau file hasil perintah pack")
+    replay_parser.add_argument("--workers", type=int, help="Jumlah proses ekstraksi (default: jumlah CPU)")
+    replay_parser.add_argument("--dedup-state", help="File .npy berisi hash produk yang sudah dimuat antar run")
+    add_lock_argument(replay_parser)
+
+    pack_parser = subparsers.add_parser(
+        "pack", help="Menggabungkan arsip HTML menjadi satu file pack untuk replay via mmap")
+    pack_parser.add_argument("archive", help="Folder arsip yang dibuat dengan run --archive")
+    pack_parser.add_argument("output", help="File pack tujuan")
+
+    reprocess_parser = subparsers.add_parser(
+        "reprocess", help="Membersihkan ulang file products.csv/JSON Lines yang sudah ada per chunk")
+    reprocess_parser.add_argument("input", help="File .csv, .jsonl, atau .json yang akan diproses ulang")
+    reprocess_parser.add_argument("--csv", help="File CSV tujuan")
+    reprocess_parser.add_argument("--jsonl", help="File JSON Lines tujuan")
+    reprocess_parser.add_argument("--postgres", action="store_true", help="Simpan juga ke PostgreSQL")
+    reprocess_parser.add_argument("--table", default="products", help="Tabel PostgreSQL tujuan")
+    reprocess_parser.add_argument("--chunksize", type=int, default=100_000, help="Jumlah baris per chunk")
+    reprocess_parser.add_argument("--postgres-workers", type=int, default=1,
+                                  help="Jumlah koneksi paralel untuk load setiap chunk ke PostgreSQL")
+
+    def add_crawl_queue_arguments(crawl_parser):
+        crawl_parser.add_argument("--queue", default="sqlite:///crawl_queue.db",
+                                  help="URL antrean bersama: sqlite:///file.db atau postgresql://...")
+        crawl_parser.add_argument("--results", default="crawl_results",
+                                  help="Folder hasil per halaman (harus dapat diakses semua worker)")
+        crawl_parser.add_argument("--job", default="default", help="Nama job crawl dalam antrean")
+        crawl_parser.add_argument("--lease-seconds", type=float, default=60,
+                                  help="Lama lease halaman sebelum dapat diambil worker lain")
+        crawl_parser.add_argument("--base-url", default=BASE_URL, help="Format URL halaman 2 dan seterusnya")
+        crawl_parser.add_argument("--first-page-url", default=FIRST_PAGE_URL, help="URL halaman pertama")
+
+    worker_parser = subparsers.add_parser(
+        "crawl-worker", help="Menjalankan worker yang mengambil halaman dari antrean crawl bersama")
+    add_crawl_queue_arguments(worker_parser)
+    worker_parser.add_argument("--worker-id", help="Nama unik worker (default: host-pid-acak)")
+
+    coordinator_parser = subparsers.add_parser(
+        "crawl-coordinator", help="Mengisi antrean crawl, menunggu worker, dan menggabungkan hasilnya")
+    add_crawl_queue_arguments(coordinator_parser)
+    coordinator_parser.add_argument("--pages", type=int, default=50,
+                                    help="Jumlah halaman awal yang diantrekan (halaman berikutnya ditemukan worker)")
+    coordinator_parser.add_argument("--workers", type=int, default=0,
+                                    help="Jumlah worker lokal yang dijalankan coordinator (default: 0, "
+                                         "worker dijalankan terpisah dengan crawl-worker)")
+    coordinator_parser.add_argument("--timeout", type=float,
+                                    help="Batas waktu menunggu worker dalam detik (worker lokal dihentikan setelahnya)")
+    coordinator_parser.add_argument("--raw-path", default=RAW_PRODUCTS_PATH,
+                                    help="File JSON Lines hasil gabungan produk mentah")
+    coordinator_parser.add_argument("--no-load", action="store_true",
+                                    help="Hanya gabungkan hasil crawl tanpa transformasi dan penyimpanan")
+    coordinator_parser.add_argument("--dedup-state", help="File .npy berisi hash produk yang sudah dimuat antar run")
+    add_lock_argument(coordinator_parser)
+
+    partitions_parser = subparsers.add_parser(
+        "partitions", help="Membuat partisi bulan berikutnya dan menghapus partisi lama tabel PostgreSQL")
+    partitions_parser.add_argument("--table", default="products", help="Tabel PostgreSQL yang dipartisi")
+    partitions_parser.add_argument("--premake", type=int, default=3,
+                                   help="Jumlah partisi bulan mendatang yang dibuat lebih awal")
+    partitions_parser.add_argument("--retention-months", type=int,
+                                   help="Hapus partisi yang lebih lama dari sejumlah bulan (default: simpan semua)")
+
+    summaries_parser = subparsers.add_parser(
+        "summaries", help="Menghitung ulang tabel ringkasan products_summary dari seluruh riwayat tabel")
+    summaries_parser.add_argument("--table", default="products", help="Tabel PostgreSQL produk")
+
+    return parser
+
+
+def dispatch(args):
+    """Menjalankan subcommand yang dipilih."""
+    if args.command == "reprocess":
+        run_reprocess(args)
+    elif args.command == "pack":
+        from utils.archive import pack_archive
+        page_count = pack_archive(args.archive, args.output)
+        print(f"📦 {page_count} halaman digabungkan ke {args.output}.")
+    elif args.command == "daemon":
+        run_daemon(args)
+    elif args.command == "partitions":
+        from utils.load import manage_partitions
+        result = manage_partitions(table_name=args.table, connection_params=get_connection_params(),
+                                   premake=args.premake, retention_months=args.retention_months)
+        if result is not None and result["dropped"]:
+            print(f"🗑️ Partisi dihapus: {', '.join(result['dropped'])}")
+    elif args.command == "summaries":
+        from utils.load import rebuild_summary_tables
+        rebuild_summary_tables(table_name=args.table, connection_params=get_connection_params())
+    elif args.command == "crawl-worker":
+        run_crawl_worker(args)
+    elif args.command == "crawl-coordinator":
+        run_crawl_coordinator(args)
+    elif args.command == "replay":
+        run_etl(dedup_state=args.dedup_state, replay_dir=args.archive, workers=args.workers)
+    elif args.profile:
+        if args.pipeline:
+            print("--profile hanya didukung tanpa --pipeline (profiler berjalan per thread).")
+            return
+        from utils.profiling import StageProfiler
+        profiler = StageProfiler(args.profile, top=args.profile_top)
+        with profiler.installed():
+            run_from_args(args)
+        profiler.report()
+    elif args.pipeline:
+        if not {"extract", "transform"} <= set(args.stages):
+            print("Mode --pipeline membutuhkan tahap extract dan transform.")
+            return
+        run_etl_pipeline(
+            sinks=[stage for stage in SINK_STAGES if stage in args.stages],
+            dedup_state=args.dedup_state,
+            archive_dir=args.archive,
+            transform_workers=args.transform_workers,
+            postgres_workers=args.postgres_workers,
+            queue_size=args.queue_size,
+            monitor_interval=args.monitor_interval,
+            partitioned=args.partitioned,
+            exchange_rate=args.exchange_rate,
+            rate_ttl=args.rate_ttl,
+            output_dir=args.output_dir,
+            output_format=args.output_format,
+            partition_by=args.partition_by,
+            summaries=args.summary_tables,
+            database_url=args.database_url,
+            google_sheet=args.google_sheet,
+            google_credentials=args.google_credentials,
+            google_sheet_state=args.google_sheet_state,
+        )
+    else:
+        run_from_args(args)
+
+
+def main(argv=None):
+    # Load environment variables dari .env file
+    load_dotenv()
+
+    argv = sys.argv[1:] if argv is None else list(argv)
+    # Tanpa subcommand, jalankan pipeline ETL seperti biasa
+    if not argv or argv[0] not in COMMANDS and argv[0] not in ("-h", "--help"):
+        argv = ["run"] + argv
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if getattr(args, "summary_tables", False) and getattr(args, "database_url", None):
+        from urllib.parse import urlsplit
+        from utils.backends import POSTGRES_SCHEMES
+        if urlsplit(args.database_url).scheme not in POSTGRES_SCHEMES:
+            parser.error("--summary-tables hanya didukung untuk database PostgreSQL, bukan "
+                         f"--database-url {args.database_url}")
+
+    if args.command not in LOCKED_COMMANDS:
+        dispatch(args)
+        return
+    # Lock yang sama dengan daemon, sehingga run dari cron dan daemon tidak memuat data bersamaan
+    lock = RunLock(args.lock_file)
+    if not lock.acquire():
+        print(f"⏭️ Run lain sedang berjalan (lock {args.lock_file}), run ini dilewati.")
+        return
+    try:
+        dispatch(args)
+    finally:
+        lock.release()
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,136 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import archive as archive_module
+from utils.archive import PageArchive, PackedPageStore, replay_archive, pack_archive, replay_pack
+from utils.extract import scrape_product
+
+
+def catalog_page(page_number, has_next=True):
+    cards = ''.join(f'''
+        <div class="product-details">
+            <h3 class="product-title">Product {page_number}-{i}</h3>
+            <span class="price">${10 * page_number + i}.00</span>
+            <p style="font-size: 14px; color: #777;">Size: M</p>
+        </div>''' for i in range(2))
+    next_button = '<li class="next">Next</li>' if has_next else ''
+    return f'<html><body>{cards}{next_button}</body></html>'.encode()
+
+
+class TestPageArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.root = self.tmp_dir.name
+
+    def test_store_is_content_addressed(self):
+        """Test identical bodies are stored once while every fetch is indexed."""
+        archive = PageArchive(self.root)
+        first = archive.store('https://example.com', 1, catalog_page(1))
+        second = archive.store('https://example.com', 1, catalog_page(1))
+
+        self.assertEqual(first, second)
+        objects = [name for _, _, files in os.walk(os.path.join(self.root, 'objects')) for name in files]
+        self.assertEqual(len(objects), 1)
+        with open(os.path.join(self.root, 'index.jsonl')) as index_file:
+            self.assertEqual(len(index_file.readlines()), 2)
+
+    def test_load_round_trip_each_codec(self):
+        """Test bodies decompress to the original bytes, and latest fetch per page wins."""
+        for codec in ('zlib', 'zstd'):
+            with self.subTest(codec=codec):
+                if codec == 'zstd' and archive_module.zstandard is None:
+                    self.skipTest('zstandard is not installed')
+                archive = PageArchive(os.path.join(self.root, codec), codec=codec)
+                archive.store('https://example.com/page2', 2, catalog_page(2))
+                archive.store('https://example.com', 1, 'old page')
+                archive.store('https://example.com', 1, catalog_page(1))
+
+                entries = archive.entries()
+                self.assertEqual([entry['page'] for entry in entries], [1, 2])
+                self.assertEqual(archive.load(entries[0]), catalog_page(1))
+
+    @patch('time.sleep')
+    def test_scrape_and_replay(self, mock_sleep):
+        """Test a crawl stores every page and replay extracts the same products offline."""
+        pages = [catalog_page(1), catalog_page(2), catalog_page(3, has_next=False)]
+        archive = PageArchive(self.root, codec='zlib')
+
+        with patch('utils.extract.fetching_content', side_effect=pages):
+            scraped = scrape_product('https://example.com/page{}', 'https://example.com',
+                                     delay=0, archive=archive)
+
+        with patch('utils.extract.fetching_content') as mock_fetching_content:
+            replayed = replay_archive(self.root, workers=2)
+            mock_fetching_content.assert_not_called()
+
+        self.assertEqual(len(scraped), 6)
+        self.assertEqual(replayed, scraped)
+
+    def test_pack_and_mmap_store(self):
+        """Test packed pages are served as memoryview slices of the original bodies."""
+        archive = PageArchive(self.root, codec='zlib')
+        archive.store('https://example.com/page2', 2, catalog_page(2))
+        archive.store('https://example.com', 1, catalog_page(1))
+        pack_path = os.path.join(self.root, 'pages.pack')
+
+        self.assertEqual(pack_archive(self.root, pack_path), 2)
+
+        with PackedPageStore(pack_path) as store:
+            self.assertEqual(len(store), 2)
+            self.assertEqual([entry['page'] for entry in store.entries], [1, 2])
+            page = store.page(1)
+            self.assertIsInstance(page, memoryview)
+            self.assertEqual(page.tobytes(), catalog_page(2))
+            page.release()
+
+    def test_packed_store_rejects_other_files(self):
+        """Test files that are not packed stores are rejected."""
+        not_a_pack = os.path.join(self.root, 'products.csv')
+        with open(not_a_pack, 'wb') as file:
+            file.write(b'Title,Price\n' * 10)
+
+        with self.assertRaises(ValueError):
+            PackedPageStore(not_a_pack)
+
+    def test_replay_pack_matches_archive(self):
+        """Test replay from a pack gives the same products in- and out-of-process."""
+        archive = PageArchive(self.root, codec='zlib')
+        for page_number in range(1, 6):
+            archive.store(f'https://example.com/page{page_number}', page_number,
+                          catalog_page(page_number, has_next=page_number < 5))
+        pack_path = os.path.join(self.root, 'pages.pack')
+        pack_archive(self.root, pack_path)
+
+        expected = replay_archive(self.root, workers=2)
+
+        self.assertEqual(len(expected), 10)
+        self.assertEqual(replay_pack(pack_path, workers=1), expected)
+        self.assertEqual(replay_pack(pack_path, workers=2), expected)
+
+    def test_replay_pack_matches_archive_for_meta_charset(self):
+        """Test a page declaring its charset only in <meta> replays the same from archive and pack."""
+        archive = PageArchive(self.root, codec='zlib')
+        html = ('<html><head><meta charset="iso-8859-1"></head><body><div class="product-details">'
+                '<h3 class="product-title">Café Jacket</h3><span class="price">$10.00</span></div></body></html>')
+        archive.store('https://example.com/page1', 1, html.encode('iso-8859-1'))
+        pack_path = os.path.join(self.root, 'pages.pack')
+        pack_archive(self.root, pack_path)
+
+        expected = replay_archive(self.root, workers=1)
+
+        self.assertEqual(expected[0].title, 'Café Jacket')
+        self.assertEqual(replay_pack(pack_path, workers=1), expected)
+
+    def test_replay_empty_archive(self):
+        """Test replaying an archive without pages returns no products."""
+        self.assertEqual(replay_archive(self.root), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
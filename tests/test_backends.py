@@ -0,0 +1,128 @@
+import unittest
+from unittest.mock import patch
+import sqlite3
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.backends import get_backend, store_to_database, PostgresCopyBackend, SQLAlchemyBackend
+
+
+def product_frame():
+    return pd.DataFrame({
+        'Title': ['Product 1', 'Product 2', 'Product 3'],
+        'Price': [160000.0, 480000.0, 320000.0],
+        'Rating': [4.5, 3.8, 4.2],
+        'Colors': pd.array([3, None, 4], dtype='Int64'),
+        'Size': pd.Categorical(['M', 'L', 'M']),
+        'Gender': ['Men', 'Women', 'Unisex'],
+    })
+
+
+class TestGetBackend(unittest.TestCase):
+
+    def test_postgres_urls_use_copy(self):
+        """Test postgresql URLs select the psycopg2 COPY backend."""
+        for url in ('postgresql://u:p@localhost/db', 'postgres://localhost/db',
+                    'postgresql+psycopg2://u@localhost:5433/db'):
+            self.assertIsInstance(get_backend(url), PostgresCopyBackend)
+
+    def test_other_urls_use_sqlalchemy(self):
+        """Test non-PostgreSQL URLs select the SQLAlchemy backend."""
+        with get_backend('sqlite://') as backend:
+            self.assertIsInstance(backend, SQLAlchemyBackend)
+
+    def test_rejects_plain_path(self):
+        """Test a value that is not a URL is rejected."""
+        with self.assertRaises(ValueError):
+            get_backend('products.db')
+
+
+class TestSQLAlchemyBackend(unittest.TestCase):
+
+    def test_store_to_sqlite(self):
+        """Test products are appended to a SQLite table with missing values as NULL."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'products.db')
+            url = f'sqlite:///{db_path}'
+
+            self.assertTrue(store_to_database(product_frame(), url))
+            self.assertTrue(store_to_database(product_frame(), url))
+
+            with sqlite3.connect(db_path) as conn:
+                rows = conn.execute(
+                    'SELECT title, price, rating, colors, size, gender FROM products ORDER BY id').fetchall()
+            self.assertEqual(len(rows), 6)
+            self.assertEqual(rows[0], ('Product 1', 160000.0, 4.5, 3, 'M', 'Men'))
+            self.assertIsNone(rows[1][3])
+
+    def test_store_frame_with_shuffled_columns(self):
+        """Test values land in their own columns whatever the column order of the frame."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'products.db')
+            df = product_frame()[['Gender', 'Title', 'Price', 'Size']]
+
+            with patch('builtins.print'):
+                self.assertTrue(store_to_database(df, f'sqlite:///{db_path}'))
+
+            with sqlite3.connect(db_path) as conn:
+                row = conn.execute('SELECT title, price, size, gender FROM products ORDER BY id').fetchone()
+            self.assertEqual(row, ('Product 1', 160000.0, 'M', 'Men'))
+
+    def test_adds_rate_columns_to_existing_table(self):
+        """Test a table created before the exchange-rate columns gets them added."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'products.db')
+            with sqlite3.connect(db_path) as conn:
+                conn.execute('CREATE TABLE products (id INTEGER PRIMARY KEY, title VARCHAR(255), price FLOAT, '
+                             'rating FLOAT, colors INTEGER, size VARCHAR(50), gender VARCHAR(50), created_at DATETIME)')
+            df = product_frame().assign(Exchange_Rate=16250.0, Rate_Timestamp='2026-10-19T08:00:00+00:00')
+
+            self.assertTrue(store_to_database(df, f'sqlite:///{db_path}'))
+
+            with sqlite3.connect(db_path) as conn:
+                rows = conn.execute('SELECT exchange_rate, rate_timestamp FROM products').fetchall()
+            self.assertEqual(rows[0], (16250.0, '2026-10-19T08:00:00+00:00'))
+
+    def test_summary_tables_skipped_outside_postgres(self):
+        """Test asking SQLite for summary tables still stores the products."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, 'products.db')
+
+            with patch('builtins.print') as mock_print:
+                self.assertTrue(store_to_database(product_frame(), f'sqlite:///{db_path}', summaries=True))
+
+            self.assertIn('skipping', mock_print.call_args_list[0].args[0])
+            with sqlite3.connect(db_path) as conn:
+                self.assertEqual(conn.execute('SELECT COUNT(*) FROM products').fetchone(), (3,))
+
+    def test_store_failure_returns_false(self):
+        """Test a frame with unknown columns is reported as a failed load."""
+        df = product_frame().assign(Unknown=1)
+
+        self.assertFalse(store_to_database(df, 'sqlite://'))
+
+
+class TestPostgresCopyBackend(unittest.TestCase):
+
+    @patch('utils.load.psycopg2.connect')
+    def test_store_uses_copy(self, mock_connect):
+        """Test the PostgreSQL backend creates the table and loads with COPY."""
+        cursor = mock_connect.return_value.cursor.return_value.__enter__.return_value
+
+        result = store_to_database(product_frame(), 'postgresql+psycopg2://u:p@db-host:5433/product_db')
+
+        self.assertTrue(result)
+        mock_connect.assert_called_once_with('postgresql://u:p@db-host:5433/product_db')
+        self.assertIn('CREATE TABLE IF NOT EXISTS products', cursor.execute.call_args.args[0])
+        copy_sql, buffer = cursor.copy_expert.call_args.args
+        self.assertTrue(copy_sql.startswith('COPY products (title, price, rating, colors, size, gender)'))
+        self.assertEqual(len(buffer.getvalue().splitlines()), 3)
+        mock_connect.return_value.commit.assert_called_once()
+
+
+if __name__ == '__main__':
+    unittest.main()
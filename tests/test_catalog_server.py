@@ -0,0 +1,78 @@
+import unittest
+from unittest.mock import patch
+import time
+import sys
+import os
+
+import requests
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.catalog_server import CatalogServer, render_catalog_page
+from utils.extract import scrape_product, parse_page
+
+
+def crawl(server, session=None):
+    with patch('builtins.print'):
+        return scrape_product(server.base_url, server.first_page_url, delay=0, session=session)
+
+
+class TestCatalogServer(unittest.TestCase):
+
+    def test_rendered_page_matches_extractor(self):
+        """Test generated pages parse into complete products with the site's markup."""
+        products, has_next = parse_page(render_catalog_page(3, products_per_page=5, has_next=True))
+
+        self.assertEqual(len(products), 5)
+        self.assertTrue(has_next)
+        self.assertEqual(products[0]['Title'], 'Product 3-0')
+        self.assertTrue(products[0]['Price'].startswith('$'))
+        self.assertTrue(products[0]['Colors'].endswith('Colors'))
+        self.assertIn(products[0]['Gender'], ('Men', 'Women', 'Unisex'))
+        self.assertEqual(render_catalog_page(3, 5), render_catalog_page(3, 5))
+
+    def test_full_crawl(self):
+        """Test scrape_product crawls every page of the local catalog."""
+        with CatalogServer(pages=5, products_per_page=4) as server:
+            products = crawl(server)
+
+        self.assertEqual(len(products), server.expected_products)
+        self.assertEqual(server.stats['pages_served'], 5)
+        self.assertEqual(server.stats['not_found'], 0)
+
+    def test_link_past_end_stops_crawl_at_404(self):
+        """Test a linked page past the end answers 404 and ends the crawl."""
+        with CatalogServer(pages=3, products_per_page=2, link_past_end=True) as server:
+            products = crawl(server)
+
+        self.assertEqual(len(products), 6)
+        self.assertEqual(server.stats['not_found'], 1)
+
+    def test_error_injection(self):
+        """Test injected server errors are returned as HTTP 500."""
+        with CatalogServer(pages=3, error_rate=1.0) as server:
+            response = requests.get(server.first_page_url, timeout=5)
+            products = crawl(server)
+
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(products, [])
+        self.assertEqual(server.stats['errors'], 2)
+
+    def test_latency_injection(self):
+        """Test every response is delayed by the configured latency."""
+        with CatalogServer(pages=3, products_per_page=1, latency=0.05) as server:
+            started = time.perf_counter()
+            crawl(server)
+            elapsed = time.perf_counter() - started
+
+        self.assertGreaterEqual(elapsed, 0.15)
+
+    def test_session_reuses_connection(self):
+        """Test a shared requests.Session keeps one connection open for the whole crawl."""
+        with CatalogServer(pages=4, products_per_page=1) as server, requests.Session() as session:
+            crawl(server, session=session)
+
+        self.assertEqual(server.stats['connections'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
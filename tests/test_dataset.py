@@ -0,0 +1,193 @@
+import unittest
+from unittest.mock import patch
+import importlib.util
+import tempfile
+import sys
+import os
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import dataset
+from utils.dataset import (write_partitioned, read_partitioned, load_manifest, prune_partitions, PartitionedWriter,
+                           NULL_PARTITION)
+
+
+def product_frame():
+    return pd.DataFrame({
+        'Title': ['Shirt', 'Dress', 'Hoodie', 'Cap', 'Scarf'],
+        'Price': [160000.0, 480000.0, 320000.0, 96000.0, 112000.0],
+        'Rating': [4.5, 3.8, 4.2, 4.9, 3.1],
+        'Size': pd.Categorical(['M', 'S', 'L', 'M', 'S']),
+        'Gender': pd.Categorical(['Men', 'Women', 'Unisex', 'Men', None]),
+    })
+
+
+class TestWritePartitioned(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp_dir.name, 'products')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write(self, df=None, **kwargs):
+        with patch('builtins.print'):
+            return write_partitioned(product_frame() if df is None else df, self.root, **kwargs)
+
+    def test_hive_layout_and_manifest(self):
+        """Test rows are split into run_date=/gender=/part-N files listed in the manifest."""
+        self.assertTrue(self.write(run_date='2026-10-19'))
+
+        manifest = load_manifest(self.root)
+        paths = sorted(entry['path'] for entry in manifest['files'])
+        self.assertEqual(paths, [
+            'run_date=2026-10-19/gender=Men/part-00000.csv',
+            'run_date=2026-10-19/gender=Unisex/part-00000.csv',
+            'run_date=2026-10-19/gender=Women/part-00000.csv',
+            f'run_date=2026-10-19/gender={NULL_PARTITION}/part-00000.csv',
+        ])
+        self.assertEqual(sum(entry['rows'] for entry in manifest['files']), 5)
+        # The partition column is encoded in the path, not repeated in the files
+        part = pd.read_csv(os.path.join(self.root, 'run_date=2026-10-19/gender=Men/part-00000.csv'))
+        self.assertEqual(list(part.columns), ['Title', 'Price', 'Rating', 'Size'])
+        self.assertEqual(part['Title'].tolist(), ['Shirt', 'Cap'])
+
+    def test_later_runs_add_parts(self):
+        """Test a second write on the same day adds part-00001 instead of overwriting."""
+        self.write(run_date='2026-10-19')
+        self.write(run_date='2026-10-19')
+
+        self.assertTrue(os.path.exists(os.path.join(self.root, 'run_date=2026-10-19/gender=Men/part-00001.csv')))
+        self.assertEqual(len(read_partitioned(self.root)), 10)
+
+    def test_format_mismatch_is_rejected(self):
+        self.write(run_date='2026-10-19')
+
+        self.assertFalse(self.write(run_date='2026-10-19', file_format='jsonl'))
+        self.assertFalse(self.write(run_date='2026-10-19', partition_by=('Size',)))
+        self.assertEqual(len(load_manifest(self.root)['files']), 4)
+
+
+class TestPartitionedWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp_dir.name, 'products')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_batches_are_written_together(self):
+        """Test many small batches end up as one part file per partition and one manifest write."""
+        writer = PartitionedWriter(self.root, run_date='2026-10-19')
+        with patch('utils.dataset._save_manifest', wraps=dataset._save_manifest) as save_manifest, \
+                patch('builtins.print'):
+            for _ in range(10):
+                self.assertTrue(writer.write(product_frame()))
+            self.assertIsNone(load_manifest(self.root))
+            writer.close()
+
+        self.assertEqual(save_manifest.call_count, 1)
+        self.assertEqual(len(load_manifest(self.root)['files']), 4)
+        self.assertEqual(len(read_partitioned(self.root)), 50)
+
+    def test_flushes_at_row_threshold(self):
+        writer = PartitionedWriter(self.root, run_date='2026-10-19', max_rows=8)
+        with patch('builtins.print'):
+            writer.write(product_frame())
+            self.assertIsNone(load_manifest(self.root))
+            writer.write(product_frame())
+            self.assertEqual(sum(entry['rows'] for entry in load_manifest(self.root)['files']), 10)
+            writer.write(product_frame())
+            writer.close()
+
+        self.assertEqual(len(read_partitioned(self.root)), 15)
+
+    def test_failed_flush_raises_on_close(self):
+        with patch('builtins.print'):
+            write_partitioned(product_frame(), self.root, run_date='2026-10-19')
+            writer = PartitionedWriter(self.root, file_format='jsonl')
+            writer.write(product_frame())
+            with self.assertRaises(RuntimeError):
+                writer.close()
+
+
+class TestReadPartitioned(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp_dir.name, 'products')
+        with patch('builtins.print'):
+            write_partitioned(product_frame(), self.root, file_format='jsonl', run_date='2026-10-18')
+            write_partitioned(product_frame(), self.root, file_format='jsonl', run_date='2026-10-19')
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_partition_filter_only_opens_matching_files(self):
+        """Test filtering on gender and run_date reads a single part file."""
+        with patch('utils.dataset._read_part', wraps=dataset._read_part) as read_part:
+            df = read_partitioned(self.root, filters={'Gender': 'Men', 'run_date': '2026-10-19'})
+
+        self.assertEqual(read_part.call_count, 1)
+        self.assertEqual(df['Title'].tolist(), ['Shirt', 'Cap'])
+        self.assertEqual(set(df['Gender']), {'Men'})
+        self.assertEqual(set(df['run_date']), {'2026-10-19'})
+
+    def test_value_lists_predicates_and_row_filters(self):
+        df = read_partitioned(self.root, filters={'gender': ['Women', None],
+                                                  'run_date': lambda value: value >= '2026-10-19',
+                                                  'Rating': lambda rating: rating > 3.5},
+                              columns=['Title', 'Gender'])
+
+        self.assertEqual(df.to_dict(orient='records'), [{'Title': 'Dress', 'Gender': 'Women'}])
+
+    def test_prune_partitions(self):
+        manifest = load_manifest(self.root)
+
+        self.assertEqual(len(prune_partitions(manifest)), 8)
+        self.assertEqual(len(prune_partitions(manifest, {'run_date': '2026-10-18'})), 4)
+        self.assertEqual(prune_partitions(manifest, {'gender': 'Kids'}), [])
+
+    def test_new_columns_read_as_missing_in_old_files(self):
+        """Test a column added in a later run comes back empty for earlier files."""
+        with patch('builtins.print'):
+            write_partitioned(product_frame().assign(Exchange_Rate=16250.0), self.root, file_format='jsonl',
+                              run_date='2026-10-20')
+
+        df = read_partitioned(self.root, filters={'gender': 'Men'})
+
+        self.assertEqual(df['Exchange_Rate'].isna().sum(), 4)
+        self.assertEqual(df.loc[df['run_date'] == '2026-10-20', 'Exchange_Rate'].tolist(), [16250.0, 16250.0])
+
+    def test_only_partition_columns(self):
+        """Test asking only for partition columns still returns one row per record."""
+        with patch('builtins.print'):
+            write_partitioned(product_frame(), os.path.join(self.tmp_dir.name, 'csv'), run_date='2026-10-19')
+
+        df = read_partitioned(os.path.join(self.tmp_dir.name, 'csv'), columns=['Gender'])
+
+        self.assertEqual(list(df.columns), ['Gender'])
+        self.assertEqual(sorted(df['Gender'].dropna()), ['Men', 'Men', 'Unisex', 'Women'])
+        self.assertEqual(len(df), 5)
+
+    def test_missing_manifest(self):
+        with self.assertRaises(FileNotFoundError):
+            read_partitioned(os.path.join(self.tmp_dir.name, 'missing'))
+
+
+@unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+class TestParquet(unittest.TestCase):
+
+    def test_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp_dir, patch('builtins.print'):
+            self.assertTrue(write_partitioned(product_frame(), tmp_dir, file_format='parquet', run_date='2026-10-19'))
+            df = read_partitioned(tmp_dir, filters={'gender': 'Unisex'}, columns=['Title', 'Price'])
+
+        self.assertEqual(df.to_dict(orient='records'), [{'Title': 'Hoodie', 'Price': 320000.0}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import tempfile
+import sys
+import os
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.dedup import product_hashes, drop_duplicate_products, load_seen_hashes, save_seen_hashes
+
+
+class TestDedup(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Title': ['T-shirt 1', 'Hoodie 2', ' t-shirt 1 ', 'T-shirt 1'],
+            'Price': [1600000.0, 3200000.0, 1600000.0, 1600000.0],
+            'Rating': [4.5, 3.8, 4.1, 4.5],
+            'Colors': [3, 2, 3, 3],
+            'Size': ['M', 'L', 'M', 'S'],
+            'Gender': ['Men', 'Women', 'Men', 'Men']
+        })
+
+    def test_product_hashes_normalized(self):
+        """Test whitespace/case differences and non-identifying columns do not change the hash."""
+        hashes = product_hashes(self.df)
+
+        self.assertEqual(hashes.dtype, np.uint64)
+        self.assertEqual(hashes[0], hashes[2])
+        self.assertNotEqual(hashes[0], hashes[1])
+        # Same title and price but a different size is another product
+        self.assertNotEqual(hashes[0], hashes[3])
+
+    def test_product_hashes_categorical(self):
+        """Test categorical columns hash the same as their string values."""
+        categorical = self.df.astype({'Size': 'category', 'Gender': 'category'})
+
+        np.testing.assert_array_equal(product_hashes(categorical), product_hashes(self.df))
+
+    def test_drop_duplicates_within_batch(self):
+        """Test repeated products in one batch are dropped, keeping the first."""
+        deduplicated, seen = drop_duplicate_products(self.df)
+
+        self.assertEqual(deduplicated['Title'].tolist(), ['T-shirt 1', 'Hoodie 2', 'T-shirt 1'])
+        self.assertEqual(deduplicated.index.tolist(), [0, 1, 2])
+        self.assertEqual(len(seen), 3)
+        self.assertTrue(np.all(seen[:-1] <= seen[1:]))
+
+    def test_drop_duplicates_across_runs(self):
+        """Test products loaded by a previous run are dropped using the persisted hash set."""
+        _, seen = drop_duplicate_products(self.df.iloc[:2])
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            state_path = os.path.join(tmp_dir, 'seen.npy')
+            self.assertEqual(len(load_seen_hashes(state_path)), 0)
+            save_seen_hashes(state_path, seen)
+            loaded = load_seen_hashes(state_path)
+
+        deduplicated, updated = drop_duplicate_products(self.df, loaded)
+
+        self.assertEqual(deduplicated['Size'].tolist(), ['S'])
+        self.assertEqual(len(updated), 3)
+
+    def test_drop_duplicates_across_rate_changes(self):
+        """Test a product loaded at one exchange rate is still a duplicate at another."""
+        def batch(rate):
+            return pd.DataFrame({
+                'Title': ['T-shirt 1', 'Hoodie 2'],
+                'Price': [25.99 * rate, 49.99 * rate],
+                'Size': ['M', 'L'],
+                'Gender': ['Men', 'Women'],
+                'Exchange_Rate': [rate, rate],
+            })
+
+        _, seen = drop_duplicate_products(batch(16000.0))
+        deduplicated, _ = drop_duplicate_products(batch(16250.0), seen)
+
+        self.assertTrue(deduplicated.empty)
+        # Hashes match those of frames without rate columns at the default rate
+        np.testing.assert_array_equal(product_hashes(batch(16250.0)),
+                                      product_hashes(batch(16000.0).drop(columns='Exchange_Rate')))
+
+
+if __name__ == '__main__':
+    unittest.main()
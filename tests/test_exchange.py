@@ -0,0 +1,127 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from datetime import datetime, timezone
+import tempfile
+import json
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.exchange import (CachedRateProvider, EnvRateProvider, FileRateProvider, HttpRateProvider,
+                            StaticRateProvider, get_rate_provider, DEFAULT_USD_IDR_RATE)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestProviders(unittest.TestCase):
+
+    def test_static_provider(self):
+        rate = StaticRateProvider(16250).fetch()
+
+        self.assertEqual(rate.rate, 16250.0)
+        self.assertEqual(rate.source, 'static')
+        self.assertIsNotNone(rate.timestamp.tzinfo)
+        with self.assertRaises(ValueError):
+            StaticRateProvider(0)
+
+    def test_env_provider(self):
+        with patch.dict(os.environ, {'USD_IDR_RATE': '16100.5'}):
+            self.assertEqual(EnvRateProvider().fetch().rate, 16100.5)
+        with patch.dict(os.environ, {}, clear=True), self.assertRaises(ValueError):
+            EnvRateProvider().fetch()
+
+    def test_file_provider(self):
+        """Test both a JSON rate file with timestamp and a bare number are read."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = os.path.join(tmp_dir, 'rate.json')
+            with open(json_path, 'w') as file:
+                json.dump({'rate': 16300, 'timestamp': '2026-10-19T08:00:00Z'}, file)
+            plain_path = os.path.join(tmp_dir, 'rate.txt')
+            with open(plain_path, 'w') as file:
+                file.write('15900\n')
+
+            from_json = FileRateProvider(json_path).fetch()
+            from_plain = FileRateProvider(plain_path).fetch()
+
+        self.assertEqual(from_json.rate, 16300.0)
+        self.assertEqual(from_json.timestamp, datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc))
+        self.assertEqual(from_plain.rate, 15900.0)
+
+    def test_http_provider(self):
+        session = MagicMock()
+        session.get.return_value.json.return_value = {
+            'result': 'success', 'time_last_update_unix': 1792396800, 'rates': {'USD': 1, 'IDR': 16412.3}}
+
+        rate = HttpRateProvider('https://rates.example/latest/USD', session=session).fetch()
+
+        self.assertEqual(rate.rate, 16412.3)
+        self.assertEqual(rate.timestamp, datetime.fromtimestamp(1792396800, timezone.utc))
+        session.get.assert_called_once_with('https://rates.example/latest/USD', timeout=10)
+
+
+class TestCachedRateProvider(unittest.TestCase):
+
+    def test_rate_is_fetched_once_per_ttl(self):
+        stub = StaticRateProvider(16000)
+        clock = FakeClock()
+        cached = CachedRateProvider(stub, ttl=60, clock=clock)
+
+        first = cached.fetch()
+        clock.now = 59
+        self.assertIs(cached.fetch(), first)
+        self.assertEqual(stub.calls, 1)
+
+        clock.now = 61
+        cached.fetch()
+        self.assertEqual(stub.calls, 2)
+        self.assertEqual((cached.hits, cached.misses), (1, 2))
+
+    def test_failed_refresh_keeps_stale_rate(self):
+        provider = MagicMock()
+        provider.name = 'http'
+        good = StaticRateProvider(16000).fetch()
+        provider.fetch.side_effect = [good, ConnectionError('offline')]
+        clock = FakeClock()
+        cached = CachedRateProvider(provider, ttl=60, clock=clock)
+
+        cached.fetch()
+        clock.now = 120
+        with patch('builtins.print'):
+            self.assertIs(cached.fetch(), good)
+        # The failed refresh is not retried until another ttl has passed
+        clock.now = 150
+        self.assertIs(cached.fetch(), good)
+        self.assertEqual(provider.fetch.call_count, 2)
+
+    def test_failure_without_cached_rate_raises(self):
+        with patch.dict(os.environ, {}, clear=True), self.assertRaises(ValueError):
+            CachedRateProvider(EnvRateProvider()).fetch()
+
+
+class TestGetRateProvider(unittest.TestCase):
+
+    def test_specs(self):
+        self.assertIsInstance(get_rate_provider('https://rates.example/USD').provider, HttpRateProvider)
+        self.assertIsInstance(get_rate_provider('file:rate.json').provider, FileRateProvider)
+        self.assertEqual(get_rate_provider('env:MY_RATE').provider.variable, 'MY_RATE')
+        self.assertEqual(get_rate_provider('16250').fetch().rate, 16250.0)
+        with self.assertRaises(ValueError):
+            get_rate_provider('bank-of-somewhere')
+
+    def test_default_spec_from_environment(self):
+        with patch.dict(os.environ, {}, clear=True):
+            self.assertEqual(get_rate_provider().fetch().rate, DEFAULT_USD_IDR_RATE)
+        with patch.dict(os.environ, {'USD_IDR_RATE': '16050'}, clear=True):
+            self.assertEqual(get_rate_provider().fetch().rate, 16050.0)
+        with patch.dict(os.environ, {'EXCHANGE_RATE_SOURCE': '15000', 'USD_IDR_RATE': '16050'}, clear=True):
+            self.assertEqual(get_rate_provider().fetch().rate, 15000.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
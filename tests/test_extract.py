@@ -32,6 +32,20 @@ class TestFetchingContent(unittest.TestCase):
         self.assertEqual(result, b'<html><body>Test Content</body></html>')
         session_instance.get.assert_called_once()
     
+    def test_fetching_content_reuses_session(self):
+        # Setup a session shared across requests
+        session = MagicMock()
+        session.get.return_value.status_code = 200
+        session.get.return_value.content = b'<html></html>'
+        
+        with patch('requests.Session') as mock_session:
+            fetching_content('https://example.com/page1', session)
+            fetching_content('https://example.com/page2', session)
+            
+            # No new session is created when one is passed in
+            mock_session.assert_not_called()
+        self.assertEqual(session.get.call_count, 2)
+    
     @patch('requests.Session')
     def test_fetching_content_404(self, mock_session):
         # Setup mock response for 404
@@ -59,6 +73,24 @@ class TestFetchingContent(unittest.TestCase):
         # Verify the result is None
         self.assertIsNone(result)
 
+    def test_fetching_content_uses_declared_charset(self):
+        """Test a page declared as ISO-8859-1 is decoded with that charset, not as UTF-8."""
+        response = requests.Response()
+        response.status_code = 200
+        response._content = '<h3 class="product-title">Café Jacket</h3>'.encode('iso-8859-1')
+        response.headers['Content-Type'] = 'text/html; charset=ISO-8859-1'
+        response.encoding = 'ISO-8859-1'
+        session = MagicMock()
+        session.get.return_value = response
+        
+        result = fetching_content('https://example.com', session)
+        
+        self.assertEqual(result, '<h3 class="product-title">Café Jacket</h3>')
+        
+        # UTF-8 or undeclared charsets keep the raw bytes
+        response.headers['Content-Type'] = 'text/html'
+        self.assertIsInstance(fetching_content('https://example.com', session), bytes)
+
 
 class TestExtractProductData(unittest.TestCase):
     def test_extract_complete_data(self):
@@ -86,6 +118,23 @@ class TestExtractProductData(unittest.TestCase):
         self.assertEqual(result['Size'], 'M')
         self.assertEqual(result['Gender'], 'Unisex')
     
+    def test_extract_shares_repeated_values(self):
+        """Test repeated detail lines give one shared string object per value."""
+        card = ('<div class="product-details"><h3 class="product-title">Shirt {0}</h3>'
+                '<span class="price">$10.00</span>'
+                '<p style="font-size: 14px; color: #777;">3 Colors</p>'
+                '<p style="font-size: 14px; color: #777;">Size: XL</p>'
+                '<p style="font-size: 14px; color: #777;">Gender: Women</p></div>')
+        soup = BeautifulSoup("".join(card.format(i) for i in range(3)), 'html.parser')
+        
+        first, second, third = [extract_product_data(c) for c in soup.find_all('div', class_='product-details')]
+        
+        self.assertEqual(first['Size'], 'XL')
+        self.assertEqual(third['Colors'], '3 Colors')
+        for field in ('Colors', 'Size', 'Gender'):
+            self.assertIs(first[field], second[field])
+            self.assertIs(first[field], third[field])
+    
     def test_extract_minimum_data(self):
         # Create sample HTML with minimum data
         html = '''
@@ -4,12 +4,17 @@ import pandas as pd
 import numpy as np
 import json
 import io
+import tempfile
 import sys
 import os
+from datetime import date
 
 # Fix the import to match your project structure
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.load import store_to_postgre, save_to_json, save_to_csv
+from utils.load import store_to_postgre, save_to_json, save_to_jsonl, save_to_csv, JsonArrayWriter
+from utils.load import create_partitioned_table, ensure_partitions, drop_expired_partitions
+from utils.load import parallel_store_to_postgre, save_to_google_sheets
+from utils.load import summarize_products, update_summary_tables, rebuild_summary_tables
 
 
 class TestLoadFunctions(unittest.TestCase):
@@ -68,6 +73,8 @@ class TestLoadFunctions(unittest.TestCase):
         self.assertTrue(result)
         mock_connect.assert_called_once()
         self.assertEqual(mock_cursor.execute.call_count, 1)  # For CREATE TABLE query
+        # Tables created before the exchange-rate columns existed get them added
+        self.assertIn("ADD COLUMN IF NOT EXISTS exchange_rate", mock_cursor.execute.call_args[0][0])
         mock_execute_values.assert_called_once()
         self.assertEqual(mock_conn.commit.call_count, 1)
         mock_cursor.close.assert_called_once()
@@ -108,6 +115,28 @@ class TestLoadFunctions(unittest.TestCase):
         self.assertIn("test_table", create_table_call)
         mock_execute_values.assert_called_once()
 
+    @patch('utils.load.execute_values')
+    @patch('utils.load.psycopg2.connect')
+    def test_store_to_postgre_connection_pool(self, mock_connect, mock_execute_values):
+        """Test a pooled connection is borrowed and returned instead of opened and closed."""
+        mock_pool = MagicMock()
+        mock_conn = mock_pool.getconn.return_value
+
+        result = store_to_postgre(self.test_df, connection_pool=mock_pool)
+
+        self.assertTrue(result)
+        mock_connect.assert_not_called()
+        mock_pool.putconn.assert_called_once_with(mock_conn)
+        mock_conn.close.assert_not_called()
+
+        # A failed load discards the pooled connection
+        mock_pool.reset_mock()
+        mock_execute_values.side_effect = Exception("Insert failed")
+        result = store_to_postgre(self.test_df, connection_pool=mock_pool)
+
+        self.assertFalse(result)
+        mock_pool.putconn.assert_called_once_with(mock_pool.getconn.return_value, close=True)
+
     @patch('utils.load.psycopg2.connect')
     def test_store_to_postgre_failure(self, mock_connect):
         """Test handling of PostgreSQL connection failure."""
@@ -159,6 +188,42 @@ class TestLoadFunctions(unittest.TestCase):
         # Assert result
         self.assertTrue(result)
 
+    @patch('builtins.open', new_callable=mock_open)
+    @patch('json.dump')
+    def test_save_to_json_missing_values(self, mock_json_dump, mock_file_open):
+        """Test missing values (NaN, nullable NA) are written as JSON null."""
+        df = pd.DataFrame({
+            'title': ['Product 1', 'Product 2'],
+            'rating': [4.5, np.nan],
+            'colors': pd.array([3, None], dtype="Int64")
+        })
+
+        result = save_to_json(df)
+
+        saved_data = mock_json_dump.call_args[0][0]
+        self.assertIsNone(saved_data[1]['rating'])
+        self.assertIsNone(saved_data[1]['colors'])
+        self.assertEqual(saved_data[0]['colors'], 3)
+        self.assertTrue(result)
+
+    def test_json_array_writer_matches_save_to_json(self):
+        """Test writing in batches produces the same file as save_to_json."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            full_path = os.path.join(tmp_dir, 'full.json')
+            batched_path = os.path.join(tmp_dir, 'batched.json')
+            empty_path = os.path.join(tmp_dir, 'empty.json')
+
+            save_to_json(self.test_df, full_path)
+            writer = JsonArrayWriter(batched_path)
+            self.assertTrue(writer.write(self.test_df.iloc[:2]))
+            self.assertTrue(writer.write(self.test_df.iloc[2:]))
+            writer.close()
+            JsonArrayWriter(empty_path).close()
+
+            with open(full_path) as full, open(batched_path) as batched, open(empty_path) as empty:
+                self.assertEqual(batched.read(), full.read())
+                self.assertEqual(json.load(empty), [])
+
     @patch('builtins.open')
     def test_save_to_json_exception(self, mock_file_open):
         """Test error handling in save_to_json function."""
@@ -195,6 +260,26 @@ class TestLoadFunctions(unittest.TestCase):
         # Assert result
         self.assertTrue(result)
 
+    @patch('pandas.DataFrame.to_csv')
+    def test_save_to_csv_append(self, mock_to_csv):
+        """Test appending to CSV skips the header."""
+        result = save_to_csv(self.test_df, 'custom_file.csv', append=True)
+
+        mock_to_csv.assert_called_once_with('custom_file.csv', mode='a', header=False, index=False)
+        self.assertTrue(result)
+
+    @patch('builtins.open', new_callable=mock_open)
+    def test_save_to_jsonl(self, mock_file_open):
+        """Test saving to JSON Lines writes one record per line."""
+        result = save_to_jsonl(self.test_df, 'products.jsonl', append=True)
+
+        mock_file_open.assert_called_once_with('products.jsonl', 'a')
+        written = ''.join(call.args[0] for call in mock_file_open().write.call_args_list)
+        lines = written.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertEqual(json.loads(lines[0])['title'], 'Product 1')
+        self.assertTrue(result)
+
     @patch('pandas.DataFrame.to_csv')
     def test_save_to_csv_exception(self, mock_to_csv):
         """Test error handling in save_to_csv function."""
@@ -208,5 +293,326 @@ class TestLoadFunctions(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestPartitioning(unittest.TestCase):
+
+    def executed(self, cursor):
+        return [call.args[0] for call in cursor.execute.call_args_list]
+
+    def test_create_partitioned_table(self):
+        """Test the table is range-partitioned on created_at with title/gender/size indexes."""
+        cursor = MagicMock()
+        cursor.fetchone.return_value = None
+
+        create_partitioned_table(cursor, 'products')
+
+        statements = self.executed(cursor)
+        self.assertIn('PARTITION BY RANGE (created_at)', statements[1])
+        self.assertIn('PRIMARY KEY (id, created_at)', statements[1])
+        self.assertIn('CREATE TABLE IF NOT EXISTS products_default PARTITION OF products DEFAULT', statements[1])
+        for column in ('title', 'gender', 'size'):
+            self.assertTrue(any(f'products_{column}_idx ON products ({column})' in s for s in statements))
+
+    def test_create_partitioned_table_rejects_plain_table(self):
+        """Test an existing unpartitioned table is reported instead of silently used."""
+        cursor = MagicMock()
+        cursor.fetchone.return_value = ('r',)
+
+        with self.assertRaises(ValueError):
+            create_partitioned_table(cursor, 'products')
+
+    def test_ensure_partitions_creates_upcoming_months(self):
+        """Test the current month and the premade months get a partition, across a year boundary."""
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [('products_p2026_12',), ('products_p2027_01',)]
+
+        names = ensure_partitions(cursor, 'products', premake=2, today=date(2026, 11, 19))
+
+        self.assertEqual(names, ['products_p2026_11', 'products_p2026_12', 'products_p2027_01'])
+        statements = self.executed(cursor)
+        self.assertIn('pg_advisory_xact_lock', statements[1])
+        self.assertEqual(statements[3], 'CREATE TABLE products_p2026_12 (LIKE products INCLUDING DEFAULTS)')
+        # Rows of the new month already in the DEFAULT partition move over before the attach
+        self.assertIn('DELETE FROM products_default WHERE created_at >= %s', statements[4])
+        self.assertEqual(cursor.execute.call_args_list[4].args[1], (date(2026, 12, 1), date(2027, 1, 1)))
+        self.assertIn("ATTACH PARTITION products_p2027_01 FOR VALUES FROM ('2027-01-01') TO ('2027-02-01')",
+                      statements[-1])
+        self.assertFalse(any('products_p2026_11' in statement for statement in statements))
+
+    def test_ensure_partitions_uses_server_date(self):
+        """Test the months follow the database server's CURRENT_DATE and existing partitions are left alone."""
+        cursor = MagicMock()
+        cursor.fetchone.return_value = (date(2026, 12, 31),)
+        cursor.fetchall.return_value = []
+
+        names = ensure_partitions(cursor, 'products', premake=1)
+
+        self.assertEqual(names, ['products_p2026_12', 'products_p2027_01'])
+        self.assertEqual(self.executed(cursor)[0], 'SELECT CURRENT_DATE')
+        self.assertEqual(cursor.execute.call_count, 2)
+
+    def test_drop_expired_partitions(self):
+        """Test only partitions ending before the retention window are dropped."""
+        cursor = MagicMock()
+        cursor.fetchall.return_value = [
+            ('products_p2025_09',), ('products_p2025_10',), ('products_p2025_11',),
+            ('products_p2026_10',), ('products_legacy',),
+        ]
+
+        dropped = drop_expired_partitions(cursor, 'products', retention_months=12, today=date(2026, 10, 19))
+
+        self.assertEqual(dropped, ['products_p2025_09'])
+        self.assertIn('DELETE FROM products_default WHERE created_at < %s', self.executed(cursor))
+        self.assertIn('DROP TABLE IF EXISTS products_p2025_09', self.executed(cursor))
+
+    @patch('utils.load.execute_values')
+    @patch('utils.load.psycopg2.connect')
+    def test_store_to_postgre_partitioned(self, mock_connect, mock_execute_values):
+        """Test a partitioned load creates the partitioned schema and partitions before inserting."""
+        mock_cursor = mock_connect.return_value.cursor.return_value
+        mock_cursor.fetchone.side_effect = [('p',), (date(2026, 10, 19),)]
+        mock_cursor.fetchall.return_value = [('products_p2026_10',)]
+        df = pd.DataFrame({'title': ['Product 1'], 'price': [19.99]})
+
+        result = store_to_postgre(df, partitioned=True)
+
+        self.assertTrue(result)
+        statements = self.executed(mock_cursor)
+        self.assertTrue(any('PARTITION BY RANGE' in s for s in statements))
+        self.assertTrue(any('ATTACH PARTITION products_p2026_10' in s for s in statements))
+        mock_execute_values.assert_called_once()
+
+
+class TestParallelLoad(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'title': [f'Product {i}' for i in range(10)],
+            'price': np.arange(10) * 1.5,
+            'gender': ['Men', 'Women'] * 5,
+        })
+
+    @patch('utils.load.psycopg2.connect')
+    def test_shards_are_copied_then_merged(self, mock_connect):
+        """Test every shard is COPYed over its own connection and merged in one INSERT."""
+        connections = [MagicMock() for _ in range(4)]
+        mock_connect.side_effect = connections
+        copied = []
+        for conn in connections[1:]:
+            cursor = conn.cursor.return_value.__enter__.return_value
+            cursor.copy_expert.side_effect = lambda sql, buffer: copied.append(buffer.read())
+
+        stats = parallel_store_to_postgre(self.df, workers=3)
+
+        self.assertEqual(stats['rows'], 10)
+        self.assertEqual(stats['shards'], 3)
+        self.assertEqual(mock_connect.call_count, 4)
+        self.assertEqual(sum(len(rows.splitlines()) for rows in copied), 10)
+
+        statements = [call.args[0] for call in connections[0].cursor.return_value.execute.call_args_list]
+        self.assertTrue(any(s.startswith('CREATE UNLOGGED TABLE products_staging_') for s in statements))
+        self.assertTrue(any(s.startswith('INSERT INTO products (title, price, gender) SELECT') for s in statements))
+        self.assertTrue(statements[-1].startswith('DROP TABLE products_staging_'))
+        for conn in connections:
+            conn.close.assert_called_once()
+
+    @patch('utils.load.psycopg2.connect')
+    def test_failed_shard_drops_staging(self, mock_connect):
+        """Test a failed shard aborts the merge and removes the staging table."""
+        main_conn = MagicMock()
+        shard_conn = MagicMock()
+        shard_conn.cursor.return_value.__enter__.return_value.copy_expert.side_effect = Exception("COPY failed")
+        mock_connect.side_effect = [main_conn, shard_conn]
+
+        stats = parallel_store_to_postgre(self.df, workers=1)
+
+        self.assertIsNone(stats)
+        main_statements = [call.args[0] for call in main_conn.cursor.return_value.execute.call_args_list]
+        self.assertFalse(any(s.startswith('INSERT INTO') for s in main_statements))
+        main_conn.rollback.assert_called_once()
+        self.assertTrue(any('DROP TABLE IF EXISTS products_staging_' in s for s in main_statements))
+
+
+class TestSummaryTables(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Title': ['Shirt', 'Jacket', 'Dress', 'Cap'],
+            'Price': np.array([100.0, 300.0, 200.0, 50.0], dtype=np.float32),
+            'Rating': [4.5, np.nan, 1.5, 5.0],
+            'Colors': pd.array([3, 2, 1, None], dtype='Int64'),
+            'Size': pd.Categorical(['M', 'M', 'S', None]),
+            'Gender': pd.Categorical(['Men', 'Men', 'Women', 'Men']),
+        })
+
+    def test_summarize_products(self):
+        """Test a batch is aggregated per gender/size with a rating histogram."""
+        summary = summarize_products(self.df).set_index(['gender', 'size'])
+
+        self.assertEqual(list(summary.index), [('Men', ''), ('Men', 'M'), ('Women', 'S')])
+        men_m = summary.loc[('Men', 'M')]
+        self.assertEqual(men_m['product_count'], 2)
+        self.assertEqual(men_m['price_sum'], 400.0)
+        self.assertEqual((men_m['price_min'], men_m['price_max']), (100.0, 300.0))
+        self.assertEqual((men_m['rating_count'], men_m['rating_sum']), (1, 4.5))
+        self.assertEqual(summary['rating_4'].tolist(), [1, 1, 0])
+        self.assertEqual(summary['rating_1'].tolist(), [0, 0, 1])
+
+    @patch('utils.load.execute_values')
+    def test_update_adds_batch_to_both_tables(self, mock_execute_values):
+        """Test the batch is upserted into the all-time and the per-run summary."""
+        cursor = MagicMock()
+
+        update_summary_tables(cursor, self.df, 'products', run_id='run-1')
+
+        self.assertIn('CREATE TABLE IF NOT EXISTS products_summary', cursor.execute.call_args.args[0])
+        (_, totals_sql, totals_rows), (_, run_sql, run_rows) = [call.args for call in mock_execute_values.call_args_list]
+        self.assertIn('ON CONFLICT (gender, size) DO UPDATE', totals_sql)
+        self.assertIn('product_count = products_summary.product_count + EXCLUDED.product_count', totals_sql)
+        self.assertIn('price_min = LEAST(products_summary.price_min, EXCLUDED.price_min)', totals_sql)
+        self.assertIn('ON CONFLICT (run_id, gender, size)', run_sql)
+        self.assertEqual(totals_rows[1][:4], ('Men', 'M', 2, 400.0))
+        self.assertIs(type(totals_rows[1][2]), int)
+        self.assertEqual(run_rows[1][:3], ('run-1', 'Men', 'M'))
+
+    @patch('utils.load.execute_values')
+    def test_group_without_prices_sends_null_min_max(self, mock_execute_values):
+        """Test NaN price aggregates are sent as NULL, not as NUMERIC 'NaN'."""
+        df = self.df.assign(Price=[100.0, 300.0, np.nan, 50.0])
+
+        update_summary_tables(MagicMock(), df, 'products', run_id='run-1')
+
+        women_s = mock_execute_values.call_args_list[0].args[2][2]
+        self.assertEqual(women_s[:3], ('Women', 'S', 1))
+        self.assertEqual(women_s[4:6], (None, None))
+        self.assertEqual(women_s[3], 0.0)
+
+    @patch('utils.load.execute_values')
+    @patch('utils.load.psycopg2.connect')
+    def test_store_to_postgre_updates_summaries_in_same_transaction(self, mock_connect, mock_execute_values):
+        mock_conn = mock_connect.return_value
+
+        result = store_to_postgre(self.df, summaries=True, run_id='run-1')
+
+        self.assertTrue(result)
+        self.assertEqual(mock_execute_values.call_count, 3)
+        mock_conn.commit.assert_called_once()
+
+    @patch('utils.load.psycopg2.connect')
+    def test_rebuild_from_history(self, mock_connect):
+        cursor = mock_connect.return_value.cursor.return_value
+        cursor.rowcount = 12
+
+        with patch('builtins.print'):
+            rows = rebuild_summary_tables()
+
+        self.assertEqual(rows, 12)
+        statements = [call.args[0] for call in cursor.execute.call_args_list]
+        self.assertEqual(statements[1], 'DELETE FROM products_summary')
+        self.assertIn('COUNT(*) FILTER (WHERE rating >= 4)', statements[2])
+        self.assertIn('GROUP BY 1, 2', statements[2])
+        mock_connect.return_value.commit.assert_called_once()
+
+
+class QuotaError(Exception):
+    """Stand-in for googleapiclient.errors.HttpError."""
+
+    def __init__(self, status):
+        super().__init__(f"HTTP {status}")
+        self.resp = MagicMock(status=status)
+
+
+class TestGoogleSheets(unittest.TestCase):
+
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'Title': [f'Product {i}' for i in range(25)],
+            'Price': np.arange(25) * 16000.0,
+            'Colors': pd.array([3] * 24 + [None], dtype='Int64'),
+        })
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmp_dir.name, 'sheets_state.json')
+        self.service = MagicMock()
+        self.values_api = self.service.spreadsheets.return_value.values.return_value
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def save(self, df):
+        return save_to_google_sheets(df, 'sheet-id', 'Products', service=self.service,
+                                     state_path=self.state_path, block_rows=10, request_rows=20)
+
+    def updated_ranges(self):
+        return [entry['range'] for call in self.values_api.batchUpdate.call_args_list
+                for entry in call.kwargs['body']['data']]
+
+    def test_first_upload_writes_every_block_in_batches(self):
+        """Test the first upload sends all blocks in as few batchUpdate calls as the size limit allows."""
+        self.assertTrue(self.save(self.df))
+
+        # 26 rows (header + 25) -> 3 blocks of up to 10 rows, at most 20 rows per request
+        self.assertEqual(self.updated_ranges(),
+                         ["'Products'!A1:C10", "'Products'!A11:C20", "'Products'!A21:C26"])
+        self.assertEqual(self.values_api.batchUpdate.call_count, 2)
+        first_block = self.values_api.batchUpdate.call_args_list[0].kwargs['body']['data'][0]['values']
+        self.assertEqual(first_block[0], ['Title', 'Price', 'Colors'])
+        last_block = self.values_api.batchUpdate.call_args_list[1].kwargs['body']['data'][0]['values']
+        self.assertEqual(last_block[-1], ['Product 24', 384000.0, ''])
+        self.values_api.batchClear.assert_called_once()
+
+    def test_next_upload_writes_only_changed_ranges(self):
+        """Test unchanged blocks are skipped and only the changed range is rewritten."""
+        self.save(self.df)
+        self.values_api.reset_mock()
+
+        self.assertTrue(self.save(self.df))
+        self.values_api.batchUpdate.assert_not_called()
+        self.values_api.batchClear.assert_not_called()
+
+        changed = self.df.copy()
+        changed.loc[12, 'Price'] = 1.0
+        self.assertTrue(self.save(changed))
+        self.assertEqual(self.updated_ranges(), ["'Products'!A11:C20"])
+
+    def test_shorter_upload_clears_leftover_rows(self):
+        """Test rows of a longer previous upload are cleared."""
+        self.save(self.df)
+        self.values_api.reset_mock()
+
+        self.assertTrue(self.save(self.df.head(5)))
+
+        body = self.values_api.batchClear.call_args.kwargs['body']
+        self.assertEqual(body['ranges'], ["'Products'!A7:ZZ"])
+
+    def test_narrower_upload_clears_leftover_columns(self):
+        """Test columns of a wider previous upload are cleared in every remaining row."""
+        self.save(self.df)
+        self.values_api.reset_mock()
+
+        self.assertTrue(self.save(self.df.drop(columns='Colors')))
+
+        body = self.values_api.batchClear.call_args.kwargs['body']
+        self.assertEqual(body['ranges'], ["'Products'!C1:C26"])
+        self.assertEqual(len(self.updated_ranges()), 3)
+
+    @patch('utils.load.time.sleep')
+    def test_quota_errors_are_retried_with_backoff(self, mock_sleep):
+        """Test 429 responses are retried with growing delays."""
+        request = self.values_api.batchUpdate.return_value
+        request.execute.side_effect = [QuotaError(429), QuotaError(429), {}, {}]
+
+        self.assertTrue(self.save(self.df))
+
+        delays = [call.args[0] for call in mock_sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertGreater(delays[1], delays[0])
+
+    def test_other_errors_fail_without_saving_state(self):
+        """Test a non-retryable error fails the sink and keeps the previous state."""
+        self.values_api.batchUpdate.return_value.execute.side_effect = QuotaError(403)
+
+        self.assertFalse(self.save(self.df))
+        self.assertFalse(os.path.exists(self.state_path))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
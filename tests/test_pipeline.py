@@ -0,0 +1,111 @@
+import unittest
+import threading
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.pipeline import Pipeline
+
+
+class TestPipeline(unittest.TestCase):
+
+    def test_fan_out_to_every_sink(self):
+        """Test every item reaches every downstream stage and on_close runs once."""
+        pipeline = Pipeline()
+        received = {"a": [], "b": []}
+        closed = []
+
+        source = pipeline.add_source("source", lambda: iter(range(10)))
+        double = pipeline.add_stage("double", lambda x: x * 2, source, workers=3)
+        pipeline.add_stage("a", received["a"].append, double, on_close=lambda: closed.append("a"))
+        pipeline.add_stage("b", received["b"].append, double, workers=2)
+
+        stats = pipeline.run()
+
+        expected = [x * 2 for x in range(10)]
+        self.assertEqual(sorted(received["a"]), expected)
+        self.assertEqual(sorted(received["b"]), expected)
+        self.assertEqual(closed, ["a"])
+        self.assertEqual(stats["double"]["items_in"], 10)
+        self.assertEqual(stats["source"]["items_out"], 10)
+
+    def test_backpressure_bounds_buffering(self):
+        """Test a slow sink stops the source from running far ahead."""
+        pipeline = Pipeline()
+        produced = []
+        consumed = []
+        max_lead = [0]
+        lock = threading.Lock()
+
+        def source():
+            for i in range(30):
+                with lock:
+                    produced.append(i)
+                    max_lead[0] = max(max_lead[0], len(produced) - len(consumed))
+                yield i
+
+        def slow_sink(item):
+            time.sleep(0.002)
+            with lock:
+                consumed.append(item)
+
+        src = pipeline.add_source("source", source)
+        middle = pipeline.add_stage("middle", lambda x: x, src, queue_size=2)
+        pipeline.add_stage("sink", slow_sink, middle, queue_size=2)
+
+        pipeline.run()
+
+        self.assertEqual(consumed, list(range(30)))
+        # At most: two queues of 2, one item in each worker, one being produced
+        self.assertLessEqual(max_lead[0], 2 + 2 + 3)
+
+    def test_errors_are_counted_and_skipped(self):
+        """Test a failing item is counted without stopping the stage."""
+        pipeline = Pipeline()
+        received = []
+
+        def fail_on_three(x):
+            if x == 3:
+                raise ValueError("bad item")
+            return x
+
+        source = pipeline.add_source("source", lambda: range(5))
+        check = pipeline.add_stage("check", fail_on_three, source)
+        pipeline.add_stage("sink", received.append, check)
+
+        stats = pipeline.run()
+
+        self.assertEqual(received, [0, 1, 2, 4])
+        self.assertEqual(stats["check"]["errors"], 1)
+        self.assertEqual(stats["sink"]["errors"], 0)
+
+    def test_rows_and_status_line(self):
+        """Test row counts use item length and the status line names every stage."""
+        pipeline = Pipeline()
+        source = pipeline.add_source("extract", lambda: [[1, 2, 3], [4, 5]])
+        pipeline.add_stage("load", lambda batch: None, source)
+
+        stats = pipeline.run()
+
+        self.assertEqual(stats["extract"]["rows_out"], 5)
+        self.assertEqual(stats["load"]["rows_in"], 5)
+        self.assertEqual(stats["load"]["rows_out"], 0)
+        self.assertIn("extract:", pipeline.status_line())
+        self.assertIn("load: q=0/8", pipeline.status_line())
+
+    def test_invalid_graph(self):
+        """Test pipelines need exactly one source and known upstream stages."""
+        pipeline = Pipeline()
+        with self.assertRaises(ValueError):
+            pipeline.run()
+
+        source = pipeline.add_source("source", lambda: [])
+        with self.assertRaises(ValueError):
+            pipeline.add_source("other", lambda: [])
+        with self.assertRaises(ValueError):
+            Pipeline().add_stage("orphan", print, source)
+
+
+if __name__ == '__main__':
+    unittest.main()
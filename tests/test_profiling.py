@@ -0,0 +1,101 @@
+import unittest
+import tempfile
+import pstats
+import types
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.profiling import StageProfiler, collapsed_stacks
+
+# Stand-in stage module: outer() calls inner() through the module global, like parse_page -> make_soup
+fake_stages = types.ModuleType("fake_stages")
+exec(
+    "def busy(n):\n"
+    "    return sum(i * i for i in range(n))\n"
+    "def inner():\n"
+    "    return busy(20000)\n"
+    "def outer():\n"
+    "    busy(20000)\n"
+    "    return inner() + inner()\n",
+    fake_stages.__dict__,
+)
+sys.modules["fake_stages"] = fake_stages
+
+TARGETS = {
+    "outer": [("fake_stages", "outer")],
+    "inner": [("fake_stages", "inner")],
+}
+
+
+def function_names(stats):
+    return {name for (_, _, name) in stats.stats}
+
+
+class TestStageProfiler(unittest.TestCase):
+
+    def run_profiled(self, output_dir):
+        profiler = StageProfiler(output_dir, targets=TARGETS, top=5)
+        original = fake_stages.outer
+        with profiler.installed():
+            self.assertIsNot(fake_stages.outer, original)
+            fake_stages.outer()
+        self.assertIs(fake_stages.outer, original)
+        return profiler
+
+    def test_nested_stages_are_profiled_separately(self):
+        """Test a nested stage pauses the enclosing one and counts its own calls."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profiler = self.run_profiled(tmp_dir)
+            results = profiler.write_reports()
+
+        self.assertEqual(profiler.calls["outer"], 1)
+        self.assertEqual(profiler.calls["inner"], 2)
+        outer_calls = {name: stats[1] for (_, _, name), stats in results["outer"].stats.items()}
+        inner_calls = {name: stats[1] for (_, _, name), stats in results["inner"].stats.items()}
+        # outer's own busy() call is in the outer report, inner's busy() calls only in the inner one
+        self.assertEqual(outer_calls["busy"], 1)
+        self.assertEqual(inner_calls["busy"], 2)
+        self.assertNotIn("inner", function_names(results["outer"]))
+
+    def test_reports_are_written_per_stage(self):
+        """Test every stage gets a loadable .pstats file and a collapsed-stack file."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            profiler = self.run_profiled(tmp_dir)
+            profiler.report()
+
+            for stage in ("outer", "inner"):
+                stats = pstats.Stats(os.path.join(tmp_dir, f"{stage}.pstats"))
+                self.assertIn("busy", function_names(stats))
+                with open(os.path.join(tmp_dir, f"{stage}.collapsed")) as file:
+                    lines = file.read().splitlines()
+                self.assertTrue(lines)
+                for line in lines:
+                    stack, microseconds = line.rsplit(" ", 1)
+                    self.assertTrue(stack)
+                    self.assertGreater(int(microseconds), 0)
+
+
+class TestCollapsedStacks(unittest.TestCase):
+
+    def test_self_time_is_split_over_call_paths(self):
+        """Test a function called from two callers appears under both paths."""
+        stats = types.SimpleNamespace(stats={
+            ("m.py", 1, "root"): (1, 1, 0.001, 0.010, {}),
+            ("m.py", 2, "a"): (1, 1, 0.001, 0.004, {("m.py", 1, "root"): (1, 1, 0.001, 0.004)}),
+            ("m.py", 3, "b"): (1, 1, 0.001, 0.005, {("m.py", 1, "root"): (1, 1, 0.001, 0.005)}),
+            ("m.py", 4, "leaf"): (2, 2, 0.007, 0.007, {
+                ("m.py", 2, "a"): (1, 1, 0.003, 0.003),
+                ("m.py", 3, "b"): (1, 1, 0.004, 0.004),
+            }),
+        })
+
+        lines = dict(line.rsplit(" ", 1) for line in collapsed_stacks(stats))
+
+        self.assertEqual(lines["root (m.py:1);a (m.py:2);leaf (m.py:4)"], "3000")
+        self.assertEqual(lines["root (m.py:1);b (m.py:3);leaf (m.py:4)"], "4000")
+        self.assertEqual(lines["root (m.py:1)"], "1000")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+import pickle
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.records import RawProduct, Product, PRODUCT_COLUMNS, records_to_DataFrame
+
+
+class TestProductRecords(unittest.TestCase):
+
+    def test_column_access(self):
+        """Records can be read by column name like the old dictionaries."""
+        record = RawProduct("T-shirt", "$10.00", "4.5 / 5", "3 Colors", "M", "Men")
+
+        self.assertEqual(record["Title"], "T-shirt")
+        self.assertEqual(record.get("Gender"), "Men")
+        self.assertIsNone(record.get("Missing"))
+        self.assertEqual(record.get("Missing", "default"), "default")
+        self.assertEqual(list(record.keys()), list(PRODUCT_COLUMNS))
+        with self.assertRaises(KeyError):
+            record["Missing"]
+
+    def test_no_instance_dict(self):
+        """Records use __slots__ and carry no per-instance dictionary."""
+        record = Product("Hoodie", 16000.0, 4.8, 3, "L", "Unisex")
+
+        self.assertFalse(hasattr(record, "__dict__"))
+        with self.assertRaises(AttributeError):
+            record.extra = 1
+
+    def test_equality_and_pickle(self):
+        """Records compare by value and survive pickling (for process pools)."""
+        record = Product("Hoodie", 16000.0, 4.8, 3, "L", "Unisex")
+
+        self.assertEqual(record, pickle.loads(pickle.dumps(record)))
+        self.assertEqual(record, record.to_dict())
+        self.assertNotEqual(record, RawProduct(*record.values()))
+        self.assertEqual(Product.from_dict(record.to_dict()), record)
+
+    def test_records_to_DataFrame(self):
+        """Records and dictionaries convert to the same columnar DataFrame."""
+        records = [
+            Product("A", 1000.0, 4.0, 2, "S", "Men"),
+            {"Title": "B", "Price": 2000.0, "Rating": None, "Colors": 3, "Size": "M", "Gender": "Women"},
+        ]
+
+        df = records_to_DataFrame(records)
+
+        self.assertEqual(list(df.columns), list(PRODUCT_COLUMNS))
+        self.assertEqual(df["Title"].tolist(), ["A", "B"])
+        self.assertEqual(df["Price"].tolist(), [1000.0, 2000.0])
+        self.assertTrue(records_to_DataFrame([]).empty)
+
+
+if __name__ == '__main__':
+    unittest.main()
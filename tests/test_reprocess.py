@@ -0,0 +1,99 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import json
+import sys
+import os
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.reprocess import iter_file_chunks, reprocess_chunk, reprocess_file
+
+
+class TestReprocess(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+
+        # Existing output with a few problematic rows
+        self.df = pd.DataFrame({
+            'Title': ['Product 1', '', 'Product 3', None, 'Product 5'],
+            'Price': [1600000.0, 3200000.0, None, 800000.0, 480000.0],
+            'Rating': [4.5, 3.8, 4.2, 3.1, 4.9],
+            'Colors': [3, 2, 4, 1, 3],
+            'Size': ['M', 'L', 'S', 'XL', 'M'],
+            'Gender': ['Men', 'Women', 'Unisex', 'Men', 'Women']
+        })
+        self.csv_path = self.path('products.csv')
+        self.df.to_csv(self.csv_path, index=False)
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_iter_file_chunks_csv(self):
+        """Test CSV files are streamed in chunks of the requested size."""
+        chunks = list(iter_file_chunks(self.csv_path, chunksize=2))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+
+    def test_iter_file_chunks_unsupported(self):
+        """Test unsupported file types are rejected."""
+        with self.assertRaises(ValueError):
+            list(iter_file_chunks(self.path('products.parquet')))
+
+    def test_reprocess_chunk_raw_data(self):
+        """Test scraped (untransformed) chunks go through the full transform."""
+        raw_chunk = pd.DataFrame({
+            'Title': ['T-shirt', 'Unknown Product'],
+            'Price': ['$10.00', '$20.00'],
+            'Rating': ['Rating: 4.5 / 5', 'Not Rated'],
+            'Colors': ['3 Colors', None],
+            'Size': ['M', 'L'],
+            'Gender': ['Men', 'Women']
+        })
+
+        cleaned = reprocess_chunk(raw_chunk)
+
+        self.assertEqual(cleaned['Title'].tolist(), ['T-shirt'])
+        self.assertEqual(cleaned['Price'].tolist(), [160000.0])
+
+    def test_reprocess_file_to_csv_and_jsonl(self):
+        """Test chunked reprocessing writes one header and all cleaned rows."""
+        csv_out = self.path('cleaned.csv')
+        jsonl_out = self.path('cleaned.jsonl')
+
+        stats = reprocess_file(self.csv_path, csv_path=csv_out, jsonl_path=jsonl_out, chunksize=2)
+
+        # CSV stores empty and missing titles alike, so both come back as "Unknown Product"
+        self.assertEqual(stats, {'chunks': 3, 'rows_read': 5, 'rows_written': 4, 'failed_chunks': 0})
+        cleaned = pd.read_csv(csv_out)
+        self.assertEqual(cleaned['Title'].tolist(),
+                         ['Product 1', 'Unknown Product', 'Unknown Product', 'Product 5'])
+        with open(jsonl_out) as file:
+            records = [json.loads(line) for line in file]
+        self.assertEqual([record['Title'] for record in records], cleaned['Title'].tolist())
+
+        # The JSON Lines output can itself be reprocessed
+        stats = reprocess_file(jsonl_out, csv_path=self.path('again.csv'), chunksize=2)
+        self.assertEqual(stats['rows_written'], 4)
+
+    @patch('utils.reprocess.store_to_postgre')
+    def test_reprocess_file_to_postgres(self, mock_store):
+        """Test every non-empty chunk is stored to PostgreSQL and failures are counted."""
+        mock_store.side_effect = [True, False, True]
+
+        stats = reprocess_file(self.csv_path, connection_params={'host': 'localhost'}, chunksize=2)
+
+        self.assertEqual(mock_store.call_count, 3)
+        self.assertEqual(stats['failed_chunks'], 1)
+        self.assertEqual(stats['rows_written'], 3)
+
+    def test_reprocess_file_refuses_to_overwrite_input(self):
+        """Test the input file cannot be used as an output."""
+        with self.assertRaises(ValueError):
+            reprocess_file(self.csv_path, csv_path=self.csv_path)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+import tempfile
+import threading
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils import scheduler
+from utils.scheduler import RunLock, run_scheduled
+
+
+class TestRunScheduled(unittest.TestCase):
+
+    def test_runs_until_max_runs(self):
+        """Test the job runs once per tick up to max_runs."""
+        calls = []
+
+        stats = run_scheduled(lambda: calls.append(1), interval=0.01, max_runs=3)
+
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(stats['runs'], 3)
+        self.assertEqual(stats['failures'], 0)
+
+    def test_failures_do_not_stop_the_schedule(self):
+        """Test a failing run is counted and the next run still happens."""
+        calls = []
+
+        def job():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("database down")
+
+        stats = run_scheduled(job, interval=0.01, max_runs=2)
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(stats['failures'], 1)
+
+    def test_slow_run_skips_missed_ticks(self):
+        """Test ticks that pass during a long run are skipped, not queued."""
+        calls = []
+
+        def slow_job():
+            calls.append(time.monotonic())
+            if len(calls) == 1:
+                time.sleep(0.12)
+
+        stats = run_scheduled(slow_job, interval=0.05, max_runs=2)
+
+        self.assertEqual(len(calls), 2)
+        self.assertGreaterEqual(stats['skipped_missed'], 1)
+
+    def test_stop_event_ends_the_loop(self):
+        """Test setting the stop event ends the schedule while waiting."""
+        stop_event = threading.Event()
+        calls = []
+
+        def job():
+            calls.append(1)
+            stop_event.set()
+
+        stats = run_scheduled(job, interval=60, stop_event=stop_event)
+
+        self.assertEqual(calls, [1])
+        self.assertEqual(stats['runs'], 1)
+
+    def test_invalid_interval(self):
+        with self.assertRaises(ValueError):
+            run_scheduled(lambda: None, interval=0)
+
+
+class TestRunLock(unittest.TestCase):
+
+    def test_in_process_overlap(self):
+        """Test the same lock cannot be taken twice."""
+        lock = RunLock()
+
+        self.assertTrue(lock.acquire())
+        self.assertFalse(lock.acquire())
+        lock.release()
+        self.assertTrue(lock.acquire())
+        lock.release()
+
+    @unittest.skipIf(scheduler.fcntl is None, "flock is not available on this platform")
+    def test_lock_file_blocks_other_runs(self):
+        """Test a run is skipped while another holder owns the lock file."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lock_path = os.path.join(tmp_dir, '.etl.lock')
+            holder = RunLock(lock_path)
+            self.assertTrue(holder.acquire())
+
+            calls = []
+            stats = run_scheduled(lambda: calls.append(1), interval=0.01, max_runs=2,
+                                  lock=RunLock(lock_path))
+            holder.release()
+
+        self.assertEqual(calls, [])
+        self.assertEqual(stats['skipped_overlap'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
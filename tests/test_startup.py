@@ -0,0 +1,156 @@
+import unittest
+import argparse
+import subprocess
+import sqlite3
+import tempfile
+import sys
+import os
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import main
+from utils.records import RawProduct, save_raw_products, load_raw_products
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+# Libraries only needed once a stage actually runs
+HEAVY_MODULES = ("pandas", "numpy", "bs4", "requests", "psycopg2")
+
+
+def import_profile(statement):
+    """Run statement in a fresh interpreter with -X importtime; return {module: cumulative_us}."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+    )
+    modules = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        modules[name.strip()] = int(cumulative)
+    return modules
+
+
+class TestStartupImports(unittest.TestCase):
+
+    def test_main_import_skips_heavy_libraries(self):
+        """Test importing main does not load pandas, numpy, bs4, requests or psycopg2."""
+        modules = import_profile("import main")
+
+        for heavy in HEAVY_MODULES:
+            self.assertNotIn(heavy, modules)
+
+    def test_main_import_cost_relative_to_pandas(self):
+        """Test importing main costs a small fraction of importing pandas, measured in the same interpreter."""
+        modules = import_profile("import main; import pandas")
+
+        # Relative rather than absolute, so a loaded machine slows both sides alike (~8% measured)
+        self.assertLess(modules["main"], modules["pandas"] / 4)
+
+    def test_extract_does_not_import_pandas(self):
+        """Test the extract stage can run without loading pandas."""
+        modules = import_profile("import utils.extract")
+
+        self.assertNotIn("pandas", modules)
+
+    def test_load_does_not_import_postgres_driver(self):
+        """Test psycopg2 is only imported when a PostgreSQL function is called."""
+        modules = import_profile("import utils.load")
+
+        self.assertNotIn("psycopg2", modules)
+
+
+class TestStages(unittest.TestCase):
+
+    def test_parse_stages_orders_and_validates(self):
+        """Test --stages values are returned in pipeline order and unknown stages are rejected."""
+        self.assertEqual(main.parse_stages("csv, extract,transform"), ("extract", "transform", "csv"))
+        with self.assertRaises(argparse.ArgumentTypeError):
+            main.parse_stages("extract,upload")
+        with self.assertRaises(argparse.ArgumentTypeError):
+            main.parse_stages("extract,csv")
+
+    def test_raw_products_round_trip(self):
+        """Test raw products written by an extract-only run are read back unchanged."""
+        records = [RawProduct("T-shirt 1", "$10.00", "Rating: ⭐ 4.5 / 5", "3 Colors", "Size: M", "Gender: Men")]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "raw.jsonl")
+            save_raw_products(records, path)
+
+            self.assertEqual(load_raw_products(path), records)
+
+    def test_extract_only_run_writes_raw_products(self):
+        """Test running only the extract stage saves raw products and skips transform and sinks."""
+        records = [RawProduct("T-shirt 1", "$10.00", "Rating: ⭐ 4.5 / 5", "3 Colors", "Size: M", "Gender: Men")]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "raw.jsonl")
+            with patch("utils.extract.scrape_product", return_value=records), \
+                    patch("utils.transform.transform_to_DataFrame") as transform:
+                main.run_etl(stages=("extract",), raw_path=path)
+
+            self.assertEqual(load_raw_products(path), records)
+            transform.assert_not_called()
+
+
+class TestPipelineDatabase(unittest.TestCase):
+
+    def test_pipeline_loads_into_database_url(self):
+        """Test --pipeline stores batches through the backend of --database-url, not the DB_* PostgreSQL."""
+        pages = [[RawProduct("T-shirt 1", "$10.00", "Rating: ⭐ 4.5 / 5", "3 Colors", "Size: M", "Gender: Men")],
+                 [RawProduct("Hoodie 2", "$20.00", "Rating: ⭐ 3.9 / 5", "2 Colors", "Size: L", "Gender: Women")]]
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            db_path = os.path.join(tmp_dir, "products.db")
+            with patch("utils.extract.iter_product_pages", return_value=iter(pages)), \
+                    patch("utils.load.store_to_postgre") as store_to_postgre, patch("builtins.print"):
+                main.run_etl_pipeline(sinks=["postgres"], monitor_interval=0, database_url=f"sqlite:///{db_path}",
+                                      postgres_workers=2)
+
+            store_to_postgre.assert_not_called()
+            with sqlite3.connect(db_path) as conn:
+                titles = sorted(row[0] for row in conn.execute("SELECT title FROM products"))
+            self.assertEqual(titles, ["Hoodie 2", "T-shirt 1"])
+
+    def test_pipeline_writes_google_sheet_once(self):
+        """Test --pipeline collects every batch and writes the sheet once at the end."""
+        pages = [[RawProduct("T-shirt 1", "$10.00", "Rating: ⭐ 4.5 / 5", "3 Colors", "Size: M", "Gender: Men")],
+                 [RawProduct("Hoodie 2", "$20.00", "Rating: ⭐ 3.9 / 5", "2 Colors", "Size: L", "Gender: Women")]]
+        with patch("utils.extract.iter_product_pages", return_value=iter(pages)), \
+                patch("utils.load.save_to_google_sheets", return_value=True) as save_to_google_sheets, \
+                patch("builtins.print"):
+            main.run_etl_pipeline(sinks=[], monitor_interval=0, google_sheet="sheet-id",
+                                  google_sheet_state="state.json")
+
+        save_to_google_sheets.assert_called_once()
+        df = save_to_google_sheets.call_args.args[0]
+        self.assertEqual(sorted(df["Title"]), ["Hoodie 2", "T-shirt 1"])
+        self.assertEqual(save_to_google_sheets.call_args.kwargs["state_path"], "state.json")
+
+class TestRunLock(unittest.TestCase):
+
+    def test_run_is_skipped_while_lock_is_held(self):
+        """Test a run started while the daemon holds the lock file does not load anything."""
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            lock_path = os.path.join(tmp_dir, "etl.lock")
+            holder = main.RunLock(lock_path)
+            self.assertTrue(holder.acquire())
+            try:
+                with patch("main.run_from_args") as run, patch("builtins.print"):
+                    main.main(["run", "--lock-file", lock_path])
+                run.assert_not_called()
+            finally:
+                holder.release()
+
+            with patch("main.run_from_args") as run:
+                main.main(["run", "--lock-file", lock_path])
+            run.assert_called_once()
+
+    def test_summary_tables_rejected_for_other_databases(self):
+        """Test --summary-tables with a non-PostgreSQL --database-url is an argument error."""
+        with patch("main.run_from_args") as run, patch("sys.stderr"), self.assertRaises(SystemExit):
+            main.main(["run", "--summary-tables", "--database-url", "sqlite:///products.db"])
+        run.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
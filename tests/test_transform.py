@@ -3,11 +3,14 @@ import sys
 import os
 import pandas as pd
 import numpy as np
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 
 # Add parent directory to path so we can import the transform module
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.transform import transform_data, transform_to_DataFrame, clean_existing_dataframe, DIRTY_PATTERNS
+from utils.transform import transform_data, transform_to_DataFrame, clean_existing_dataframe, ProductFrameBuilder, optimize_dtypes, memory_footprint, DIRTY_PATTERNS, parse_price, parse_rating, parse_colors
+from utils.exchange import ExchangeRate
+from utils.memo import StringInterner, cache_stats, clear_caches, format_cache_stats
 
 class TestTransform(unittest.TestCase):
 
@@ -145,6 +148,48 @@ class TestTransform(unittest.TestCase):
         self.assertIn(1000, cleaned_df["Price"].values)
         self.assertIn(5000, cleaned_df["Price"].values)
 
+    def test_clean_existing_dataframe_inplace(self):
+        """Test in-place cleaning modifies and returns the same DataFrame"""
+        df = pd.DataFrame({
+            "Title": ["Product A", "", None, "Product D"],
+            "Price": [1000, 2000, 3000, np.nan],
+            "Rating": [4.5, 3.8, 4.0, 3.9]
+        }, index=[10, 20, 30, 40])
+        
+        result = clean_existing_dataframe(df, inplace=True)
+        
+        self.assertIs(result, df)
+        self.assertEqual(df["Title"].tolist(), ["Product A", "Unknown Product"])
+        self.assertEqual(df["Price"].tolist(), [1000, 3000])
+        self.assertEqual(df.index.tolist(), [0, 1])
+
+    def test_clean_existing_dataframe_keeps_input(self):
+        """Test the default mode leaves the input DataFrame untouched"""
+        df = pd.DataFrame({
+            "Title": pd.Categorical(["Product A", None, ""]),
+            "Price": [1000.0, 2000.0, 3000.0]
+        })
+        original = df.copy()
+        
+        cleaned_df = clean_existing_dataframe(df)
+        
+        pd.testing.assert_frame_equal(df, original)
+        self.assertEqual(cleaned_df["Title"].tolist(), ["Product A", "Unknown Product"])
+        self.assertEqual(cleaned_df.index.tolist(), [0, 1])
+
+    def test_clean_existing_dataframe_string_dtype(self):
+        """Test nullable string columns with missing values are cleaned like object columns"""
+        df = pd.DataFrame({
+            "Title": pd.array(["Product A", None, "", "Product D"], dtype="string"),
+            "Price": pd.array(["1000", "2000", "3000", None], dtype="string")
+        })
+        df.loc[2, "Price"] = "NaN"
+        
+        cleaned_df = clean_existing_dataframe(df)
+        
+        self.assertEqual(cleaned_df["Title"].tolist(), ["Product A", "Unknown Product"])
+        self.assertEqual(cleaned_df["Price"].tolist(), ["1000", "2000"])
+
     def test_edge_cases(self):
         """Test edge cases like empty lists and unusual values"""
         # Test with empty list
@@ -180,5 +225,141 @@ class TestTransform(unittest.TestCase):
         self.assertEqual(transformed[0]["Price"], 1234.56 * 16000)
         self.assertEqual(transformed[1]["Price"], 99.99 * 16000)
 
+    def test_transform_to_DataFrame_dtypes(self):
+        """Test the DataFrame is built with typed columns instead of object columns"""
+        df = transform_to_DataFrame(self.sample_data)
+        
+        self.assertEqual(df["Price"].dtype, np.float64)
+        self.assertEqual(df["Rating"].dtype, np.float64)
+        self.assertEqual(str(df["Colors"].dtype), "Int64")
+        self.assertIsInstance(df["Size"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df["Gender"].dtype, pd.CategoricalDtype)
+        
+        # Missing rating becomes NaN, not a string
+        jacket = df[df["Title"] == "Jacket"].iloc[0]
+        self.assertTrue(np.isnan(jacket["Rating"]))
+
+    def test_product_frame_builder(self):
+        """Test the builder wraps its numeric buffers without copying them"""
+        builder = ProductFrameBuilder()
+        builder.append("A", 16000.0, None, None, "M", "Men")
+        builder.append("B", 32000.0, 4.5, 3, None, "Women")
+        
+        df = builder.build()
+        
+        self.assertEqual(len(builder), 2)
+        self.assertEqual(df["Price"].tolist(), [16000.0, 32000.0])
+        self.assertTrue(df["Colors"].isna().iloc[0])
+        self.assertEqual(df["Colors"].iloc[1], 3)
+        self.assertTrue(pd.isna(df["Size"].iloc[1]))
+        self.assertTrue(np.shares_memory(df["Price"].to_numpy(), np.frombuffer(builder._prices)))
+        
+        # Empty builder still produces the expected columns
+        self.assertEqual(list(ProductFrameBuilder().build().columns),
+                         ["Title", "Price", "Rating", "Colors", "Size", "Gender"])
+
+    def test_transform_to_DataFrame_applies_rate(self):
+        """Test the batch rate is multiplied into Price and recorded on every row"""
+        timestamp = datetime(2026, 10, 19, 8, 0, tzinfo=timezone.utc)
+        rate = ExchangeRate(16250.0, timestamp, "static")
+        
+        df = transform_to_DataFrame(self.sample_data, rate=rate)
+        records = transform_data(self.sample_data, rate=rate)
+        
+        self.assertEqual(df["Price"].tolist(), [25.99 * 16250, 49.99 * 16250, 42.75 * 16250])
+        self.assertEqual([record["Price"] for record in records], df["Price"].tolist())
+        self.assertTrue((df["Exchange_Rate"] == 16250.0).all())
+        self.assertEqual(df["Rate_Timestamp"].unique().tolist(), ["2026-10-19T08:00:00+00:00"])
+        self.assertEqual(list(transform_to_DataFrame([], rate=rate).columns)[-2:], ["Exchange_Rate", "Rate_Timestamp"])
+    
+    def test_product_frame_builder_build_twice_with_rate(self):
+        """Test converting prices leaves the buffer and earlier frames untouched"""
+        rate = ExchangeRate(16000.0, datetime(2026, 10, 19, tzinfo=timezone.utc), "static")
+        builder = ProductFrameBuilder()
+        builder.append("A", 10.0, 4.5, 3, "M", "Men")
+        
+        first = builder.build(rate)
+        second = builder.build(rate)
+        
+        self.assertEqual(first["Price"].tolist(), [160000.0])
+        self.assertEqual(second["Price"].tolist(), [160000.0])
+        self.assertEqual(builder.build()["Price"].tolist(), [10.0])
+    
+    def test_optimize_dtypes(self):
+        """Test low-cardinality columns become categories and numerics are downcast"""
+        df = pd.DataFrame({
+            "Title": ["T-shirt 1", "T-shirt 2", "T-shirt 3", "T-shirt 4"],
+            "Price": [1600000.0, 3200000.0, 800000.0, 1600000.0],
+            "Rating": [4.8, 3.9, np.nan, 4.1],
+            "Colors": [3, 5, 2, 3],
+            "Size": ["M", "L", "M", "M"],
+            "Gender": ["Men", "Men", "Women", None]
+        })
+        
+        optimized = optimize_dtypes(df)
+        
+        self.assertEqual(str(optimized["Title"].dtype), "string")
+        self.assertIsInstance(optimized["Size"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(optimized["Gender"].dtype, pd.CategoricalDtype)
+        self.assertEqual(str(optimized["Colors"].dtype), "Int8")
+        # Whole-number prices fit float32 exactly, ratings like 4.8 do not
+        self.assertEqual(optimized["Price"].dtype, np.float32)
+        self.assertEqual(optimized["Rating"].dtype, np.float64)
+        
+        # Values are unchanged and the footprint shrinks
+        pd.testing.assert_frame_equal(optimized.astype(object).where(optimized.notna(), None),
+                                      df.astype(object).where(df.notna(), None), check_dtype=False)
+        self.assertLess(memory_footprint(optimized), memory_footprint(df))
+
+class TestMemoizedParsers(unittest.TestCase):
+
+    def setUp(self):
+        clear_caches()
+
+    def test_parsers(self):
+        self.assertEqual(parse_price("$1,234.56"), 1234.56)
+        self.assertIsNone(parse_price("Price Unavailable"))
+        self.assertIsNone(parse_price("100"))
+        self.assertIsNone(parse_price(None))
+        self.assertEqual(parse_rating("⭐ 4.8 / 5"), 4.8)
+        self.assertIsNone(parse_rating("Invalid Rating / 5"))
+        self.assertEqual(parse_colors("3 Colors"), 3)
+        self.assertIsNone(parse_colors("Colors"))
+
+    def test_repeated_values_hit_the_cache(self):
+        """Test parsing cost follows distinct values: 1000 rows with 2 prices are parsed twice."""
+        data = [{"Title": f"P{i}", "Price": "$10.00" if i % 2 else "$20.00", "Rating": "4.5 / 5",
+                 "Colors": "3 Colors", "Size": "M", "Gender": "Men"} for i in range(1000)]
+
+        transformed = transform_data(data)
+        stats = cache_stats()
+
+        self.assertEqual(len(transformed), 1000)
+        self.assertEqual(stats["parse_price"]["misses"], 2)
+        self.assertEqual(stats["parse_price"]["hits"], 998)
+        self.assertEqual(stats["parse_rating"]["misses"], 1)
+        self.assertAlmostEqual(stats["parse_colors"]["hit_rate"], 0.999)
+        self.assertTrue(any(line.startswith("parse_price: 99.8% hits (998/1000)") for line in format_cache_stats()))
+
+    def test_size_and_gender_are_interned(self):
+        data = [{"Title": f"P{i}", "Price": "$10.00", "Size": "".join(["X", "L"]), "Gender": "Men"}
+                for i in range(3)]
+
+        transformed = transform_data(data)
+
+        self.assertIs(transformed[0]["Size"], transformed[2]["Size"])
+        self.assertEqual(cache_stats()["transform_size"]["hits"], 2)
+
+    def test_interner_is_bounded(self):
+        intern = StringInterner("test_bounded", maxsize=2)
+        first = intern("".join(["a", "b"]))
+
+        for value in ("cd", "ef", "gh"):
+            intern(value)
+        self.assertIs(intern("".join(["a", "b"])), first)
+        self.assertEqual(intern.cache_info().currsize, 2)
+        self.assertIsNone(intern(None))
+        self.assertEqual(intern.cache_info().hits, 1)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
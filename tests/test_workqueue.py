@@ -0,0 +1,148 @@
+import unittest
+from unittest.mock import patch
+import tempfile
+import threading
+import time
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from utils.catalog_server import CatalogServer
+from utils.workqueue import CrawlQueue, run_worker, wait_for_crawl, merge_results
+
+
+class WorkQueueTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.queue_url = f"sqlite:///{os.path.join(self.tmp_dir.name, 'queue.db')}"
+        self.results_dir = os.path.join(self.tmp_dir.name, 'results')
+
+    def seed(self, pages):
+        with CrawlQueue(self.queue_url) as queue:
+            queue.enqueue(range(1, pages + 1))
+
+    def counts(self):
+        with CrawlQueue(self.queue_url) as queue:
+            return queue.counts()
+
+    def work(self, server, **kwargs):
+        return run_worker(self.queue_url, self.results_dir, server.base_url, server.first_page_url,
+                          poll_interval=0.01, **kwargs)
+
+
+class TestCrawlQueue(WorkQueueTestCase):
+
+    def test_claim_leases_lowest_page_once(self):
+        """Test pages are leased in order and a leased page is not handed out twice."""
+        self.seed(2)
+        with CrawlQueue(self.queue_url) as queue:
+            self.assertEqual(queue.claim('a'), (1, 1))
+            self.assertEqual(queue.claim('b'), (2, 1))
+            self.assertIsNone(queue.claim('c'))
+
+    def test_expired_lease_is_released(self):
+        """Test a page held by a dead worker is re-leased and the dead worker's late result is rejected."""
+        self.seed(1)
+        with CrawlQueue(self.queue_url) as queue:
+            queue.claim('dead', lease_seconds=0.05)
+            self.assertIsNone(queue.claim('alive'))
+
+            time.sleep(0.1)
+            self.assertEqual(queue.requeue_expired(), [(1, 'dead')])
+            self.assertEqual(queue.claim('alive'), (1, 2))
+
+            self.assertFalse(queue.complete(1, 'dead', 2, 'late.jsonl'))
+            self.assertTrue(queue.complete(1, 'alive', 2, 'page.jsonl'))
+            self.assertEqual(queue.done_pages(), [(1, 'page.jsonl')])
+
+    def test_failed_page_is_retried_until_out_of_attempts(self):
+        """Test a failing page goes back to pending, then to failed after max_attempts."""
+        self.seed(1)
+        with CrawlQueue(self.queue_url) as queue:
+            page, attempts = queue.claim('w')
+            queue.fail(page, 'w', 'HTTP 500', attempts, max_attempts=2)
+            self.assertEqual(queue.counts()['pending'], 1)
+
+            page, attempts = queue.claim('w')
+            queue.fail(page, 'w', 'HTTP 500', attempts, max_attempts=2)
+            self.assertEqual(queue.counts()['failed'], 1)
+
+    def test_reset_starts_job_again(self):
+        """Test re-seeding after reset crawls finished pages again and leaves other jobs alone."""
+        self.seed(2)
+        with CrawlQueue(self.queue_url) as queue, CrawlQueue(self.queue_url, 'other') as other:
+            other.enqueue([1])
+            page, _ = queue.claim('w')
+            queue.complete(page, 'w', 2, 'page.jsonl')
+
+            queue.reset()
+            queue.enqueue([1, 2])
+
+            self.assertEqual(queue.counts()['pending'], 2)
+            self.assertEqual(queue.done_pages(), [])
+            self.assertEqual(other.counts()['pending'], 1)
+
+    def test_rejects_unknown_url(self):
+        """Test only SQLite and PostgreSQL queue URLs are accepted."""
+        with self.assertRaises(ValueError):
+            CrawlQueue('mysql://localhost/crawl')
+
+
+class TestCrawlWorkers(WorkQueueTestCase):
+
+    def test_workers_split_catalog_and_merge_in_page_order(self):
+        """Test concurrent workers crawl every page once and the merge keeps page order."""
+        self.seed(4)
+        with CatalogServer(pages=8, products_per_page=3) as server, patch('builtins.print'):
+            threads = [threading.Thread(target=self.work, args=(server,)) for _ in range(3)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        # Pages 5-8 were not seeded; they are discovered through the next buttons
+        self.assertEqual(self.counts()['done'], 8)
+        self.assertEqual(server.stats['pages_served'], 8)
+        products = merge_results(self.queue_url)
+        self.assertEqual(len(products), 24)
+        self.assertEqual([p['Title'] for p in products[:4]],
+                         ['Product 1-0', 'Product 1-1', 'Product 1-2', 'Product 2-0'])
+
+    def test_pages_past_the_end_are_missing(self):
+        """Test over-seeded pages answering 404 are marked missing, not failed."""
+        self.seed(5)
+        with CatalogServer(pages=3, products_per_page=2) as server:
+            stats = self.work(server)
+
+        self.assertEqual(stats['pages'], 3)
+        self.assertEqual(stats['missing'], 2)
+        self.assertEqual(self.counts()['failed'], 0)
+
+    def test_server_errors_fail_pages(self):
+        """Test pages that keep failing end up failed after the retry budget."""
+        self.seed(2)
+        with CatalogServer(pages=2, error_rate=1.0) as server, patch('builtins.print'):
+            stats = self.work(server, max_attempts=2)
+
+        self.assertEqual(stats['errors'], 4)
+        self.assertEqual(self.counts()['failed'], 2)
+
+    def test_coordinator_requeues_dead_worker_pages(self):
+        """Test the coordinator hands a dead worker's page to a live worker and finishes the crawl."""
+        self.seed(2)
+        with CrawlQueue(self.queue_url) as queue:
+            queue.claim('dead-worker', lease_seconds=0.05)
+
+        with CatalogServer(pages=2, products_per_page=2) as server, patch('builtins.print'):
+            time.sleep(0.1)
+            counts = wait_for_crawl(self.queue_url, poll_interval=0.01, timeout=0.05)
+            self.assertEqual(counts['pending'], 2)
+            self.work(server)
+
+        self.assertEqual(len(merge_results(self.queue_url)), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
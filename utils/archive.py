@@ -0,0 +1,313 @@
+import os
+import mmap
+import json
+import zlib
+import struct
+import hashlib
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import UnicodeDammit
+
+from utils.extract import parse_page
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, zlib from the standard library is the fallback
+    zstandard = None
+
+INDEX_FILE = "index.jsonl"
+OBJECTS_DIR = "objects"
+DEFAULT_CODEC = "zstd" if zstandard is not None else "zlib"
+
+# Packed store layout: MAGIC | bodies... | JSON index | index offset (uint64 LE) | MAGIC
+PACK_MAGIC = b"ETLPACK1"
+PACK_TRAILER = struct.Struct("<Q8s")
+
+
+def _compress(body, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(body)
+    if codec == "zlib":
+        return zlib.compress(body, 6)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+def _decompress(blob, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise ImportError("The zstandard package is required to read zstd-compressed archives")
+        return zstandard.ZstdDecompressor().decompress(blob)
+    if codec == "zlib":
+        return zlib.decompress(blob)
+    raise ValueError(f"Unknown archive codec: {codec}")
+
+
+class PageArchive:
+    """
+    Content-addressed archive of fetched catalog pages.
+
+    Each HTML body is compressed and stored once under objects/<xx>/<sha256>,
+    so re-crawling unchanged pages costs no extra space. index.jsonl records
+    one line per fetch (page number, URL, digest, codec, fetch time); the
+    latest line for a page number wins on replay.
+    """
+
+    def __init__(self, root, codec=DEFAULT_CODEC):
+        self.root = root
+        self.codec = codec
+        self.index_path = os.path.join(root, INDEX_FILE)
+        os.makedirs(os.path.join(root, OBJECTS_DIR), exist_ok=True)
+
+    def _object_path(self, digest, codec):
+        return os.path.join(self.root, OBJECTS_DIR, digest[:2], f"{digest}.{codec}")
+
+    def store(self, url, page_number, content):
+        """
+        Store the raw body of a fetched page.
+
+        Args:
+            url: URL the page was fetched from
+            page_number: Catalog page number
+            content: HTML body (bytes or str)
+
+        Returns:
+            Hex SHA-256 digest of the body
+        """
+        body = content.encode("utf-8") if isinstance(content, str) else bytes(content)
+        digest = hashlib.sha256(body).hexdigest()
+
+        object_path = self._object_path(digest, self.codec)
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = f"{object_path}.tmp"
+            with open(tmp_path, "wb") as file:
+                file.write(_compress(body, self.codec))
+            os.replace(tmp_path, object_path)
+
+        entry = {
+            "page": page_number,
+            "url": url,
+            "sha256": digest,
+            "codec": self.codec,
+            "size": len(body),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with open(self.index_path, "a") as index_file:
+            index_file.write(json.dumps(entry) + "\n")
+
+        return digest
+
+    def entries(self):
+        """
+        List the archived pages.
+
+        Returns:
+            List of index entries (dictionaries), latest fetch per page, sorted by page number
+        """
+        if not os.path.exists(self.index_path):
+            return []
+
+        latest = {}
+        with open(self.index_path) as index_file:
+            for line in index_file:
+                if line.strip():
+                    entry = json.loads(line)
+                    latest[entry["page"]] = entry
+        return [latest[page] for page in sorted(latest)]
+
+    def load(self, entry):
+        """Return the decompressed HTML body of an index entry."""
+        with open(self._object_path(entry["sha256"], entry["codec"]), "rb") as file:
+            return _decompress(file.read(), entry["codec"])
+
+
+def _extract_archived_page(task):
+    """Process pool worker: decompress one archived page and extract its products."""
+    root, entry = task
+    products, _ = parse_page(PageArchive(root, entry["codec"]).load(entry))
+    return products or []
+
+
+def replay_archive(root, workers=None):
+    """
+    Run the extractor over an archived crawl instead of the network.
+
+    Pages are decompressed and parsed in a process pool, so re-extraction is
+    CPU-bound and uses every core. Products are returned in page order, the
+    same order scrape_product produces.
+
+    Args:
+        root: Archive directory written by PageArchive
+        workers: Number of worker processes (default: os.cpu_count())
+
+    Returns:
+        List of RawProduct records
+    """
+    entries = PageArchive(root).entries()
+    if not entries:
+        return []
+
+    data = []
+    tasks = [(root, entry) for entry in entries]
+    chunksize = max(1, len(tasks) // ((workers or os.cpu_count() or 1) * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for products in pool.map(_extract_archived_page, tasks, chunksize=chunksize):
+            data.extend(products)
+
+    return data
+
+
+def _utf8_body(body):
+    """Re-encode an HTML body as UTF-8, detecting its charset (BOM, <meta charset>) like BeautifulSoup."""
+    dammit = UnicodeDammit(body, is_html=True)
+    if dammit.unicode_markup is None or dammit.original_encoding in ("utf-8", "ascii"):
+        return body
+    return dammit.unicode_markup.encode("utf-8")
+
+
+def pack_archive(root, pack_path):
+    """
+    Pack the latest fetch of every archived page into a single file.
+
+    Bodies are stored uncompressed and back to back, followed by a JSON index
+    of (page, url, offset, length), so PackedPageStore can hand out slices of
+    one memory map instead of opening, reading and decompressing a file per
+    page. Bodies are re-encoded as UTF-8 on the way in (pages may declare
+    another charset in a <meta> tag), since replay decodes the slices as UTF-8.
+
+    Args:
+        root: Archive directory written by PageArchive
+        pack_path: Path of the packed file to write
+
+    Returns:
+        Number of pages packed
+    """
+    archive = PageArchive(root)
+    index = []
+
+    tmp_path = f"{pack_path}.tmp"
+    with open(tmp_path, "wb") as pack_file:
+        pack_file.write(PACK_MAGIC)
+        for entry in archive.entries():
+            body = _utf8_body(archive.load(entry))
+            index.append({
+                "page": entry["page"],
+                "url": entry["url"],
+                "offset": pack_file.tell(),
+                "length": len(body),
+            })
+            pack_file.write(body)
+
+        index_offset = pack_file.tell()
+        pack_file.write(json.dumps(index).encode("utf-8"))
+        pack_file.write(PACK_TRAILER.pack(index_offset, PACK_MAGIC))
+    os.replace(tmp_path, pack_path)
+
+    return len(index)
+
+
+class PackedPageStore:
+    """
+    Read-only, memory-mapped view of a file written by pack_archive.
+
+    page() returns memoryview slices of the map: no read() syscall and no
+    bytes copy per page, the OS pages the bodies in on demand.
+    """
+
+    def __init__(self, pack_path):
+        self.pack_path = pack_path
+        self._file = open(pack_path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{pack_path} is empty, not a packed page store") from None
+        self._view = memoryview(self._map)
+
+        if len(self._map) < len(PACK_MAGIC) + PACK_TRAILER.size or self._map[:len(PACK_MAGIC)] != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"{pack_path} is not a packed page store")
+        index_offset, magic = PACK_TRAILER.unpack_from(self._map, len(self._map) - PACK_TRAILER.size)
+        if magic != PACK_MAGIC:
+            self.close()
+            raise ValueError(f"{pack_path} is truncated")
+        index_end = len(self._map) - PACK_TRAILER.size
+        self.entries = json.loads(str(self._view[index_offset:index_end], "utf-8"))
+
+    def __len__(self):
+        return len(self.entries)
+
+    def page(self, position):
+        """Return the body of the position-th packed page as a zero-copy memoryview."""
+        entry = self.entries[position]
+        return self._view[entry["offset"]:entry["offset"] + entry["length"]]
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# Store opened once per worker process by _init_pack_worker
+_worker_store = None
+
+
+def _init_pack_worker(pack_path):
+    global _worker_store
+    _worker_store = PackedPageStore(pack_path)
+
+
+def _extract_packed_pages(positions):
+    """Process pool worker: extract the products of a range of packed pages."""
+    data = []
+    for position in positions:
+        page = _worker_store.page(position)
+        products, _ = parse_page(page)
+        page.release()
+        data.extend(products or [])
+    return data
+
+
+def replay_pack(pack_path, workers=None):
+    """
+    Run the extractor over a packed page store.
+
+    Every worker process maps the pack once and parses its share of the pages
+    straight from the map. Products are returned in page order.
+
+    Args:
+        pack_path: File written by pack_archive
+        workers: Number of worker processes (default: os.cpu_count(); 1 runs in-process)
+
+    Returns:
+        List of RawProduct records
+    """
+    with PackedPageStore(pack_path) as store:
+        page_count = len(store)
+    if not page_count:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_pack_worker(pack_path)
+        try:
+            return _extract_packed_pages(range(page_count))
+        finally:
+            _worker_store.close()
+
+    # Contiguous ranges keep each worker reading neighbouring parts of the map
+    batch_size = max(1, page_count // (workers * 4))
+    batches = [range(start, min(start + batch_size, page_count)) for start in range(0, page_count, batch_size)]
+
+    data = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_pack_worker, initargs=(pack_path,)) as pool:
+        for products in pool.map(_extract_packed_pages, batches):
+            data.extend(products)
+    return data
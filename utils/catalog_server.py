@@ -0,0 +1,194 @@
+import time
+import random
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+DETAIL_STYLE = "font-size: 14px; color: #777;"
+SIZES = ("S", "M", "L", "XL", "XXL")
+GENDERS = ("Men", "Women", "Unisex")
+
+
+def render_catalog_page(page_number, products_per_page=20, has_next=True, dirty_rate=0.0, seed=0):
+    """
+    Render one catalog page with the structure of fashion-studio.dicoding.dev
+    (div.product-details cards, li.next pagination).
+
+    Content is a pure function of (seed, page_number), so every fetch of a
+    page returns the same bytes.
+
+    Args:
+        page_number: Catalog page number
+        products_per_page: Number of product cards
+        has_next: Render the li.next button
+        dirty_rate: Fraction of cards rendered as the site's placeholder product
+        seed: Seed of the generated values
+
+    Returns:
+        HTML body as bytes
+    """
+    rng = random.Random(f"{seed}:{page_number}")
+    cards = []
+    for index in range(products_per_page):
+        if rng.random() < dirty_rate:
+            cards.append(
+                '<div class="product-details">'
+                '<h3 class="product-title">Unknown Product</h3>'
+                '<p class="price">Price Unavailable</p>'
+                f'<p style="{DETAIL_STYLE}">Rating: ⭐ Invalid Rating / 5</p>'
+                f'<p style="{DETAIL_STYLE}">5 Colors</p>'
+                f'<p style="{DETAIL_STYLE}">Size: M</p>'
+                f'<p style="{DETAIL_STYLE}">Gender: Men</p>'
+                '</div>'
+            )
+            continue
+        cards.append(
+            '<div class="product-details">'
+            f'<h3 class="product-title">Product {page_number}-{index}</h3>'
+            f'<div class="price-container"><span class="price">${rng.uniform(5, 500):.2f}</span></div>'
+            f'<p style="{DETAIL_STYLE}">Rating: ⭐ {rng.uniform(1, 5):.1f} / 5</p>'
+            f'<p style="{DETAIL_STYLE}">{rng.randint(1, 8)} Colors</p>'
+            f'<p style="{DETAIL_STYLE}">Size: {rng.choice(SIZES)}</p>'
+            f'<p style="{DETAIL_STYLE}">Gender: {rng.choice(GENDERS)}</p>'
+            '</div>'
+        )
+
+    pagination = '<ul class="pagination"><li class="next"><a href="#">Next</a></li></ul>' if has_next else ''
+    return (
+        '<html><head><title>Fashion Studio</title></head><body>'
+        f'<div class="collection-grid">{"".join(cards)}</div>{pagination}'
+        '</body></html>'
+    ).encode("utf-8")
+
+
+class _CatalogHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keep-alive, so clients reusing a requests.Session reuse the connection
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY a kept-alive
+    # connection stalls on Nagle + delayed ACK (~40ms per response)
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.catalog._count("connections")
+
+    def do_GET(self):
+        catalog = self.server.catalog
+        status, body = catalog.respond(self.path)
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class CatalogServer:
+    """
+    Local synthetic fashion-studio catalog for crawl load tests.
+
+    Serves "/" (page 1) and "/page<n>" for `pages` pages over real HTTP on
+    127.0.0.1, with injectable latency, random 500 errors and optionally a
+    next link on the last page that leads to a 404. Use it as a context manager; base_url and
+    first_page_url plug straight into scrape_product.
+
+    Args:
+        pages: Number of catalog pages with products
+        products_per_page: Product cards per page
+        latency: Seconds added to every response
+        jitter: Extra random latency, uniform in [0, jitter] seconds
+        error_rate: Probability that a request answers 500
+        link_past_end: Render li.next on the last page too, so a crawler
+            follows it to a page that answers 404 (like a stale pagination link)
+        dirty_rate: Fraction of placeholder ("Unknown Product") cards
+        seed: Seed of the generated content and of the error injection
+    """
+
+    def __init__(self, pages=50, products_per_page=20, latency=0.0, jitter=0.0, error_rate=0.0, link_past_end=False,
+                 dirty_rate=0.0, seed=0, host="127.0.0.1", port=0):
+        self.pages = pages
+        self.products_per_page = products_per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.link_past_end = link_past_end
+        self.dirty_rate = dirty_rate
+        self.seed = seed
+        self.host = host
+        self.port = port
+
+        self.stats = {"connections": 0, "requests": 0, "pages_served": 0, "errors": 0, "not_found": 0}
+        self._lock = threading.Lock()
+        self._rng = random.Random(seed)
+        self._server = None
+        self._thread = None
+
+    @property
+    def expected_products(self):
+        return self.pages * self.products_per_page
+
+    @property
+    def first_page_url(self):
+        return f"http://{self.host}:{self.port}/"
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}/page{{}}"
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def page_number(self, path):
+        """Map a request path to a page number (None for unknown paths)."""
+        path = path.split("?", 1)[0]
+        if path in ("/", ""):
+            return 1
+        if path.startswith("/page") and path[5:].isdigit():
+            return int(path[5:])
+        return None
+
+    def respond(self, path):
+        """Return (status, body) for a request path, applying latency and error injection."""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            fail = self.error_rate and self._rng.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+
+        if fail:
+            self._count("errors")
+            return 500, b"<html><body><h1>Internal Server Error</h1></body></html>"
+
+        page_number = self.page_number(path)
+        if page_number is None or not 1 <= page_number <= self.pages:
+            self._count("not_found")
+            return 404, b"<html><body><h1>Page not found</h1></body></html>"
+
+        self._count("pages_served")
+        has_next = page_number < self.pages or self.link_past_end
+        return 200, render_catalog_page(page_number, self.products_per_page, has_next, self.dirty_rate, self.seed)
+
+    def start(self):
+        self._server = ThreadingHTTPServer((self.host, self.port), _CatalogHandler)
+        self._server.daemon_threads = True
+        self._server.catalog = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="catalog-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._thread.join()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
@@ -0,0 +1,296 @@
+import os
+import json
+from datetime import date, datetime, timezone
+from urllib.parse import quote
+
+import pandas as pd
+
+from utils.load import _replace_missing
+
+MANIFEST_NAME = "_manifest.json"
+# Directory value used for missing partition values (same spelling as Hive)
+NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+FILE_FORMATS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+DEFAULT_PARTITION_BY = ("Gender",)
+
+
+def _partition_value(value):
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return NULL_PARTITION
+    return quote(str(value), safe="")
+
+
+def load_manifest(root):
+    """Return the manifest of a partitioned dataset, or None if root has none."""
+    path = os.path.join(root, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as file:
+        return json.load(file)
+
+
+def _save_manifest(root, manifest):
+    # Written last and atomically: readers only ever see complete part files
+    path = os.path.join(root, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        json.dump(manifest, file, indent=1)
+    os.replace(tmp_path, path)
+
+
+def _write_part(df, path, file_format):
+    if file_format == "csv":
+        df.to_csv(path, index=False)
+    elif file_format == "jsonl":
+        with open(path, "w", encoding="utf-8") as file:
+            for record in _replace_missing(df).to_dict(orient="records"):
+                file.write(json.dumps(record))
+                file.write("\n")
+    else:
+        df.to_parquet(path, index=False)
+
+
+def _read_part(path, file_format, columns):
+    if file_format == "csv":
+        return pd.read_csv(path, usecols=columns)
+    if file_format == "jsonl":
+        return pd.read_json(path, lines=True, dtype=False)[columns]
+    return pd.read_parquet(path, columns=columns)
+
+
+def write_partitioned(df, root, partition_by=DEFAULT_PARTITION_BY, file_format="csv", run_date=None):
+    """
+    Write a DataFrame as a Hive-style partitioned dataset with a manifest.
+
+    Rows land in root/run_date=<date>/<column>=<value>/part-<n>.<ext>, one
+    file per partition per call, with the partition columns left out of the
+    files (they are encoded in the path). Every call adds new part files, so
+    repeated runs on the same day and pipeline batches never overwrite
+    earlier data. The manifest (root/_manifest.json) lists every part file
+    with its partition values and row count; it is replaced atomically after
+    the files are written, so readers never see partial output. A dataset
+    has a single writer at a time.
+
+    Args:
+        df: pandas DataFrame to write
+        root: Dataset root directory
+        partition_by: Columns partitioned on below run_date (directory keys are lowercased)
+        file_format: "csv", "jsonl" or "parquet" (parquet needs pyarrow)
+        run_date: Value of the run_date partition (default: today)
+
+    Returns:
+        Boolean indicating success or failure
+    """
+    try:
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Unsupported format {file_format!r} (use {', '.join(FILE_FORMATS)})")
+        run_date = str(run_date or date.today().isoformat())
+        keys = ["run_date"] + [column.lower() for column in partition_by]
+
+        manifest = load_manifest(root) or {
+            "format": file_format,
+            "partition_keys": keys,
+            "partition_columns": dict(zip(keys[1:], partition_by)),
+            "columns": [],
+            "files": [],
+        }
+        if manifest["format"] != file_format or manifest["partition_keys"] != keys:
+            raise ValueError(f"{root} holds {manifest['format']} files partitioned by "
+                             f"{'/'.join(manifest['partition_keys'])}")
+        data_columns = [column for column in df.columns if column not in partition_by]
+        # Columns added in later runs (e.g. Exchange_Rate) are appended; older files read them as missing
+        manifest["columns"] += [column for column in data_columns if column not in manifest["columns"]]
+
+        parts_per_dir = {}
+        for entry in manifest["files"]:
+            directory = os.path.dirname(entry["path"])
+            parts_per_dir[directory] = parts_per_dir.get(directory, 0) + 1
+
+        written = []
+        groups = df.groupby(list(partition_by), dropna=False, observed=True, sort=True) if partition_by else [((), df)]
+        for values, group in groups:
+            values = values if isinstance(values, tuple) else (values,)
+            partition = {"run_date": run_date}
+            partition.update({key: None if _partition_value(value) == NULL_PARTITION else str(value)
+                              for key, value in zip(keys[1:], values)})
+            directory = "/".join(f"{key}={_partition_value(value)}" for key, value in partition.items())
+            os.makedirs(os.path.join(root, directory), exist_ok=True)
+
+            # Skip numbers of files left behind by an interrupted write (not in the manifest)
+            part = parts_per_dir.get(directory, 0)
+            while True:
+                relative_path = f"{directory}/part-{part:05d}{FILE_FORMATS[file_format]}"
+                if not os.path.exists(os.path.join(root, relative_path)):
+                    break
+                part += 1
+            parts_per_dir[directory] = part + 1
+
+            path = os.path.join(root, relative_path)
+            _write_part(group.drop(columns=list(partition_by)), f"{path}.tmp", file_format)
+            os.replace(f"{path}.tmp", path)
+            written.append({"path": relative_path, "partition": partition, "rows": len(group),
+                            "columns": data_columns})
+
+        manifest["files"].extend(written)
+        manifest["updated_at"] = datetime.now(timezone.utc).isoformat()
+        _save_manifest(root, manifest)
+
+        print(f"Data successfully saved to {len(written)} partition files under {root}")
+        return True
+    except Exception as e:
+        print(f"Error saving partitioned data: {e}")
+        return False
+
+
+class PartitionedWriter:
+    """
+    Buffer batches and write them to a partitioned dataset in few large files.
+
+    write_partitioned creates one file per partition and rewrites the
+    manifest on every call, so calling it per page batch leaves many tiny
+    part files. The writer collects batches and flushes them with a single
+    write_partitioned call once max_rows rows are buffered and at close().
+
+    Args:
+        root: Dataset root directory
+        partition_by: Columns partitioned on below run_date
+        file_format: "csv", "jsonl" or "parquet"
+        run_date: Value of the run_date partition (default: today, fixed at creation)
+        max_rows: Buffered rows that trigger a flush
+    """
+
+    def __init__(self, root, partition_by=DEFAULT_PARTITION_BY, file_format="csv", run_date=None, max_rows=100_000):
+        self.root = root
+        self.partition_by = partition_by
+        self.file_format = file_format
+        # Fixed up front, so a run that passes midnight stays in one partition
+        self.run_date = str(run_date or date.today().isoformat())
+        self.max_rows = max_rows
+        self._frames = []
+        self._rows = 0
+
+    def write(self, df):
+        """
+        Buffer a batch, flushing when max_rows rows are buffered.
+
+        Returns:
+            Boolean indicating success or failure
+        """
+        self._frames.append(df)
+        self._rows += len(df)
+        if self._rows >= self.max_rows:
+            return self.flush()
+        return True
+
+    def flush(self):
+        """
+        Write the buffered batches as one set of part files.
+
+        Returns:
+            Boolean indicating success or failure
+        """
+        if not self._frames:
+            return True
+        df = pd.concat(self._frames, ignore_index=True)
+        self._frames = []
+        self._rows = 0
+        return write_partitioned(df, self.root, partition_by=self.partition_by, file_format=self.file_format,
+                                 run_date=self.run_date)
+
+    def close(self):
+        """Flush the remaining batches; raises if they could not be written."""
+        if not self.flush():
+            raise RuntimeError(f"Failed to write buffered batches to {self.root}")
+
+
+def _matches(value, condition):
+    if callable(condition):
+        return bool(condition(value))
+    if isinstance(condition, (list, tuple, set, frozenset)):
+        return value in {None if item is None else str(item) for item in condition}
+    return value == (None if condition is None else str(condition))
+
+
+def prune_partitions(manifest, filters=None):
+    """
+    Select the manifest entries whose partition values pass the filters.
+
+    Args:
+        manifest: Dataset manifest (see load_manifest)
+        filters: Dictionary of partition key (or column name) -> value, list of
+            accepted values, or predicate on the (string) value
+
+    Returns:
+        List of manifest file entries
+    """
+    filters = {key.lower(): condition for key, condition in (filters or {}).items()}
+    keys = set(manifest["partition_keys"])
+    partition_filters = {key: condition for key, condition in filters.items() if key in keys}
+    return [
+        entry for entry in manifest["files"]
+        if all(_matches(entry["partition"].get(key), condition) for key, condition in partition_filters.items())
+    ]
+
+
+def read_partitioned(root, filters=None, columns=None):
+    """
+    Read a partitioned dataset, opening only the files of matching partitions.
+
+    Filters on partition keys (run_date and the partition_by columns) prune
+    whole files using the manifest; filters on other columns are applied to
+    the rows that were read. Partition values come back as string columns.
+
+    Args:
+        root: Dataset root directory written by write_partitioned
+        filters: Dictionary of column -> value, list of values, or predicate,
+            e.g. {"gender": "Women", "run_date": ["2026-10-18", "2026-10-19"]}
+        columns: Data columns to read (default: all)
+
+    Returns:
+        pandas DataFrame
+
+    Raises:
+        FileNotFoundError: If root has no manifest
+    """
+    manifest = load_manifest(root)
+    if manifest is None:
+        raise FileNotFoundError(f"No {MANIFEST_NAME} in {root}")
+
+    filters = filters or {}
+    partition_keys = set(manifest["partition_keys"])
+    row_filters = {column: condition for column, condition in filters.items()
+                   if column.lower() not in partition_keys}
+    data_columns = manifest["columns"] if columns is None else [
+        column for column in manifest["columns"] if column in columns or column in row_filters]
+    # Partition columns are named as in the original DataFrame (e.g. gender -> Gender)
+    names = {"run_date": "run_date", **manifest["partition_columns"]}
+
+    frames = []
+    for entry in prune_partitions(manifest, filters):
+        present = [column for column in data_columns if column in entry["columns"]]
+        if present:
+            frame = _read_part(os.path.join(root, entry["path"]), manifest["format"], present)
+        else:
+            # Only partition columns requested: the manifest row count is enough (usecols=[] reads no rows)
+            frame = pd.DataFrame(index=pd.RangeIndex(entry["rows"]))
+        frame = frame.reindex(columns=data_columns)
+        for key, value in entry["partition"].items():
+            frame[names[key]] = value
+        frames.append(frame)
+
+    output_columns = data_columns + [names[key] for key in manifest["partition_keys"]]
+    if not frames:
+        return pd.DataFrame(columns=output_columns)
+    df = pd.concat(frames, ignore_index=True)
+
+    for column, condition in row_filters.items():
+        if callable(condition):
+            mask = df[column].map(condition).astype(bool)
+        elif isinstance(condition, (list, tuple, set, frozenset)):
+            mask = df[column].isin(list(condition))
+        else:
+            mask = df[column] == condition
+        df = df[mask]
+    if columns is not None:
+        output_columns = [column for column in output_columns if column in columns]
+    return df[output_columns].reset_index(drop=True)
@@ -0,0 +1,99 @@
+import os
+import numpy as np
+import pandas as pd
+
+from utils.exchange import DEFAULT_USD_IDR_RATE
+
+# Fields that identify a product; the same values across pages or runs are one product
+DEDUP_COLUMNS = ("Title", "Price", "Size", "Gender")
+
+
+def _normalize_column(series):
+    """Normalize a column so cosmetic differences do not change the row hash."""
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return series.astype("float64").round(2)
+    return series.astype("string").str.strip().str.casefold().fillna("")
+
+
+def product_hashes(df, columns=DEDUP_COLUMNS):
+    """
+    Compute a 64-bit content hash per row over the normalized identifying fields.
+
+    Prices converted with a recorded Exchange_Rate are hashed as if converted
+    at DEFAULT_USD_IDR_RATE, so the hash does not change with the rate.
+
+    Args:
+        df: pandas DataFrame with transformed product data
+        columns: Columns that identify a product
+
+    Returns:
+        numpy uint64 array with one hash per row
+    """
+    values = {column: df[column] for column in columns}
+    if "Price" in values and "Exchange_Rate" in df.columns:
+        # Price is USD times the batch rate; hash it at the default rate so a rate change
+        # does not make a known product look new (and old hash sets stay valid)
+        rate = pd.to_numeric(df["Exchange_Rate"], errors="coerce").fillna(DEFAULT_USD_IDR_RATE)
+        values["Price"] = df["Price"].astype("float64") / rate * DEFAULT_USD_IDR_RATE
+    normalized = pd.DataFrame({column: _normalize_column(series) for column, series in values.items()})
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy()
+
+
+def load_seen_hashes(file_path):
+    """
+    Load the hashes of products loaded in previous runs.
+
+    Args:
+        file_path: Path of the .npy hash set written by save_seen_hashes
+
+    Returns:
+        Sorted numpy uint64 array (empty if the file does not exist yet)
+    """
+    if not os.path.exists(file_path):
+        return np.empty(0, dtype=np.uint64)
+    return np.load(file_path)
+
+
+def save_seen_hashes(file_path, hashes):
+    """
+    Persist the hash set atomically so an interrupted run cannot corrupt it.
+
+    Args:
+        file_path: Path of the .npy file
+        hashes: Sorted numpy uint64 array
+    """
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "wb") as file:
+        np.save(file, hashes)
+    os.replace(tmp_path, file_path)
+
+
+def drop_duplicate_products(df, seen_hashes=None, columns=DEDUP_COLUMNS):
+    """
+    Drop products that repeat within the batch or were already loaded before.
+
+    Args:
+        df: pandas DataFrame with transformed product data
+        seen_hashes: Sorted uint64 array of previously loaded hashes (optional)
+        columns: Columns that identify a product
+
+    Returns:
+        Tuple of (deduplicated DataFrame, sorted uint64 array of seen hashes
+        including the rows kept from this batch)
+    """
+    if seen_hashes is None:
+        seen_hashes = np.empty(0, dtype=np.uint64)
+    if df.empty:
+        return df, seen_hashes
+
+    hashes = product_hashes(df, columns)
+
+    # First occurrence within the batch that was not loaded by an earlier run
+    keep = ~pd.Series(hashes).duplicated().to_numpy()
+    if len(seen_hashes):
+        positions = np.searchsorted(seen_hashes, hashes)
+        positions[positions == len(seen_hashes)] = 0
+        keep &= seen_hashes[positions] != hashes
+
+    deduplicated = df[keep].reset_index(drop=True)
+    return deduplicated, np.union1d(seen_hashes, hashes[keep])
@@ -0,0 +1,241 @@
+import os
+import json
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+# Rate used when no provider is configured (the value the transform always used)
+DEFAULT_USD_IDR_RATE = 16000.0
+RATE_ENV_VARIABLE = "USD_IDR_RATE"
+# Source spec used when none is given (see get_rate_provider)
+SOURCE_ENV_VARIABLE = "EXCHANGE_RATE_SOURCE"
+
+# rate: IDR per USD, timestamp: timezone-aware datetime the rate was published/read, source: provider name
+ExchangeRate = namedtuple("ExchangeRate", ["rate", "timestamp", "source"])
+
+
+def _utcnow():
+    return datetime.now(timezone.utc)
+
+
+def _parse_timestamp(value):
+    """Parse a Unix time or ISO-8601 string into an aware datetime (UTC if no offset)."""
+    if value is None:
+        return _utcnow()
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value, timezone.utc)
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _validated(rate, source):
+    rate = float(rate)
+    if not rate > 0:
+        raise ValueError(f"Invalid exchange rate {rate!r} from {source}")
+    return rate
+
+
+class RateProvider:
+    """Base class: fetch() returns the current USD -> IDR ExchangeRate or raises."""
+
+    name = "provider"
+
+    def fetch(self):
+        raise NotImplementedError
+
+
+class StaticRateProvider(RateProvider):
+    """Fixed rate; the default provider and the stub used in tests."""
+
+    name = "static"
+
+    def __init__(self, rate=DEFAULT_USD_IDR_RATE, timestamp=None):
+        self.rate = _validated(rate, self.name)
+        self.timestamp = timestamp
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        return ExchangeRate(self.rate, self.timestamp or _utcnow(), self.name)
+
+
+class EnvRateProvider(RateProvider):
+    """Rate read from an environment variable (USD_IDR_RATE by default)."""
+
+    name = "env"
+
+    def __init__(self, variable=RATE_ENV_VARIABLE):
+        self.variable = variable
+
+    def fetch(self):
+        value = os.environ.get(self.variable)
+        if not value:
+            raise ValueError(f"Environment variable {self.variable} is not set")
+        return ExchangeRate(_validated(value, self.variable), _utcnow(), f"env:{self.variable}")
+
+
+class FileRateProvider(RateProvider):
+    """
+    Rate read from a file holding either a bare number or JSON
+    {"rate": 16250.5, "timestamp": "2026-10-19T08:00:00Z"}.
+    Without a timestamp the file's modification time is used.
+    """
+
+    name = "file"
+
+    def __init__(self, path):
+        self.path = path
+
+    def fetch(self):
+        with open(self.path, encoding="utf-8") as file:
+            content = file.read().strip()
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Unreadable exchange rate file {self.path}: {e}") from None
+        if isinstance(data, dict):
+            rate, timestamp = data.get("rate"), data.get("timestamp")
+        else:
+            rate, timestamp = data, None
+        if timestamp is None:
+            timestamp = os.path.getmtime(self.path)
+        return ExchangeRate(_validated(rate, self.path), _parse_timestamp(timestamp), f"file:{self.path}")
+
+
+class HttpRateProvider(RateProvider):
+    """
+    Rate fetched from a JSON HTTP API.
+
+    Accepts the common {"rates": {"IDR": ...}} layout (with an optional
+    time_last_update_unix or timestamp field) and a plain {"rate": ...}.
+
+    Args:
+        url: API URL returning USD-based rates
+        currency: Key of the target currency in "rates"
+        session: requests.Session to use (optional)
+        timeout: Request timeout in seconds
+    """
+
+    name = "http"
+
+    def __init__(self, url, currency="IDR", session=None, timeout=10):
+        self.url = url
+        self.currency = currency
+        self.session = session
+        self.timeout = timeout
+
+    def fetch(self):
+        import requests
+
+        response = (self.session or requests).get(self.url, timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json()
+        if "rates" in data:
+            rate = data["rates"][self.currency]
+        else:
+            rate = data["rate"]
+        timestamp = data.get("time_last_update_unix", data.get("timestamp"))
+        return ExchangeRate(_validated(rate, self.url), _parse_timestamp(timestamp), self.url)
+
+
+class CachedRateProvider(RateProvider):
+    """
+    TTL cache in front of another provider.
+
+    The wrapped provider is only asked again once the cached rate is older
+    than ttl seconds. If that refresh fails, the stale rate is kept (with a
+    warning) rather than failing the run; without any cached rate the error
+    is raised.
+
+    Args:
+        provider: RateProvider to cache
+        ttl: Seconds a fetched rate stays fresh
+        clock: Monotonic clock function (for tests)
+    """
+
+    def __init__(self, provider, ttl=3600, clock=time.monotonic):
+        self.provider = provider
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._cached = None
+        self._fetched_at = None
+
+    @property
+    def name(self):
+        return self.provider.name
+
+    def fetch(self):
+        now = self.clock()
+        if self._cached is not None and now - self._fetched_at < self.ttl:
+            self.hits += 1
+            return self._cached
+        self.misses += 1
+        try:
+            self._cached = self.provider.fetch()
+        except Exception as e:
+            if self._cached is None:
+                raise
+            print(f"Exchange rate refresh from {self.provider.name} failed, keeping rate "
+                  f"{self._cached.rate} from {self._cached.timestamp.isoformat()}: {e}")
+        # Also reset after a failed refresh, so the provider is retried after another ttl, not on every batch
+        self._fetched_at = now
+        return self._cached
+
+
+def get_rate_provider(spec=None, ttl=3600):
+    """
+    Create a cached rate provider from a source spec.
+
+    Specs:
+        None          The EXCHANGE_RATE_SOURCE spec if set, else USD_IDR_RATE if set,
+                      else the default rate of 16000
+        "16250"       Fixed rate
+        "env[:NAME]"  Environment variable (default USD_IDR_RATE)
+        "file:PATH"   File with a number or {"rate": ..., "timestamp": ...}
+        "http(s)://"  JSON API, e.g. https://open.er-api.com/v6/latest/USD
+
+    Args:
+        spec: Source spec string
+        ttl: Cache lifetime in seconds
+
+    Returns:
+        CachedRateProvider
+
+    Raises:
+        ValueError: For an unrecognized spec
+    """
+    if spec is None:
+        spec = os.environ.get(SOURCE_ENV_VARIABLE) or None
+    if spec is None:
+        provider = EnvRateProvider() if os.environ.get(RATE_ENV_VARIABLE) else StaticRateProvider()
+    elif spec.startswith(("http://", "https://")):
+        provider = HttpRateProvider(spec)
+    elif spec == "env" or spec.startswith("env:"):
+        provider = EnvRateProvider(spec[4:] or RATE_ENV_VARIABLE)
+    elif spec.startswith("file:"):
+        provider = FileRateProvider(spec[5:])
+    else:
+        try:
+            provider = StaticRateProvider(float(spec))
+        except ValueError:
+            raise ValueError(f"Unknown exchange rate source: {spec}") from None
+    return CachedRateProvider(provider, ttl=ttl)
+
+
+# (spec, ttl) -> CachedRateProvider, so repeated runs in one process (daemon, pipeline batches) share the cache
+_PROVIDERS = {}
+
+
+def resolve_rate(spec=None, ttl=3600):
+    """
+    Resolve the USD -> IDR rate for one batch through the process-wide cache.
+
+    Returns:
+        ExchangeRate
+    """
+    key = (spec, ttl)
+    if key not in _PROVIDERS:
+        _PROVIDERS[key] = get_rate_provider(spec, ttl)
+    return _PROVIDERS[key].fetch()
@@ -1,7 +1,10 @@
 import time
-import pandas as pd
+import codecs
 import requests
 from bs4 import BeautifulSoup
+
+from utils.records import RawProduct
+from utils.memo import memoized, StringInterner
 # from transform import transform_data, transform_to_DataFrame # Mengimpor fungsi dari modul transform
 # from store_to_db import store_to_postgre 
 HEADERS = {
@@ -10,11 +13,41 @@ HEADERS = {
         "(KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
     )
 }
+
+intern_colors = StringInterner("extract_colors")
+intern_size = StringInterner("extract_size")
+intern_gender = StringInterner("extract_gender")
  
  
-def fetching_content(url):
-    """Mengambil konten HTML dari URL yang diberikan."""
-    session = requests.Session()
+def response_body(response):
+    """Mengembalikan isi HTML response dengan memperhatikan charset yang dideklarasikan.
+    
+    Jika header Content-Type menyebut charset selain UTF-8, isi di-decode dengan
+    charset tersebut menjadi str (sehingga arsip dan replay menyimpannya sebagai
+    UTF-8). Tanpa deklarasi charset (atau dengan UTF-8), bytes dikembalikan apa
+    adanya dan encoding dideteksi saat parsing (meta charset, fallback UTF-8).
+    """
+    content_type = response.headers.get("Content-Type", "")
+    if "charset=" in content_type.lower() and response.encoding:
+        try:
+            declared = codecs.lookup(response.encoding).name
+        except LookupError:
+            print(f"Charset {response.encoding!r} tidak dikenal, halaman di-decode sebagai UTF-8.")
+            return response.content
+        if declared != "utf-8":
+            return response.text
+    return response.content
+
+def fetching_content(url, session=None):
+    """Mengambil konten HTML dari URL yang diberikan.
+    
+    Args:
+        url: URL halaman
+        session: requests.Session yang dipakai ulang antar request (opsional).
+            Tanpa session, setiap request membuat koneksi baru.
+    """
+    if session is None:
+        session = requests.Session()
     try:
         response = session.get(url, headers=HEADERS, timeout=10)
         # Memeriksa status kode HTTP
@@ -22,7 +55,7 @@ def fetching_content(url):
             print(f"Halaman {url} mengembalikan status 404 (Not Found).")
             return None
         response.raise_for_status()
-        return response.content
+        return response_body(response)
     except requests.exceptions.RequestException as e:
         print(f"Terjadi kesalahan ketika melakukan requests terhadap {url}: {e}")
         return None
@@ -48,35 +81,89 @@ def extract_product_data(product_card):
     rating = colors = size = gender = None
 
     for p in p_tags:
-        text = p.get_text(strip=True)
-        if text.startswith("Rating"):
-            rating = text.replace("Rating:", "").strip()
-        elif "Colors" in text:
-            colors = text.strip()
-        elif "Size:" in text:
-            size = text.replace("Size:", "").strip()
-        elif "Gender:" in text:
-            gender = text.replace("Gender:", "").strip()
+        field, value = parse_detail(p.get_text(strip=True))
+        if field == "Rating":
+            rating = value
+        elif field == "Colors":
+            colors = value
+        elif field == "Size":
+            size = value
+        elif field == "Gender":
+            gender = value
 
-    return {
-        "Title": title,
-        "Price": price,
-        "Rating": rating,
-        "Colors": colors,
-        "Size": size,
-        "Gender": gender
-    }
+    return RawProduct(title, price, rating, colors, size, gender)
 
-def scrape_product(base_url, first_page_url, start_page=1, delay=2):
-    """Fungsi utama untuk mengambil data produk dari beberapa halaman.
+@memoized("parse_detail")
+def parse_detail(text):
+    """Memetakan satu baris detail produk ke (field, value).
+    
+    Baris detail yang sama ("Size: M", "3 Colors", ...) muncul di ribuan
+    kartu, jadi hasilnya di-cache (LRU terbatas) dan nilai Colors/Size/Gender
+    di-intern agar semua produk berbagi satu objek string per nilai.
+    
+    Returns:
+        Tuple (field, value); field bernilai None untuk baris yang tidak dikenal
+    """
+    if text.startswith("Rating"):
+        return "Rating", text.replace("Rating:", "").strip()
+    elif "Colors" in text:
+        return "Colors", intern_colors(text.strip())
+    elif "Size:" in text:
+        return "Size", intern_size(text.replace("Size:", "").strip())
+    elif "Gender:" in text:
+        return "Gender", intern_gender(text.replace("Gender:", "").strip())
+    return None, None
+
+def make_soup(content):
+    """Mem-parsing konten HTML menjadi objek BeautifulSoup.
+    
+    Konten berupa memoryview (misalnya slice dari arsip mmap) langsung
+    di-decode menjadi str tanpa disalin dulu ke objek bytes. Halaman di file
+    pack selalu UTF-8, karena pack_archive meng-encode ulang halaman yang
+    mendeklarasikan charset lain (header HTTP atau <meta charset>).
+    """
+    if isinstance(content, memoryview):
+        content = str(content, "utf-8", "replace")
+    return BeautifulSoup(content, "html.parser")
+
+def parse_page(content):
+    """Mengekstrak semua produk dari konten HTML satu halaman katalog.
+    
+    Args:
+        content: Konten HTML halaman (bytes atau str)
+        
+    Returns:
+        Tuple (products, has_next). products bernilai None jika halaman
+        menampilkan error 'Page not found', dan list kosong jika tidak ada
+        produk di halaman tersebut.
+    """
+    soup = make_soup(content)
+    
+    # Cek judul halaman untuk deteksi halaman error
+    title_tag = soup.find('h1')
+    if title_tag and "Page not found" in title_tag.text:
+        return None, False
+        
+    product_cards = soup.find_all('div', class_='product-details')
+    products = [extract_product_data(card) for card in product_cards]
+    
+    next_button = soup.find('li', class_='next')
+    return products, next_button is not None
+
+def iter_product_pages(base_url, first_page_url, start_page=1, delay=2, archive=None, session=None):
+    """Mengambil produk halaman demi halaman, menghasilkan list produk per halaman.
     
     Args:
         base_url: Format URL untuk halaman 2 dan seterusnya
         first_page_url: URL untuk halaman pertama
         start_page: Halaman awal untuk scraping
         delay: Jeda waktu antar requests (detik)
+        archive: PageArchive untuk menyimpan HTML mentah setiap halaman (opsional)
+        session: requests.Session yang dipakai ulang untuk semua halaman (opsional)
+        
+    Yields:
+        List RawProduct dari satu halaman
     """
-    data = []
     page_number = start_page
  
     while True:
@@ -88,32 +175,25 @@ def scrape_product(base_url, first_page_url, start_page=1, delay=2):
             
         print(f"Scraping halaman: {url}")
  
-        content = fetching_content(url)
+        content = fetching_content(url, session)
         if content:
-            soup = BeautifulSoup(content, "html.parser")
-            
-            # Cek apakah halaman menunjukkan "Page Not Found" atau "Page not found"
-            page_not_found = soup.find_all(text=lambda text: text and ("Page Not Found" in text or "Page not found" in text))
+            if archive is not None:
+                archive.store(url, page_number, content)
+                
+            products, has_next = parse_page(content)
             
-            # Cek judul halaman untuk deteksi halaman error
-            title_tag = soup.find('h1')
-            if title_tag and "Page not found" in title_tag.text:
+            if products is None:
                 print(f"Halaman {url} menampilkan error 'Page not found'. Scraping dihentikan.")
                 break
                 
-            product_cards = soup.find_all('div', class_='product-details')
-            
             # Jika tidak ada produk yang ditemukan, kemungkinan halaman tidak valid
-            if not product_cards:
+            if not products:
                 print(f"Tidak ditemukan produk di halaman {url}. Scraping dihentikan.")
                 break
                 
-            for card in product_cards:
-                product = extract_product_data(card)
-                data.append(product)
+            yield products
  
-            next_button = soup.find('li', class_='next')
-            if next_button:
+            if has_next:
                 page_number += 1
                 time.sleep(delay) # Delay sebelum halaman berikutnya
             else:
@@ -122,6 +202,20 @@ def scrape_product(base_url, first_page_url, start_page=1, delay=2):
             print(f"Tidak bisa mengakses halaman {url}. Scraping dihentikan.")
             break # Berhenti jika ada kesalahan
 
+def scrape_product(base_url, first_page_url, start_page=1, delay=2, archive=None, session=None):
+    """Fungsi utama untuk mengambil data produk dari beberapa halaman.
+    
+    Args:
+        base_url: Format URL untuk halaman 2 dan seterusnya
+        first_page_url: URL untuk halaman pertama
+        start_page: Halaman awal untuk scraping
+        delay: Jeda waktu antar requests (detik)
+        archive: PageArchive untuk menyimpan HTML mentah setiap halaman (opsional)
+        session: requests.Session yang dipakai ulang untuk semua halaman (opsional)
+    """
+    data = []
+    for products in iter_product_pages(base_url, first_page_url, start_page, delay, archive, session):
+        data.extend(products)
     return data
 
 # def main():
@@ -1,10 +1,491 @@
 import pandas as pd
-import psycopg2
-from psycopg2.extras import execute_values
+import numpy as np
+import io
+import os
+import re
 import json
+import time
+import uuid
+import random
+import hashlib
+import textwrap
+from datetime import date
+from concurrent.futures import ThreadPoolExecutor
 
+from utils.records import RawProduct, Product, records_to_DataFrame
 
-def store_to_postgre(df, table_name="products", connection_params=None):
+# psycopg2 is imported on first use (see _import_postgres_driver), so file-only
+# runs and `import utils.load` do not pay for loading the PostgreSQL driver.
+_POSTGRES_NAMES = ("psycopg2", "execute_values")
+
+
+def _import_postgres_driver():
+    """Import psycopg2 into the module namespace unless it is already there (or patched)."""
+    module_globals = globals()
+    if "psycopg2" not in module_globals:
+        import psycopg2
+        import psycopg2.pool
+        module_globals["psycopg2"] = psycopg2
+    if "execute_values" not in module_globals:
+        from psycopg2.extras import execute_values
+        module_globals["execute_values"] = execute_values
+
+
+def __getattr__(name):
+    # PEP 562: resolve utils.load.psycopg2 / utils.load.execute_values lazily
+    if name in _POSTGRES_NAMES:
+        _import_postgres_driver()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def _replace_missing(df):
+    """Return an object-dtype copy of df with every missing value (NaN, NA, NaT) as None."""
+    return df.astype(object).where(df.notna(), None)
+
+
+DEFAULT_CONNECTION_PARAMS = {
+    "host": "localhost",
+    "database": "product_db",
+    "user": "developer",
+    "password": "secretpassword",
+    "port": 5432
+}
+
+
+def create_connection_pool(connection_params=None, minconn=1, maxconn=4):
+    """
+    Create a thread-safe pool of PostgreSQL connections that stay open between loads
+    
+    Args:
+        connection_params: Dictionary with connection parameters (see store_to_postgre)
+        minconn: Number of connections opened up front
+        maxconn: Maximum number of connections
+    
+    Returns:
+        psycopg2.pool.ThreadedConnectionPool
+    """
+    if connection_params is None:
+        connection_params = DEFAULT_CONNECTION_PARAMS
+    _import_postgres_driver()
+    return psycopg2.pool.ThreadedConnectionPool(minconn, maxconn, **connection_params)
+
+
+# Secondary indexes created on partitioned tables; PostgreSQL cascades them to every partition
+PARTITION_INDEX_COLUMNS = ("title", "gender", "size")
+
+# Monthly partitions are named <table>_pYYYY_MM
+_PARTITION_SUFFIX = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def _add_months(month_start, months):
+    """Return the first day of the month `months` after month_start."""
+    index = month_start.year * 12 + month_start.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name, month_start):
+    """Name of the monthly partition of table_name that starts at month_start."""
+    return f"{table_name}_p{month_start.year:04d}_{month_start.month:02d}"
+
+
+def default_partition_name(table_name):
+    """Name of the DEFAULT partition catching rows outside the monthly partitions."""
+    return f"{table_name}_default"
+
+
+def _server_today(cursor, today=None):
+    """Reference date for partitioning: today if given, else the database server's CURRENT_DATE."""
+    if today is not None:
+        return today
+    # created_at defaults to the server clock, so the months must follow it rather than the client's
+    cursor.execute("SELECT CURRENT_DATE")
+    return cursor.fetchone()[0]
+
+
+def create_partitioned_table(cursor, table_name="products"):
+    """
+    Create the products table range-partitioned by month on created_at, with
+    indexes on title, gender and size and a DEFAULT partition, so a row
+    outside the premade months (e.g. a skewed clock) is stored instead of
+    failing the whole insert.
+
+    An existing unpartitioned table cannot be converted in place; it has to be
+    renamed and its rows copied into the new partitioned table.
+
+    Args:
+        cursor: psycopg2 cursor
+        table_name: Name of the partitioned (parent) table
+
+    Raises:
+        ValueError: If table_name already exists as a regular table
+    """
+    cursor.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass(%s)", (table_name,))
+    row = cursor.fetchone()
+    if row is not None and row[0] != "p":
+        raise ValueError(f"Table {table_name} already exists and is not partitioned")
+
+    # The partition key must be part of the primary key
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table_name} (
+            id BIGSERIAL,
+            title VARCHAR(255),
+            price NUMERIC,
+            rating NUMERIC,
+            colors INTEGER,
+            size VARCHAR(50),
+            gender VARCHAR(50),
+            exchange_rate NUMERIC,
+            rate_timestamp TIMESTAMPTZ,
+            created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at);
+        {_RATE_COLUMNS_DDL.format(table_name=table_name)}
+        CREATE TABLE IF NOT EXISTS {default_partition_name(table_name)} PARTITION OF {table_name} DEFAULT;
+    """)
+    for column in PARTITION_INDEX_COLUMNS:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_{column}_idx ON {table_name} ({column})")
+
+
+def ensure_partitions(cursor, table_name="products", premake=3, today=None):
+    """
+    Create the partitions for the current month and the next `premake` months.
+
+    Rows of a new month that already landed in the DEFAULT partition are
+    moved into the new partition before it is attached (PostgreSQL refuses
+    to add a partition whose range still has rows in the default one).
+
+    Args:
+        cursor: psycopg2 cursor
+        table_name: Partitioned table
+        premake: Number of upcoming months created ahead of time
+        today: Reference date (default: the database server's CURRENT_DATE)
+
+    Returns:
+        List of partition names covering the current and upcoming months
+    """
+    month_start = _server_today(cursor, today).replace(day=1)
+    months = [_add_months(month_start, offset) for offset in range(premake + 1)]
+    names = [partition_name(table_name, lower) for lower in months]
+
+    def missing_months():
+        cursor.execute("SELECT name FROM unnest(%s::text[]) AS name WHERE to_regclass(name) IS NULL", (names,))
+        missing = {row[0] for row in cursor.fetchall()}
+        return [lower for lower, name in zip(months, names) if name in missing]
+
+    if not missing_months():
+        return names
+    # Serialize concurrent loads creating the same partitions; held until the transaction ends
+    cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"partitions:{table_name}",))
+    default = default_partition_name(table_name)
+    for lower in missing_months():
+        upper = _add_months(lower, 1)
+        name = partition_name(table_name, lower)
+        cursor.execute(f"CREATE TABLE {name} (LIKE {table_name} INCLUDING DEFAULTS)")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {default} WHERE created_at >= %s AND created_at < %s RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved",
+            (lower, upper),
+        )
+        cursor.execute(
+            f"ALTER TABLE {table_name} ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+    return names
+
+
+def drop_expired_partitions(cursor, table_name="products", retention_months=12, today=None):
+    """
+    Drop monthly partitions that end before the retention window.
+
+    Dropping a partition is a metadata operation: no row-by-row DELETE and no
+    vacuum debt, however many rows it held.
+
+    Args:
+        cursor: psycopg2 cursor
+        table_name: Partitioned table
+        retention_months: Number of past months kept besides the current one
+        today: Reference date (default: the database server's CURRENT_DATE)
+
+    Returns:
+        List of dropped partition names
+    """
+    cutoff = _add_months(_server_today(cursor, today).replace(day=1), -retention_months)
+    # Old rows that ended up in the DEFAULT partition expire with the same window
+    cursor.execute(f"DELETE FROM {default_partition_name(table_name)} WHERE created_at < %s", (cutoff,))
+    cursor.execute(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.oid = to_regclass(%s)",
+        (table_name,),
+    )
+
+    dropped = []
+    for (name,) in cursor.fetchall():
+        match = _PARTITION_SUFFIX.search(name)
+        if match is None:
+            continue
+        lower = date(int(match.group(1)), int(match.group(2)), 1)
+        if _add_months(lower, 1) <= cutoff:
+            cursor.execute(f"DROP TABLE IF EXISTS {name}")
+            dropped.append(name)
+    return sorted(dropped)
+
+
+def manage_partitions(table_name="products", connection_params=None, premake=3, retention_months=None,
+                      today=None):
+    """
+    Partition maintenance for scheduled runs: create the partitioned table if
+    needed, create upcoming partitions and drop the ones past retention.
+
+    Args:
+        table_name: Partitioned table
+        connection_params: Dictionary with connection parameters (see store_to_postgre)
+        premake: Number of upcoming months created ahead of time
+        retention_months: Past months to keep (default: keep everything)
+        today: Reference date (default: the database server's CURRENT_DATE)
+
+    Returns:
+        Dictionary with the "partitions" ensured and the "dropped" ones, or None on failure
+    """
+    if connection_params is None:
+        connection_params = DEFAULT_CONNECTION_PARAMS
+    _import_postgres_driver()
+
+    conn = None
+    try:
+        conn = psycopg2.connect(**connection_params)
+        cursor = conn.cursor()
+        create_partitioned_table(cursor, table_name)
+        partitions = ensure_partitions(cursor, table_name, premake=premake, today=today)
+        dropped = []
+        if retention_months is not None:
+            dropped = drop_expired_partitions(cursor, table_name, retention_months, today=today)
+        conn.commit()
+        cursor.close()
+        conn.close()
+
+        print(f"Partitions of {table_name} up to date ({len(partitions)} ensured, {len(dropped)} dropped)")
+        return {"partitions": partitions, "dropped": dropped}
+
+    except Exception as e:
+        print(f"Error managing partitions of {table_name}: {e}")
+        if conn is not None:
+            conn.close()
+        return None
+
+
+# Tables created before prices were converted with a recorded exchange rate lack these columns
+_RATE_COLUMNS_DDL = (
+    "ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS exchange_rate NUMERIC, "
+    "ADD COLUMN IF NOT EXISTS rate_timestamp TIMESTAMPTZ;"
+)
+
+
+def _create_products_table(cursor, table_name, partitioned=False):
+    """Create table_name if it doesn't exist (plain, or partitioned with upcoming partitions)."""
+    if partitioned:
+        create_partitioned_table(cursor, table_name)
+        ensure_partitions(cursor, table_name)
+        return
+
+    create_table_query = f"""
+    CREATE TABLE IF NOT EXISTS {table_name} (
+        id SERIAL PRIMARY KEY,
+        title VARCHAR(255),
+        price NUMERIC,
+        rating NUMERIC,
+        colors INTEGER,
+        size VARCHAR(50),
+        gender VARCHAR(50),
+        exchange_rate NUMERIC,
+        rate_timestamp TIMESTAMPTZ,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    );
+    {_RATE_COLUMNS_DDL.format(table_name=table_name)}
+    """
+    cursor.execute(create_table_query)
+
+
+# rating_1: below 2, rating_2: [2, 3), rating_3: [3, 4), rating_4: 4 and above
+SUMMARY_RATING_BUCKETS = (1, 2, 3, 4)
+SUMMARY_METRICS = ("product_count", "price_sum", "price_min", "price_max", "rating_count", "rating_sum") + tuple(
+    f"rating_{bucket}" for bucket in SUMMARY_RATING_BUCKETS)
+
+
+def summarize_products(df):
+    """
+    Aggregate a batch of products per gender and size.
+
+    Missing genders and sizes are grouped under "" so they can be part of
+    the summary tables' primary keys.
+
+    Args:
+        df: pandas DataFrame with transformed product data
+
+    Returns:
+        pandas DataFrame with gender, size and the SUMMARY_METRICS columns
+    """
+    rating = pd.to_numeric(df["Rating"], errors="coerce").astype(np.float64).to_numpy()
+    frame = pd.DataFrame({
+        "gender": df["Gender"].astype(object).where(df["Gender"].notna(), "").to_numpy(),
+        "size": df["Size"].astype(object).where(df["Size"].notna(), "").to_numpy(),
+        # Sums in float64 even if optimize_dtypes downcast the column to float32
+        "price": pd.to_numeric(df["Price"], errors="coerce").astype(np.float64).to_numpy(),
+        "rating": rating,
+    })
+    buckets = np.clip(np.floor(rating), SUMMARY_RATING_BUCKETS[0], SUMMARY_RATING_BUCKETS[-1])
+    for bucket in SUMMARY_RATING_BUCKETS:
+        frame[f"rating_{bucket}"] = (buckets == bucket).astype(np.int64)
+
+    summary = frame.groupby(["gender", "size"], sort=True).agg(
+        product_count=("price", "size"),
+        price_sum=("price", "sum"),
+        price_min=("price", "min"),
+        price_max=("price", "max"),
+        rating_count=("rating", "count"),
+        rating_sum=("rating", "sum"),
+        **{f"rating_{bucket}": (f"rating_{bucket}", "sum") for bucket in SUMMARY_RATING_BUCKETS},
+    )
+    return summary.reset_index()
+
+
+def create_summary_tables(cursor, table_name="products"):
+    """
+    Create <table>_summary (all-time totals per gender/size) and
+    <table>_run_summary (per load run and gender/size) if they don't exist.
+
+    Averages are generated columns, so dashboards read avg_price and
+    avg_rating directly.
+    """
+    metrics = """
+            product_count BIGINT NOT NULL,
+            price_sum NUMERIC NOT NULL,
+            price_min NUMERIC,
+            price_max NUMERIC,
+            avg_price NUMERIC GENERATED ALWAYS AS (price_sum / NULLIF(product_count, 0)) STORED,
+            rating_count BIGINT NOT NULL,
+            rating_sum NUMERIC NOT NULL,
+            avg_rating NUMERIC GENERATED ALWAYS AS (rating_sum / NULLIF(rating_count, 0)) STORED,
+            """ + "".join(f"rating_{bucket} BIGINT NOT NULL,\n            " for bucket in SUMMARY_RATING_BUCKETS)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {table_name}_summary (
+            gender VARCHAR(50) NOT NULL,
+            size VARCHAR(50) NOT NULL,{metrics}updated_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            PRIMARY KEY (gender, size)
+        );
+        CREATE TABLE IF NOT EXISTS {table_name}_run_summary (
+            run_id VARCHAR(64) NOT NULL,
+            run_at TIMESTAMPTZ NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            gender VARCHAR(50) NOT NULL,
+            size VARCHAR(50) NOT NULL,{metrics}PRIMARY KEY (run_id, gender, size)
+        );
+        CREATE INDEX IF NOT EXISTS {table_name}_run_summary_run_at_idx ON {table_name}_run_summary (run_at);
+    """)
+
+
+def _summary_upsert(summary_table, key_columns, extra_updates=""):
+    """INSERT ... ON CONFLICT statement adding a batch's metrics to the stored ones."""
+    columns = list(key_columns) + list(SUMMARY_METRICS)
+    updates = []
+    for metric in SUMMARY_METRICS:
+        if metric == "price_min":
+            updates.append(f"price_min = LEAST({summary_table}.price_min, EXCLUDED.price_min)")
+        elif metric == "price_max":
+            updates.append(f"price_max = GREATEST({summary_table}.price_max, EXCLUDED.price_max)")
+        else:
+            updates.append(f"{metric} = {summary_table}.{metric} + EXCLUDED.{metric}")
+    return (
+        f"INSERT INTO {summary_table} ({', '.join(columns)}) VALUES %s "
+        f"ON CONFLICT ({', '.join(key_columns)}) DO UPDATE SET {', '.join(updates)}{extra_updates}"
+    )
+
+
+def update_summary_tables(cursor, df, table_name="products", run_id=None):
+    """
+    Add one loaded batch to the summary tables.
+
+    The batch is aggregated in pandas (see summarize_products) and merged
+    into the stored rows with INSERT ... ON CONFLICT DO UPDATE, so the
+    summaries never rescan table_name. Call it in the same transaction as
+    the insert of df, so the summaries always match the loaded rows. Batches
+    of one run (e.g. --pipeline) share a run_id and add up in one run row.
+
+    Args:
+        cursor: psycopg2 cursor
+        df: pandas DataFrame that is being loaded into table_name
+        table_name: Base products table
+        run_id: Identifier of the load run (default: a new random id)
+
+    Returns:
+        The batch summary DataFrame
+    """
+    run_id = run_id or uuid.uuid4().hex
+    create_summary_tables(cursor, table_name)
+    summary = summarize_products(df)
+    if summary.empty:
+        return summary
+
+    # Rows are sorted by (gender, size), so concurrent loads lock summary rows in the same
+    # order and cannot deadlock. A group without any price has NaN min/max, sent as NULL
+    # (which LEAST/GREATEST skip) instead of a NUMERIC 'NaN' that would stick in the row
+    rows = list(_replace_missing(summary).itertuples(index=False, name=None))
+    execute_values(cursor, _summary_upsert(f"{table_name}_summary", ("gender", "size"),
+                                           ", updated_at = CURRENT_TIMESTAMP"), rows)
+    execute_values(cursor, _summary_upsert(f"{table_name}_run_summary", ("run_id", "gender", "size")),
+                   [(run_id,) + row for row in rows])
+    return summary
+
+
+def rebuild_summary_tables(table_name="products", connection_params=None):
+    """
+    Recompute <table>_summary from the full history in one aggregate query.
+
+    Needed once when summaries are enabled on a table that already has data
+    (or after rows were deleted); afterwards update_summary_tables keeps it
+    current. Per-run summaries cannot be reconstructed and are left as is.
+
+    Returns:
+        Number of summary rows, or None on failure
+    """
+    if connection_params is None:
+        connection_params = DEFAULT_CONNECTION_PARAMS
+    _import_postgres_driver()
+
+    buckets = ",\n".join(
+        f"COUNT(*) FILTER (WHERE {condition})" for condition in (
+            ["rating < 2"] + [f"rating >= {bucket} AND rating < {bucket + 1}" for bucket in SUMMARY_RATING_BUCKETS[1:-1]]
+            + [f"rating >= {SUMMARY_RATING_BUCKETS[-1]}"]))
+    conn = None
+    try:
+        conn = psycopg2.connect(**connection_params)
+        cursor = conn.cursor()
+        create_summary_tables(cursor, table_name)
+        cursor.execute(f"DELETE FROM {table_name}_summary")
+        cursor.execute(f"""
+            INSERT INTO {table_name}_summary (gender, size, {', '.join(SUMMARY_METRICS)})
+            SELECT COALESCE(gender, ''), COALESCE(size, ''), COUNT(*), COALESCE(SUM(price), 0),
+                   MIN(price), MAX(price), COUNT(rating), COALESCE(SUM(rating), 0),
+                   {buckets}
+            FROM {table_name}
+            GROUP BY 1, 2
+        """)
+        rows = cursor.rowcount
+        conn.commit()
+        cursor.close()
+        print(f"Rebuilt {table_name}_summary with {rows} rows")
+        return rows
+    except Exception as e:
+        print(f"Error rebuilding summary tables: {e}")
+        return None
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+def store_to_postgre(df, table_name="products", connection_params=None, connection_pool=None,
+                     partitioned=False, summaries=False, run_id=None):
     """
     Store transformed DataFrame to PostgreSQL database
     
@@ -18,42 +499,37 @@ def store_to_postgre(df, table_name="products", connection_params=None):
                 "user": "postgres",
                 "password": "password"
             }
+        connection_pool: Pool from create_connection_pool; when given, a warm
+            connection is borrowed from it instead of opening a new one
+        partitioned: Create/use a table range-partitioned by month on created_at
+            (see create_partitioned_table) and make sure the current and upcoming
+            monthly partitions exist before inserting
+        summaries: Also add the batch to the <table>_summary and <table>_run_summary
+            tables, in the same transaction (see update_summary_tables)
+        run_id: Run identifier for <table>_run_summary; batches with the same id add up
     
     Returns:
         Boolean indicating success or failure
     """
     if connection_params is None:
-        connection_params = {
-            "host": "localhost",
-            "database": "product_db",
-            "user": "developer",
-            "password": "secretpassword",
-            "port": 5432
-        }
+        connection_params = DEFAULT_CONNECTION_PARAMS
+    _import_postgres_driver()
     
+    conn = None
     try:
-        # Connect to PostgreSQL
-        conn = psycopg2.connect(**connection_params)
+        # Connect to PostgreSQL (or borrow an open connection from the pool)
+        if connection_pool is not None:
+            conn = connection_pool.getconn()
+        else:
+            conn = psycopg2.connect(**connection_params)
         cursor = conn.cursor()
         
         # Create table if it doesn't exist
-        create_table_query = f"""
-        CREATE TABLE IF NOT EXISTS {table_name} (
-            id SERIAL PRIMARY KEY,
-            title VARCHAR(255),
-            price NUMERIC,
-            rating NUMERIC,
-            colors INTEGER,
-            size VARCHAR(50),
-            gender VARCHAR(50),
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        );
-        """
-        cursor.execute(create_table_query)
+        _create_products_table(cursor, table_name, partitioned)
         
         # Prepare data for insert
         columns = list(df.columns)
-        values = [tuple(x) for x in df.to_numpy()]
+        values = [tuple(x) for x in _replace_missing(df).to_numpy()]
         
         # Insert data
         insert_query = f"""
@@ -61,26 +537,139 @@ def store_to_postgre(df, table_name="products", connection_params=None):
         VALUES %s
         """
         execute_values(cursor, insert_query, values)
+        if summaries:
+            update_summary_tables(cursor, df, table_name, run_id)
         
-        # Commit and close
+        # Commit and close (or return the connection to the pool)
         conn.commit()
         cursor.close()
-        conn.close()
+        if connection_pool is not None:
+            connection_pool.putconn(conn)
+        else:
+            conn.close()
         
         print(f"Successfully stored {len(df)} records to {table_name} table")
         return True
         
     except Exception as e:
         print(f"Error storing data to PostgreSQL: {e}")
+        if conn is not None:
+            if connection_pool is not None:
+                # Drop the connection, it may be broken or inside a failed transaction
+                connection_pool.putconn(conn, close=True)
+            else:
+                conn.close()
         return False
 
 
+def copy_dataframe(cursor, df, table_name):
+    """COPY the rows of df into table_name (PostgreSQL's fastest bulk path) through an in-memory CSV."""
+    buffer = io.StringIO()
+    df.to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    cursor.copy_expert(f"COPY {table_name} ({', '.join(df.columns)}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+
+def _copy_shard(shard, staging_table, connection_params):
+    """Thread worker: COPY one shard into the staging table over its own connection."""
+    conn = psycopg2.connect(**connection_params)
+    try:
+        with conn.cursor() as cursor:
+            copy_dataframe(cursor, shard, staging_table)
+        conn.commit()
+    finally:
+        conn.close()
+    return len(shard)
+
+
+def parallel_store_to_postgre(df, table_name="products", connection_params=None, workers=4, partitioned=False,
+                              summaries=False, run_id=None):
+    """
+    Load a large DataFrame over several connections at once.
+
+    The frame is split into `workers` shards that are COPYed concurrently, each
+    over its own connection (and server backend), into an UNLOGGED staging
+    table. A single INSERT ... SELECT then moves the rows into table_name in
+    one transaction, so the target never holds a partial load.
+
+    Args:
+        df: pandas DataFrame with transformed product data
+        table_name: Target table name in PostgreSQL
+        connection_params: Dictionary with connection parameters (see store_to_postgre)
+        workers: Number of shards and concurrent connections
+        partitioned: Use the monthly partitioned table (see store_to_postgre)
+        summaries: Also update the summary tables in the final transaction (see store_to_postgre)
+        run_id: Run identifier for <table>_run_summary
+
+    Returns:
+        Dictionary with rows, shards, seconds and rows_per_second, or None on failure
+    """
+    if connection_params is None:
+        connection_params = DEFAULT_CONNECTION_PARAMS
+    _import_postgres_driver()
+
+    columns = ", ".join(df.columns)
+    staging_table = f"{table_name}_staging_{uuid.uuid4().hex[:8]}"
+    shards = [df.iloc[positions] for positions in np.array_split(np.arange(len(df)), max(1, workers))]
+    shards = [shard for shard in shards if not shard.empty]
+
+    started = time.perf_counter()
+    conn = None
+    staging_created = False
+    try:
+        conn = psycopg2.connect(**connection_params)
+        cursor = conn.cursor()
+        _create_products_table(cursor, table_name, partitioned)
+        # Committed so the shard connections can see it; UNLOGGED skips WAL for the intermediate copy
+        cursor.execute(f"CREATE UNLOGGED TABLE {staging_table} AS SELECT {columns} FROM {table_name} WITH NO DATA")
+        conn.commit()
+        staging_created = True
+
+        with ThreadPoolExecutor(max_workers=len(shards) or 1) as pool:
+            futures = [pool.submit(_copy_shard, shard, staging_table, connection_params) for shard in shards]
+            copied = sum(future.result() for future in futures)
+
+        cursor.execute(f"INSERT INTO {table_name} ({columns}) SELECT {columns} FROM {staging_table}")
+        cursor.execute(f"DROP TABLE {staging_table}")
+        if summaries:
+            update_summary_tables(cursor, df, table_name, run_id)
+        conn.commit()
+        staging_created = False
+        cursor.close()
+
+        seconds = time.perf_counter() - started
+        stats = {
+            "rows": copied,
+            "shards": len(shards),
+            "seconds": round(seconds, 3),
+            "rows_per_second": round(copied / seconds, 1) if seconds > 0 else 0.0,
+        }
+        print(f"Successfully stored {copied} records to {table_name} table over {len(shards)} connections "
+              f"({stats['rows_per_second']} rows/sec)")
+        return stats
+
+    except Exception as e:
+        print(f"Error storing data to PostgreSQL in parallel: {e}")
+        if conn is not None and staging_created:
+            try:
+                conn.rollback()
+                conn.cursor().execute(f"DROP TABLE IF EXISTS {staging_table}")
+                conn.commit()
+            except Exception as cleanup_error:
+                print(f"Could not drop staging table {staging_table}: {cleanup_error}")
+        return None
+
+    finally:
+        if conn is not None:
+            conn.close()
+
+
 def save_to_json(data, file_path="transformed_products.json"):
     """
     Save transformed data to a JSON file
     
     Args:
-        data: List of transformed product dictionaries or DataFrame
+        data: List of transformed product records/dictionaries or DataFrame
         file_path: Path to save the JSON file
     
     Returns:
@@ -89,7 +678,9 @@ def save_to_json(data, file_path="transformed_products.json"):
     try:
         # Convert DataFrame to list of dictionaries if needed
         if isinstance(data, pd.DataFrame):
-            data_to_save = data.to_dict(orient='records')
+            data_to_save = _replace_missing(data).to_dict(orient='records')
+        elif data and isinstance(data[0], (RawProduct, Product)):
+            data_to_save = [record.to_dict() for record in data]
         else:
             data_to_save = data
             
@@ -103,29 +694,272 @@ def save_to_json(data, file_path="transformed_products.json"):
         return False
 
 
-def save_to_csv(data, file_path="products.csv"):
+class JsonArrayWriter:
+    """
+    Write a JSON array file incrementally, batch by batch.
+
+    Produces the same format as save_to_json without holding every record in
+    memory, for sinks that receive the data in batches.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self._file = open(file_path, 'w')
+        self._file.write('[')
+        self._count = 0
+
+    def write(self, data):
+        """
+        Append a batch of records to the array.
+
+        Args:
+            data: List of transformed product records/dictionaries or DataFrame
+
+        Returns:
+            Boolean indicating success or failure
+        """
+        try:
+            if isinstance(data, pd.DataFrame):
+                records = _replace_missing(data).to_dict(orient='records')
+            elif data and isinstance(data[0], (RawProduct, Product)):
+                records = [record.to_dict() for record in data]
+            else:
+                records = data
+
+            for record in records:
+                self._file.write(',\n' if self._count else '\n')
+                # Same layout as json.dump(records, indent=2) in save_to_json
+                self._file.write(textwrap.indent(json.dumps(record, indent=2), '  '))
+                self._count += 1
+            return True
+        except Exception as e:
+            print(f"Error saving data to JSON: {e}")
+            return False
+
+    def close(self):
+        """Close the array and the file."""
+        self._file.write('\n]' if self._count else ']')
+        self._file.close()
+        print(f"Data successfully saved to {self.file_path}")
+
+
+def save_to_jsonl(data, file_path="products.jsonl", append=False):
+    """
+    Save transformed data to a JSON Lines file (one JSON object per line)
+    
+    Unlike save_to_json, the output can be appended to chunk by chunk.
+    
+    Args:
+        data: List of transformed product records/dictionaries or DataFrame
+        file_path: Path to save the JSON Lines file
+        append: Append records instead of overwriting the file
+    
+    Returns:
+        Boolean indicating success or failure
+    """
+    try:
+        if isinstance(data, pd.DataFrame):
+            records = _replace_missing(data).to_dict(orient='records')
+        elif data and isinstance(data[0], (RawProduct, Product)):
+            records = [record.to_dict() for record in data]
+        else:
+            records = data
+            
+        with open(file_path, 'a' if append else 'w') as file:
+            for record in records:
+                file.write(json.dumps(record))
+                file.write('\n')
+            
+        print(f"Data successfully saved to {file_path}")
+        return True
+    except Exception as e:
+        print(f"Error saving data to JSON Lines: {e}")
+        return False
+
+
+def save_to_csv(data, file_path="products.csv", append=False):
     """
     Save transformed data to a CSV file
     
     Args:
-        data: List of transformed product dictionaries or DataFrame
+        data: List of transformed product records/dictionaries or DataFrame
         file_path: Path to save the CSV file
+        append: Append rows without a header instead of overwriting the file
     
     Returns:
         Boolean indicating success or failure
     """
     try:
         # Convert list of dictionaries to DataFrame if needed
-        if not isinstance(data, pd.DataFrame):
-            df_to_save = pd.DataFrame(data)
-        else:
+        if isinstance(data, pd.DataFrame):
             df_to_save = data
+        elif data and isinstance(data[0], (RawProduct, Product)):
+            df_to_save = records_to_DataFrame(data)
+        else:
+            df_to_save = pd.DataFrame(data)
             
         # Save the DataFrame to CSV
-        df_to_save.to_csv(file_path, index=False)
+        if append:
+            df_to_save.to_csv(file_path, mode='a', header=False, index=False)
+        else:
+            df_to_save.to_csv(file_path, index=False)
             
         print(f"Data successfully saved to {file_path}")
         return True
     except Exception as e:
         print(f"Error saving data to CSV: {e}")
         return False
+
+
+GOOGLE_SHEETS_SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
+# HTTP statuses retried with exponential backoff (quota exceeded, transient server errors)
+RETRYABLE_SHEETS_STATUSES = (429, 500, 502, 503)
+
+
+def _build_sheets_service(credentials_path):
+    """Create a Sheets API client from a service account key file."""
+    from google.oauth2.service_account import Credentials
+    from googleapiclient.discovery import build
+
+    credentials = Credentials.from_service_account_file(credentials_path, scopes=GOOGLE_SHEETS_SCOPES)
+    return build("sheets", "v4", credentials=credentials, cache_discovery=False)
+
+
+def _column_letter(index):
+    """Return the A1 column letter of a 1-based column index (1 -> A, 27 -> AA)."""
+    letters = ""
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
+
+
+def _execute_with_backoff(request, max_retries=5, base_delay=1.0):
+    """Execute a Sheets API request, retrying quota and transient errors with exponential backoff."""
+    for attempt in range(max_retries + 1):
+        try:
+            return request.execute()
+        except Exception as e:
+            status = getattr(getattr(e, "resp", None), "status", None)
+            if status not in RETRYABLE_SHEETS_STATUSES or attempt == max_retries:
+                raise
+            delay = base_delay * 2 ** attempt + random.uniform(0, base_delay)
+            print(f"Sheets API returned {status}, retrying in {delay:.1f}s")
+            time.sleep(delay)
+
+
+def _load_sheets_state(state_path, spreadsheet_id, sheet_name):
+    if not state_path or not os.path.exists(state_path):
+        return None
+    with open(state_path) as file:
+        state = json.load(file)
+    if state.get("spreadsheet_id") != spreadsheet_id or state.get("sheet_name") != sheet_name:
+        return None
+    return state
+
+
+def save_to_google_sheets(data, spreadsheet_id, sheet_name="Sheet1", credentials_path=None, service=None,
+                          state_path=None, block_rows=1000, request_rows=20000, max_retries=5):
+    """
+    Save transformed data to a Google Sheets worksheet
+    
+    Rows (with a header row) are split into blocks of block_rows rows. Blocks
+    are written with values.batchUpdate, many blocks per request. With a
+    state_path, a hash of every block written is kept between runs and only
+    the blocks whose content changed are sent again. Rows and columns left
+    over from a longer or wider previous upload are cleared. Quota (429) and transient server
+    errors are retried with exponential backoff.
+    
+    Args:
+        data: List of transformed product records/dictionaries or DataFrame
+        spreadsheet_id: ID of the target spreadsheet
+        sheet_name: Worksheet (tab) name
+        credentials_path: Service account key file (used when service is None)
+        service: Sheets API client from googleapiclient.discovery.build (optional)
+        state_path: JSON file with the block hashes of the previous upload (optional)
+        block_rows: Rows per diffed range
+        request_rows: Maximum rows sent in one batchUpdate request
+        max_retries: Retries per request on quota or server errors
+    
+    Returns:
+        Boolean indicating success or failure
+    """
+    try:
+        if isinstance(data, pd.DataFrame):
+            df = data
+        elif data and isinstance(data[0], (RawProduct, Product)):
+            df = records_to_DataFrame(data)
+        else:
+            df = pd.DataFrame(data)
+
+        # Missing values become "" so the cell is cleared; the API leaves the old value in place for a null
+        rows = [list(map(str, df.columns))] + df.astype(object).where(df.notna(), "").values.tolist()
+        last_column = _column_letter(max(1, len(df.columns)))
+
+        blocks = []
+        for start in range(0, len(rows), block_rows):
+            block = rows[start:start + block_rows]
+            digest = hashlib.sha1(json.dumps(block, default=str).encode("utf-8")).hexdigest()
+            blocks.append((start, block, digest))
+
+        state = _load_sheets_state(state_path, spreadsheet_id, sheet_name)
+        previous_hashes = state["blocks"] if state and state.get("last_column") == last_column else []
+        changed = [
+            (start, block) for index, (start, block, digest) in enumerate(blocks)
+            if index >= len(previous_hashes) or previous_hashes[index] != digest
+        ]
+
+        if service is None:
+            service = _build_sheets_service(credentials_path)
+        values_api = service.spreadsheets().values()
+
+        # Several changed blocks per request, up to request_rows rows each
+        batches = []
+        batch_rows = request_rows
+        for start, block in changed:
+            if batch_rows + len(block) > request_rows:
+                batches.append([])
+                batch_rows = 0
+            batches[-1].append({
+                "range": f"'{sheet_name}'!A{start + 1}:{last_column}{start + len(block)}",
+                "values": block,
+            })
+            batch_rows += len(block)
+
+        for batch in batches:
+            body = {"valueInputOption": "RAW", "data": batch}
+            _execute_with_backoff(values_api.batchUpdate(spreadsheetId=spreadsheet_id, body=body),
+                                  max_retries=max_retries)
+
+        # Clear rows left over from a longer previous upload (or unknown content without state)
+        leftover = []
+        if state is None or state.get("rows", 0) > len(rows):
+            leftover.append(f"'{sheet_name}'!A{len(rows) + 1}:ZZ")
+        # ... and columns left over from a wider one (e.g. after the rate columns were dropped)
+        previous_column = (state or {}).get("last_column", last_column)
+        if (len(previous_column), previous_column) > (len(last_column), last_column):
+            first_leftover = _column_letter(len(df.columns) + 1)
+            leftover.append(f"'{sheet_name}'!{first_leftover}1:{previous_column}{len(rows)}")
+        if leftover:
+            body = {"ranges": leftover}
+            _execute_with_backoff(values_api.batchClear(spreadsheetId=spreadsheet_id, body=body),
+                                  max_retries=max_retries)
+
+        if state_path:
+            new_state = {
+                "spreadsheet_id": spreadsheet_id,
+                "sheet_name": sheet_name,
+                "last_column": last_column,
+                "rows": len(rows),
+                "blocks": [digest for _, _, digest in blocks],
+            }
+            tmp_path = f"{state_path}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(new_state, file)
+            os.replace(tmp_path, state_path)
+
+        print(f"Data successfully saved to Google Sheets ({len(changed)} of {len(blocks)} ranges updated)")
+        return True
+    except Exception as e:
+        print(f"Error saving data to Google Sheets: {e}")
+        return False
@@ -0,0 +1,96 @@
+import functools
+from collections import namedtuple
+
+# Same fields as functools.lru_cache's cache_info()
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Cache name -> object with cache_info() / cache_clear()
+_CACHES = {}
+
+
+def memoized(name, maxsize=4096):
+    """
+    Decorator: bounded LRU memoization of a pure parser, registered under name.
+
+    Catalog values repeat across thousands of cards, so caching the parse of
+    each distinct string makes the cost scale with distinct values instead
+    of rows.
+    """
+    def decorator(func):
+        cached = functools.lru_cache(maxsize=maxsize)(func)
+        _CACHES[name] = cached
+        return cached
+    return decorator
+
+
+class StringInterner:
+    """
+    Map equal strings to one shared instance, with hit/miss counters.
+
+    Unlike sys.intern the table is bounded: once it holds maxsize strings,
+    new values are passed through unchanged, so a high-cardinality column
+    cannot grow it without limit. Meant for low-cardinality values such as
+    sizes and genders, which fill the table within the first page.
+    """
+
+    def __init__(self, name, maxsize=1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._table = {}
+        _CACHES[name] = self
+
+    def __call__(self, value):
+        if value is None:
+            return None
+        shared = self._table.get(value)
+        if shared is not None:
+            self.hits += 1
+            return shared
+        self.misses += 1
+        if len(self._table) < self.maxsize:
+            self._table[value] = value
+        return value
+
+    def cache_info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._table))
+
+    def cache_clear(self):
+        self.hits = self.misses = 0
+        self._table.clear()
+
+
+def cache_stats():
+    """
+    Hit-rate counters of every registered parser cache and interner.
+
+    Returns:
+        Dictionary of cache name -> dict with hits, misses, hit_rate, size and maxsize
+    """
+    stats = {}
+    for name, cache in _CACHES.items():
+        info = cache.cache_info()
+        lookups = info.hits + info.misses
+        stats[name] = {
+            "hits": info.hits,
+            "misses": info.misses,
+            "hit_rate": info.hits / lookups if lookups else 0.0,
+            "size": info.currsize,
+            "maxsize": info.maxsize,
+        }
+    return stats
+
+
+def format_cache_stats(stats=None):
+    """One summary line per cache that was used, e.g. "parse_price: 97.5% hits (1560/1600)"."""
+    stats = cache_stats() if stats is None else stats
+    return [
+        f"{name}: {entry['hit_rate']:.1%} hits ({entry['hits']}/{entry['hits'] + entry['misses']})"
+        for name, entry in stats.items() if entry["hits"] + entry["misses"]
+    ]
+
+
+def clear_caches():
+    """Empty every registered cache and reset its counters."""
+    for cache in _CACHES.values():
+        cache.cache_clear()
@@ -0,0 +1,243 @@
+import time
+import queue
+import threading
+
+# Marks the end of a stage's input stream
+_DONE = object()
+
+
+def _item_rows(item):
+    """Number of rows carried by an item (DataFrame/list length, otherwise 1)."""
+    try:
+        return len(item)
+    except TypeError:
+        return 1
+
+
+class Stage:
+    """
+    One step of a Pipeline: a source, a transform, or a sink.
+
+    A stage reads items from a bounded input queue with `workers` threads and
+    passes each result to every downstream stage. When a downstream queue is
+    full, put() blocks, so a slow sink slows its producers down instead of
+    letting them buffer the whole catalog.
+    """
+
+    def __init__(self, name, func=None, source=None, workers=1, queue_size=8, on_close=None):
+        self.name = name
+        self.func = func
+        self.source = source
+        self.workers = 1 if source is not None else workers
+        self.queue = None if source is not None else queue.Queue(maxsize=queue_size)
+        self.on_close = on_close
+        self.downstream = []
+
+        self._lock = threading.Lock()
+        self._running_workers = self.workers
+        self.items_in = 0
+        self.rows_in = 0
+        self.items_out = 0
+        self.rows_out = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.started_at = None
+        self.finished_at = None
+
+    def _emit(self, item):
+        if item is None:
+            return
+        with self._lock:
+            self.items_out += 1
+            self.rows_out += _item_rows(item)
+        for stage in self.downstream:
+            stage.queue.put(item)
+
+    def _record_error(self, error):
+        with self._lock:
+            self.errors += 1
+        print(f"[pipeline] Error in stage {self.name}: {error}")
+
+    def _run_source(self):
+        iterator = iter(self.source())
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                break
+            except Exception as e:
+                self._record_error(e)
+                break
+            finally:
+                self.busy_seconds += time.perf_counter() - started
+            self._emit(item)
+
+    def _run_worker(self):
+        while True:
+            item = self.queue.get()
+            if item is _DONE:
+                break
+            with self._lock:
+                self.items_in += 1
+                self.rows_in += _item_rows(item)
+            started = time.perf_counter()
+            try:
+                result = self.func(item)
+            except Exception as e:
+                self._record_error(e)
+                result = None
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.busy_seconds += elapsed
+            self._emit(result)
+
+    def _run(self):
+        try:
+            if self.source is not None:
+                self._run_source()
+            else:
+                self._run_worker()
+        finally:
+            self._finish_worker()
+
+    def _finish_worker(self):
+        with self._lock:
+            self._running_workers -= 1
+            last_worker = self._running_workers == 0
+        if not last_worker:
+            return
+
+        if self.on_close is not None:
+            try:
+                self.on_close()
+            except Exception as e:
+                self._record_error(e)
+        self.finished_at = time.perf_counter()
+        # Each downstream worker stops after receiving one end marker
+        for stage in self.downstream:
+            for _ in range(stage.workers):
+                stage.queue.put(_DONE)
+
+    @property
+    def rows_processed(self):
+        """Rows produced by a source, or rows consumed by any other stage."""
+        return self.rows_out if self.source is not None else self.rows_in
+
+    def throughput(self):
+        """Rows processed per second of wall time since the stage started."""
+        if self.started_at is None:
+            return 0.0
+        elapsed = (self.finished_at or time.perf_counter()) - self.started_at
+        return self.rows_processed / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        return {
+            "items_in": self.items_in,
+            "rows_in": self.rows_in,
+            "items_out": self.items_out,
+            "rows_out": self.rows_out,
+            "rows_processed": self.rows_processed,
+            "errors": self.errors,
+            "busy_seconds": round(self.busy_seconds, 3),
+            "rows_per_second": round(self.throughput(), 1),
+        }
+
+
+class Pipeline:
+    """
+    Small DAG runtime: a source stage fanning out through stages connected by
+    bounded queues, each stage running its own number of worker threads.
+
+    Every stage has exactly one upstream stage, so the graph is a tree rooted
+    at the source (e.g. extract -> transform -> csv/json/postgres).
+    """
+
+    def __init__(self, monitor_interval=None):
+        self.stages = []
+        self.monitor_interval = monitor_interval
+
+    def add_source(self, name, source):
+        """
+        Add the source stage.
+
+        Args:
+            name: Stage name
+            source: Callable returning an iterable of items
+
+        Returns:
+            The created Stage
+        """
+        if any(stage.source is not None for stage in self.stages):
+            raise ValueError("A pipeline has exactly one source stage")
+        stage = Stage(name, source=source)
+        self.stages.append(stage)
+        return stage
+
+    def add_stage(self, name, func, upstream, workers=1, queue_size=8, on_close=None):
+        """
+        Add a stage that processes every item emitted by upstream.
+
+        Args:
+            name: Stage name
+            func: Callable applied to each item; its non-None result is passed downstream
+            upstream: Stage whose output this stage consumes
+            workers: Number of worker threads for this stage
+            queue_size: Capacity of the input queue (backpressure threshold)
+            on_close: Callable run once after the stage has processed its last item
+
+        Returns:
+            The created Stage
+        """
+        if upstream not in self.stages:
+            raise ValueError(f"Unknown upstream stage for {name}")
+        stage = Stage(name, func=func, workers=workers, queue_size=queue_size, on_close=on_close)
+        upstream.downstream.append(stage)
+        self.stages.append(stage)
+        return stage
+
+    def status_line(self):
+        """One-line summary of queue depths and throughput of every stage."""
+        parts = []
+        for stage in self.stages:
+            depth = "" if stage.queue is None else f" q={stage.queue.qsize()}/{stage.queue.maxsize}"
+            parts.append(f"{stage.name}:{depth} {stage.rows_processed} rows ({stage.throughput():.1f}/s)")
+        return " | ".join(parts)
+
+    def _monitor(self, stop_event):
+        while not stop_event.wait(self.monitor_interval):
+            print(f"[pipeline] {self.status_line()}")
+
+    def run(self):
+        """
+        Run every stage until the source is exhausted and all queues are drained.
+
+        Returns:
+            Dictionary of per-stage statistics keyed by stage name
+        """
+        if not any(stage.source is not None for stage in self.stages):
+            raise ValueError("A pipeline needs a source stage")
+
+        threads = []
+        for stage in self.stages:
+            stage.started_at = time.perf_counter()
+            for index in range(stage.workers):
+                thread = threading.Thread(target=stage._run, name=f"{stage.name}-{index}", daemon=True)
+                threads.append(thread)
+
+        stop_event = threading.Event()
+        monitor = None
+        if self.monitor_interval:
+            monitor = threading.Thread(target=self._monitor, args=(stop_event,), daemon=True)
+            monitor.start()
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stop_event.set()
+        if monitor is not None:
+            monitor.join()
+
+        return {stage.name: stage.stats() for stage in self.stages}
@@ -0,0 +1,184 @@
+import os
+import time
+import pstats
+import cProfile
+import functools
+import importlib
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Stage name -> (module, function) pairs profiled under that stage
+PROFILE_TARGETS = {
+    "fetching_content": [("utils.extract", "fetching_content")],
+    "parse": [("utils.extract", "make_soup")],
+    "extract_product_data": [("utils.extract", "extract_product_data")],
+    "transform": [
+        ("utils.transform", "transform_data"),
+        ("utils.transform", "transform_to_DataFrame"),
+        ("utils.transform", "optimize_dtypes"),
+    ],
+    "dedup": [("utils.dedup", "drop_duplicate_products")],
+    "csv": [("utils.load", "save_to_csv")],
+    "json": [("utils.load", "save_to_json")],
+    "postgres": [
+        ("utils.load", "store_to_postgre"),
+        ("utils.load", "parallel_store_to_postgre"),
+        ("utils.backends", "store_to_database"),
+    ],
+    "sheets": [("utils.load", "save_to_google_sheets")],
+    "dataset": [("utils.dataset", "write_partitioned")],
+}
+
+# Paths carrying less time than this (seconds) are left out of the collapsed stacks
+_MIN_STACK_SECONDS = 1e-6
+_MAX_STACK_DEPTH = 64
+
+
+def _label(func):
+    filename, lineno, name = func
+    if filename == "~":  # built-in
+        return name
+    return f"{name} ({os.path.basename(filename)}:{lineno})"
+
+
+def collapsed_stacks(stats):
+    """
+    Convert profile statistics to collapsed stacks ("a;b;c <microseconds>").
+
+    cProfile only records caller -> callee edges, so a function's self time
+    is split over its call paths in proportion to the time each caller spent
+    in it. The output loads in flamegraph.pl, speedscope and similar tools.
+
+    Args:
+        stats: pstats.Stats instance
+
+    Returns:
+        List of collapsed stack lines, hottest first
+    """
+    entries = stats.stats
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    totals = defaultdict(float)
+
+    def walk(func, stack, on_stack, fraction):
+        self_time = entries[func][2]
+        stack = stack + (_label(func),)
+        if self_time * fraction >= _MIN_STACK_SECONDS:
+            totals[";".join(stack)] += self_time * fraction
+        if len(stack) >= _MAX_STACK_DEPTH:
+            return
+        for callee, edge_time in callees.get(func, {}).items():
+            callee_total = entries[callee][3]
+            if callee in on_stack or not callee_total:
+                continue
+            share = fraction * edge_time / callee_total
+            if share * callee_total >= _MIN_STACK_SECONDS:
+                walk(callee, stack, on_stack | {callee}, share)
+
+    for func, (_, _, _, _, callers) in entries.items():
+        if not callers:
+            walk(func, (), {func}, 1.0)
+
+    lines = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [f"{stack} {round(seconds * 1e6)}" for stack, seconds in lines if round(seconds * 1e6)]
+
+
+class StageProfiler:
+    """
+    Profile each ETL stage with its own cProfile.Profile.
+
+    Stage functions are wrapped in place (see installed()). Only one stage
+    profiler is active at a time: entering a nested stage pauses the outer
+    one, so every function's time (and the printed stage seconds) is
+    counted in exactly one stage report. Profiling is per thread, so it is
+    meant for the sequential run, not --pipeline.
+    """
+
+    def __init__(self, output_dir, targets=None, top=15):
+        self.output_dir = output_dir
+        self.targets = PROFILE_TARGETS if targets is None else targets
+        self.top = top
+        self.profiles = {}
+        self.calls = defaultdict(int)
+        self.seconds = defaultdict(float)
+        self._stack = []
+
+    @contextmanager
+    def profile(self, stage):
+        """Profile the enclosed block under stage, pausing the enclosing stage."""
+        if self._stack and self._stack[-1][0] == stage:
+            yield
+            return
+
+        profile = self.profiles.setdefault(stage, cProfile.Profile())
+        if self._stack:
+            self.profiles[self._stack[-1][0]].disable()
+        # [stage, seconds spent in nested stages]
+        frame = [stage, 0.0]
+        self._stack.append(frame)
+        started = time.perf_counter()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            elapsed = time.perf_counter() - started
+            self.seconds[stage] += elapsed - frame[1]
+            self.calls[stage] += 1
+            self._stack.pop()
+            if self._stack:
+                self._stack[-1][1] += elapsed
+                self.profiles[self._stack[-1][0]].enable()
+
+    def wrap(self, stage, func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with self.profile(stage):
+                return func(*args, **kwargs)
+        return wrapper
+
+    @contextmanager
+    def installed(self):
+        """Replace the target functions by profiled wrappers, restoring them on exit."""
+        originals = []
+        try:
+            for stage, functions in self.targets.items():
+                for module_name, attribute in functions:
+                    module = importlib.import_module(module_name)
+                    original = getattr(module, attribute)
+                    originals.append((module, attribute, original))
+                    setattr(module, attribute, self.wrap(stage, original))
+            yield self
+        finally:
+            for module, attribute, original in reversed(originals):
+                setattr(module, attribute, original)
+
+    def write_reports(self):
+        """
+        Write <stage>.pstats and <stage>.collapsed for every profiled stage.
+
+        Returns:
+            Dictionary of stage name -> pstats.Stats
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        results = {}
+        for stage, profile in self.profiles.items():
+            stats = pstats.Stats(profile)
+            stats.dump_stats(os.path.join(self.output_dir, f"{stage}.pstats"))
+            with open(os.path.join(self.output_dir, f"{stage}.collapsed"), "w") as file:
+                for line in collapsed_stacks(stats):
+                    file.write(line + "\n")
+            results[stage] = stats
+        return results
+
+    def report(self):
+        """Write the per-stage reports and print each stage's hottest functions."""
+        results = self.write_reports()
+        print(f"\n[profile] Reports written to {self.output_dir}")
+        for stage, stats in sorted(results.items(), key=lambda item: self.seconds[item[0]], reverse=True):
+            print(f"\n[profile] {stage}: {self.calls[stage]} calls, {self.seconds[stage]:.3f}s")
+            stats.sort_stats("tottime").print_stats(self.top)
+        return results
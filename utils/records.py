@@ -0,0 +1,136 @@
+import json
+
+# Column order shared by raw (scraped) and transformed product records
+PRODUCT_COLUMNS = ("Title", "Price", "Rating", "Colors", "Size", "Gender")
+
+
+class _ProductRecord:
+    """
+    Compact, fixed-layout product record.
+
+    Uses __slots__ instead of a per-instance dict so a large crawl does not pay
+    for a hash table and six repeated key strings per product. Records still
+    support read access by column name (record["Title"], record.get("Price"))
+    so callers written against the old dict-based records keep working.
+    """
+
+    __slots__ = ("title", "price", "rating", "colors", "size", "gender")
+
+    _SLOTS = __slots__
+    # Maps DataFrame column names to slot names
+    _COLUMN_TO_SLOT = dict(zip(PRODUCT_COLUMNS, _SLOTS))
+
+    def __init__(self, title=None, price=None, rating=None, colors=None, size=None, gender=None):
+        self.title = title
+        self.price = price
+        self.rating = rating
+        self.colors = colors
+        self.size = size
+        self.gender = gender
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a dictionary keyed by column name."""
+        return cls(*(data.get(column) for column in PRODUCT_COLUMNS))
+
+    def __getitem__(self, column):
+        try:
+            return getattr(self, self._COLUMN_TO_SLOT[column])
+        except KeyError:
+            raise KeyError(column) from None
+
+    def __contains__(self, column):
+        return column in self._COLUMN_TO_SLOT
+
+    def get(self, column, default=None):
+        slot = self._COLUMN_TO_SLOT.get(column)
+        return default if slot is None else getattr(self, slot)
+
+    def keys(self):
+        return PRODUCT_COLUMNS
+
+    def values(self):
+        return tuple(getattr(self, slot) for slot in self._SLOTS)
+
+    def items(self):
+        return tuple(zip(PRODUCT_COLUMNS, self.values()))
+
+    def to_dict(self):
+        return dict(self.items())
+
+    def __eq__(self, other):
+        if isinstance(other, _ProductRecord):
+            return type(self) is type(other) and self.values() == other.values()
+        if isinstance(other, dict):
+            return self.to_dict() == other
+        return NotImplemented
+
+    def __repr__(self):
+        fields = ", ".join(f"{slot}={getattr(self, slot)!r}" for slot in self._SLOTS)
+        return f"{type(self).__name__}({fields})"
+
+
+class RawProduct(_ProductRecord):
+    """Product as scraped from a catalog card; every field is a string or None."""
+
+    __slots__ = ()
+
+
+class Product(_ProductRecord):
+    """Transformed product: Price/Rating are floats, Colors is an int or None."""
+
+    __slots__ = ()
+
+
+def records_to_DataFrame(records):
+    """
+    Convert a list of product records (or dictionaries) to a DataFrame in one
+    columnar step instead of going through pandas' list-of-dicts constructor.
+
+    Args:
+        records: List of RawProduct/Product records or product dictionaries
+
+    Returns:
+        pandas DataFrame with the PRODUCT_COLUMNS columns
+    """
+    import pandas as pd
+
+    rows = [
+        record.values() if isinstance(record, _ProductRecord)
+        else tuple(record.get(column) for column in PRODUCT_COLUMNS)
+        for record in records
+    ]
+    if not rows:
+        return pd.DataFrame(columns=list(PRODUCT_COLUMNS))
+
+    columns = zip(*rows)
+    return pd.DataFrame(dict(zip(PRODUCT_COLUMNS, columns)))
+
+
+def save_raw_products(records, file_path):
+    """
+    Write scraped records to a JSON Lines file without importing pandas, so an
+    extract-only run stays light.
+
+    Args:
+        records: List of RawProduct records or product dictionaries
+        file_path: Output .jsonl path (overwritten)
+    """
+    with open(file_path, "w", encoding="utf-8") as file:
+        for record in records:
+            data = record.to_dict() if isinstance(record, _ProductRecord) else record
+            file.write(json.dumps(data, ensure_ascii=False) + "\n")
+
+
+def load_raw_products(file_path):
+    """
+    Read records written by save_raw_products.
+
+    Args:
+        file_path: .jsonl path
+
+    Returns:
+        List of RawProduct records
+    """
+    with open(file_path, encoding="utf-8") as file:
+        return [RawProduct.from_dict(json.loads(line)) for line in file if line.strip()]
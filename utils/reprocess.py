@@ -0,0 +1,124 @@
+import os
+import pandas as pd
+
+from utils.transform import transform_to_DataFrame, clean_existing_dataframe
+from utils.load import store_to_postgre, parallel_store_to_postgre, save_to_csv, save_to_jsonl
+
+JSON_LINES_EXTENSIONS = (".jsonl", ".ndjson")
+
+
+def iter_file_chunks(file_path, chunksize=100_000):
+    """
+    Read an existing products file in chunks of at most chunksize rows.
+
+    CSV and JSON Lines files are streamed. A JSON array file (the format
+    written by save_to_json) cannot be streamed by pandas, so it is read
+    once and then split into chunks.
+
+    Args:
+        file_path: Path to a .csv, .jsonl/.ndjson or .json file
+        chunksize: Maximum number of rows per chunk
+
+    Yields:
+        pandas DataFrame chunks
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+
+    if extension == ".csv":
+        with pd.read_csv(file_path, chunksize=chunksize) as reader:
+            yield from reader
+    elif extension in JSON_LINES_EXTENSIONS:
+        with pd.read_json(file_path, lines=True, chunksize=chunksize) as reader:
+            yield from reader
+    elif extension == ".json":
+        print(f"{file_path} is a JSON array and is loaded in full; use JSON Lines for bounded memory")
+        df = pd.read_json(file_path)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize].copy()
+    else:
+        raise ValueError(f"Unsupported file type for reprocessing: {file_path}")
+
+
+def _is_raw_chunk(chunk):
+    """Check whether a chunk holds scraped (untransformed) data such as "$100.00" prices."""
+    price = chunk["Price"]
+    if pd.api.types.is_numeric_dtype(price.dtype):
+        return False
+    return price.astype(str).str.startswith("$").any()
+
+
+def reprocess_chunk(chunk):
+    """
+    Apply the cleaning/transform rules to one chunk.
+
+    Scraped data is run through the full transform, already transformed
+    data through clean_existing_dataframe.
+
+    Args:
+        chunk: pandas DataFrame read from an existing output file
+
+    Returns:
+        Cleaned pandas DataFrame
+    """
+    if _is_raw_chunk(chunk):
+        records = chunk.astype(object).where(chunk.notna(), None).to_dict(orient="records")
+        return transform_to_DataFrame(records)
+    return clean_existing_dataframe(chunk, inplace=True)
+
+
+def reprocess_file(input_path, csv_path=None, jsonl_path=None, connection_params=None,
+                   table_name="products", chunksize=100_000, postgres_workers=1):
+    """
+    Stream an existing products file through the cleaning rules into the sinks.
+
+    Only one chunk is held in memory at a time, so multi-GB backfills can be
+    re-cleaned with bounded memory.
+
+    Args:
+        input_path: Existing products.csv / JSON Lines / JSON file
+        csv_path: Output CSV file (skipped if None)
+        jsonl_path: Output JSON Lines file (skipped if None)
+        connection_params: PostgreSQL connection parameters (skipped if None)
+        table_name: Target PostgreSQL table
+        chunksize: Number of rows read per chunk
+        postgres_workers: Connections used to load each chunk (see parallel_store_to_postgre)
+
+    Returns:
+        Dictionary with chunks, rows_read, rows_written and failed_chunks counts
+    """
+    input_abspath = os.path.abspath(input_path)
+    for output_path in (csv_path, jsonl_path):
+        if output_path and os.path.abspath(output_path) == input_abspath:
+            raise ValueError(f"Output {output_path} would overwrite the input file while it is read")
+
+    stats = {"chunks": 0, "rows_read": 0, "rows_written": 0, "failed_chunks": 0}
+    append = False
+
+    for chunk in iter_file_chunks(input_path, chunksize):
+        stats["chunks"] += 1
+        stats["rows_read"] += len(chunk)
+
+        cleaned = reprocess_chunk(chunk)
+        if cleaned.empty:
+            continue
+
+        results = []
+        if csv_path:
+            # The first chunk writes the header, later chunks are appended
+            results.append(save_to_csv(cleaned, csv_path, append=append))
+        if jsonl_path:
+            results.append(save_to_jsonl(cleaned, jsonl_path, append=append))
+        if connection_params is not None and postgres_workers > 1:
+            results.append(parallel_store_to_postgre(
+                cleaned, table_name=table_name, connection_params=connection_params, workers=postgres_workers
+            ) is not None)
+        elif connection_params is not None:
+            results.append(store_to_postgre(cleaned, table_name=table_name, connection_params=connection_params))
+        append = True
+
+        if all(results):
+            stats["rows_written"] += len(cleaned)
+        else:
+            stats["failed_chunks"] += 1
+
+    return stats
@@ -0,0 +1,112 @@
+import time
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; only the in-process overlap guard is used there
+    fcntl = None
+
+
+class RunLock:
+    """
+    Non-blocking guard against overlapping ETL runs.
+
+    Always guards runs within this process. With a lock_path on POSIX systems
+    it also takes an exclusive flock on that file; main.py takes the same
+    lock file for the daemon and for run, replay and crawl-coordinator, so a
+    cron-launched `python main.py` and a daemon never load concurrently.
+    """
+
+    def __init__(self, lock_path=None):
+        self.lock_path = lock_path
+        self._thread_lock = threading.Lock()
+        self._file = None
+
+    def acquire(self):
+        """Try to take the lock; returns False if another run holds it."""
+        if not self._thread_lock.acquire(blocking=False):
+            return False
+        if self.lock_path is None or fcntl is None:
+            return True
+
+        lock_file = open(self.lock_path, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            self._thread_lock.release()
+            return False
+        self._file = lock_file
+        return True
+
+    def release(self):
+        if self._file is not None:
+            fcntl.flock(self._file, fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+        self._thread_lock.release()
+
+
+def run_scheduled(job, interval, stop_event=None, max_runs=None, lock=None, run_immediately=True):
+    """
+    Run job every `interval` seconds in the current (long-running) process.
+
+    Runs never overlap: if a run takes longer than the interval, the missed
+    ticks are skipped rather than queued, and a run is skipped when the lock
+    is held elsewhere. Exceptions raised by the job are reported and the
+    schedule continues.
+
+    Args:
+        job: Callable without arguments
+        interval: Seconds between the starts of consecutive runs
+        stop_event: threading.Event that stops the loop when set (optional)
+        max_runs: Stop after this many ticks (default: run until stopped)
+        lock: RunLock used to prevent overlapping runs (optional)
+        run_immediately: Run once at start instead of waiting one interval
+
+    Returns:
+        Dictionary with runs, failures, skipped_overlap and skipped_missed counts
+    """
+    if interval <= 0:
+        raise ValueError("interval must be positive")
+    if stop_event is None:
+        stop_event = threading.Event()
+    if lock is None:
+        lock = RunLock()
+
+    stats = {"runs": 0, "failures": 0, "skipped_overlap": 0, "skipped_missed": 0}
+    ticks = 0
+    next_run = time.monotonic() if run_immediately else time.monotonic() + interval
+
+    while not stop_event.is_set():
+        wait = next_run - time.monotonic()
+        if wait > 0 and stop_event.wait(wait):
+            break
+
+        ticks += 1
+        if lock.acquire():
+            try:
+                stats["runs"] += 1
+                job()
+            except Exception as e:
+                stats["failures"] += 1
+                print(f"[scheduler] Scheduled run failed: {e}")
+            finally:
+                lock.release()
+        else:
+            stats["skipped_overlap"] += 1
+            print("[scheduler] Previous run still active, skipping this tick")
+
+        if max_runs is not None and ticks >= max_runs:
+            break
+
+        # Skip ticks that passed while the job was running
+        next_run += interval
+        now = time.monotonic()
+        if next_run <= now:
+            missed = int((now - next_run) // interval) + 1
+            stats["skipped_missed"] += missed
+            next_run += missed * interval
+
+    return stats
+
@@ -1,7 +1,15 @@
 import re
+from array import array
 import pandas as pd
 import numpy as np
 
+from utils.records import Product, PRODUCT_COLUMNS
+from utils.memo import memoized, StringInterner
+from utils.exchange import resolve_rate
+
+# Columns added by the batch currency conversion
+RATE_COLUMNS = ("Exchange_Rate", "Rate_Timestamp")
+
 # Define dirty patterns for data cleaning
 DIRTY_PATTERNS = {
     "Title": ["Unknown Product", "No title", "", None],  # Added empty string
@@ -9,151 +17,328 @@ DIRTY_PATTERNS = {
     "Price": ["Price Unavailable", "Price Not Found", None]
 }
 
-def transform_data(data_list):
+_PRICE_PATTERN = re.compile(r'\$([\d,]+\.?\d*)')
+_RATING_PATTERN = re.compile(r'(\d+\.?\d*)')
+_COLORS_PATTERN = re.compile(r'(\d+)')
+
+# Size and Gender have a handful of distinct values; share one string object per value
+intern_size = StringInterner("transform_size")
+intern_gender = StringInterner("transform_gender")
+
+@memoized("parse_price")
+def parse_price(price):
+    """
+    Parse a scraped price string such as "$1,234.56" into its USD value.
+    
+    Returns:
+        float, or None for missing, placeholder or unparseable prices
+    """
+    if not price or price in DIRTY_PATTERNS["Price"]:
+        return None
+    price_match = _PRICE_PATTERN.search(price)
+    if not price_match:
+        return None
+    try:
+        # Remove commas for numbers like $1,234.56
+        return float(price_match.group(1).replace(',', ''))
+    except ValueError:
+        return None
+
+@memoized("parse_rating")
+def parse_rating(rating):
+    """Parse a rating string such as "⭐ 4.8 / 5" into a float (None if invalid)."""
+    if not rating or rating in DIRTY_PATTERNS["Rating"]:
+        return None
+    rating_match = _RATING_PATTERN.search(rating)
+    if not rating_match:
+        return None
+    try:
+        return float(rating_match.group(1))
+    except ValueError:
+        return None
+
+@memoized("parse_colors", maxsize=256)
+def parse_colors(colors):
+    """Parse a colors string such as "3 Colors" into an int (None if invalid)."""
+    if not colors:
+        return None
+    colors_match = _COLORS_PATTERN.search(colors)
+    return int(colors_match.group(1)) if colors_match else None
+
+def _transform_fields(product):
     """
-    Transform a list of product dictionaries according to requirements
+    Transform the fields of a single scraped product.
+    
+    Price, Rating and Colors go through the memoized parsers, so each
+    distinct string is only parsed once per process. The price is returned
+    in USD; conversion to IDR is applied to the whole batch afterwards.
     
     Args:
-        data_list: List of product dictionaries from web scraping
+        product: RawProduct record (or product dictionary) from web scraping
         
     Returns:
-        List of transformed product dictionaries with no empty titles or NaN prices
+        Tuple of (title, price, rating, colors, size, gender) or None if the
+        product has to be skipped because of an invalid title or price
     """
+    # Transform Title - handle missing/invalid titles
+    title = (product.get("Title") or "").strip()  # Get title with default empty string and strip whitespace
+    if not title or title in DIRTY_PATTERNS["Title"]:
+        # Skip products with missing titles instead of adding them with None value
+        return None
+        
+    # Transform Price - USD value, converted to IDR per batch
+    price_value = parse_price(product.get("Price"))
+    if price_value is None:
+        # Skip products with missing or unparseable prices
+        return None
+        
+    # Size and Gender are already cleaned during extraction, just copy (interned)
+    return (title, price_value, parse_rating(product.get("Rating")), parse_colors(product.get("Colors")),
+            intern_size(product.get("Size")), intern_gender(product.get("Gender")))
+
+def transform_data(data_list, rate=None):
+    """
+    Transform a list of scraped products according to requirements
+    
+    Args:
+        data_list: List of RawProduct records (or product dictionaries) from web scraping
+        rate: ExchangeRate used to convert prices to IDR (default: resolve_rate())
+        
+    Returns:
+        List of Product records with no empty titles or NaN prices
+    """
+    if rate is None:
+        rate = resolve_rate()
     transformed_list = []
     
     for product in data_list:
-        transformed_product = {}
-        
-        # Transform Title - handle missing/invalid titles
-        title = product.get("Title", "").strip()  # Get title with default empty string and strip whitespace
-        if title and title not in DIRTY_PATTERNS["Title"]:
-            transformed_product["Title"] = title
-        else:
-            # Skip products with missing titles instead of adding them with None value
-            continue
-            
-        # Transform Price - convert to IDR
-        price = product.get("Price")
-        if price and price not in DIRTY_PATTERNS["Price"]:
-            # Extract numeric value and convert to IDR
-            price_match =  re.search(r'\$([\d,]+\.?\d*)', price)
-            if price_match:
-                try:
-                    # Remove commas for numbers like $1,234.56
-                    price_str = price_match.group(1).replace(',', '')
-                    price_value = float(price_str)
-                    transformed_product["Price"] = price_value * 16000  # Convert to IDR
-                except ValueError:
-                    # Skip products with invalid prices
-                    continue
-            else:
-                # Skip products with unparseable prices
-                continue
-        else:
-            # Skip products with missing prices
-            continue
-            
-        # Transform Rating - convert to float
-        rating = product.get("Rating")
-        if rating and rating not in DIRTY_PATTERNS["Rating"]:
-            # Extract numeric rating using regex
-            rating_match = re.search(r'(\d+\.?\d*)', rating)
-            if rating_match:
-                try:
-                    transformed_product["Rating"] = float(rating_match.group(1))
-                except ValueError:
-                    transformed_product["Rating"] = None
-            else:
-                transformed_product["Rating"] = None
-        else:
-            transformed_product["Rating"] = None
-            
-        # Transform Colors - extract numeric value
-        colors = product.get("Colors")
-        if colors:
-            colors_match = re.search(r'(\d+)', colors)
-            if colors_match:
-                transformed_product["Colors"] = int(colors_match.group(1))
-            else:
-                transformed_product["Colors"] = None
+        fields = _transform_fields(product)
+        if fields is not None:
+            title, price, *rest = fields
+            transformed_list.append(Product(title, price * rate.rate, *rest))
+    
+    return transformed_list
+
+class ProductFrameBuilder:
+    """
+    Accumulate transformed products column by column into typed buffers.
+    
+    Price and Rating go into float64 arrays, Colors into an int64 array plus a
+    missing-value mask, and the string columns into plain lists. build() wraps
+    the numeric buffers without copying them, so no intermediate list of dicts
+    (or of records) is needed to produce the DataFrame. Because the DataFrame
+    shares those buffers, a builder cannot be appended to after build().
+    """
+
+    def __init__(self):
+        self._titles = []
+        self._prices = array("d")
+        self._ratings = array("d")
+        self._colors = array("q")
+        self._colors_missing = bytearray()
+        self._sizes = []
+        self._genders = []
+
+    def __len__(self):
+        return len(self._titles)
+
+    def append(self, title, price, rating, colors, size, gender):
+        """Append one transformed product."""
+        self._titles.append(title)
+        self._prices.append(price)
+        self._ratings.append(np.nan if rating is None else rating)
+        if colors is None:
+            self._colors.append(0)
+            self._colors_missing.append(1)
         else:
-            transformed_product["Colors"] = None
-            
-        # Transform Size - already cleaned during extraction, just copy
-        size = product.get("Size")
-        transformed_product["Size"] = size
+            self._colors.append(colors)
+            self._colors_missing.append(0)
+        self._sizes.append(size)
+        self._genders.append(gender)
+
+    def extend(self, data_list):
+        """
+        Transform scraped products and append the valid ones.
+        
+        Args:
+            data_list: List of RawProduct records (or product dictionaries)
             
-        # Transform Gender - already cleaned during extraction, just copy
-        gender = product.get("Gender")
-        transformed_product["Gender"] = gender
+        Returns:
+            Number of products appended
+        """
+        appended = 0
+        for product in data_list:
+            fields = _transform_fields(product)
+            if fields is not None:
+                self.append(*fields)
+                appended += 1
+        return appended
+
+    def build(self, rate=None):
+        """
+        Build the products DataFrame from the accumulated columns.
         
-        transformed_list.append(transformed_product)
-    
-    return transformed_list
+        Args:
+            rate: ExchangeRate to convert the appended prices with. Prices are
+                converted in one vectorized multiply into a new array (the
+                buffer keeps the appended prices, so build can be called again)
+                and the rate and its timestamp are added as Exchange_Rate and
+                Rate_Timestamp columns. Without a rate, prices are kept as appended.
+        
+        Returns:
+            pandas DataFrame with float64 Price/Rating, nullable Int64 Colors
+            and categorical Size/Gender
+        """
+        columns = list(PRODUCT_COLUMNS) + (list(RATE_COLUMNS) if rate is not None else [])
+        if not self._titles:
+            return pd.DataFrame(columns=columns)
+        
+        prices = np.frombuffer(self._prices, dtype=np.float64)
+        if rate is not None:
+            prices = prices * rate.rate
+        colors = pd.arrays.IntegerArray(
+            np.frombuffer(self._colors, dtype=np.int64),
+            np.frombuffer(self._colors_missing, dtype=np.bool_),
+        )
+        data = {
+            "Title": pd.array(self._titles, dtype=object),
+            "Price": prices,
+            "Rating": np.frombuffer(self._ratings, dtype=np.float64),
+            "Colors": colors,
+            "Size": pd.Categorical(self._sizes),
+            "Gender": pd.Categorical(self._genders),
+        }
+        if rate is not None:
+            rows = len(self._titles)
+            data["Exchange_Rate"] = np.full(rows, rate.rate)
+            # One category, so the timestamp costs one string plus a code per row
+            data["Rate_Timestamp"] = pd.Categorical.from_codes(
+                np.zeros(rows, dtype=np.int8), [rate.timestamp.isoformat()])
+        return pd.DataFrame(data, copy=False)
 
-def transform_to_DataFrame(data_list):
+def transform_to_DataFrame(data_list, rate=None):
     """
     Convert transformed data list to pandas DataFrame
     
     Args:
-        data_list: List of transformed product dictionaries
+        data_list: List of RawProduct records (or product dictionaries) from web scraping
+        rate: ExchangeRate used to convert prices to IDR (default: resolve_rate(),
+            resolved once for the whole batch through its TTL cache)
         
     Returns:
-        pandas DataFrame with transformed data, no empty titles or NaN prices
+        pandas DataFrame with transformed data, no empty titles or NaN prices,
+        and the applied rate in Exchange_Rate / Rate_Timestamp
     """
-    # Transform data
-    transformed_data = transform_data(data_list)
+    if rate is None:
+        rate = resolve_rate()
+    builder = ProductFrameBuilder()
+    builder.extend(data_list)
+    df = builder.build(rate)
     
-    # Convert to DataFrame
-    df = pd.DataFrame(transformed_data)
-    
-    # Additional data cleaning to ensure no NaN values for critical columns
-    if not df.empty:
-        # Drop rows with missing titles or prices (shouldn't happen with the improved transform_data)
-        df = df.dropna(subset=["Title", "Price"])
-        
-        # Check for NaN values as strings in the Price column
-        df = df[~df["Price"].astype(str).str.contains("nan|NaN|NAN")]
+    # Additional check to ensure no NaN/inf prices (shouldn't happen, the price regex only accepts digits)
+    invalid_price = ~np.isfinite(df["Price"].to_numpy(dtype=np.float64))
+    if invalid_price.any():
+        df = df[~invalid_price].reset_index(drop=True)
     
     return df
 
-def clean_existing_dataframe(df):
+def memory_footprint(df):
+    """Return the memory used by a DataFrame in bytes, including string contents."""
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+def optimize_dtypes(df, category_threshold=0.5):
     """
-    Clean an existing DataFrame by removing rows with problematic data patterns.
+    Convert DataFrame columns to compact dtypes before loading.
+    
+    - Low-cardinality string columns (distinct values / rows <= category_threshold) become category
+    - Other string columns become the nullable string dtype
+    - Integer columns are downcast to the smallest nullable Int type
+    - Float columns are downcast to float32 only when that is lossless
     
     Args:
-        df (pandas.DataFrame): DataFrame to clean
+        df (pandas.DataFrame): DataFrame to optimize
+        category_threshold (float): Maximum distinct-value ratio for category conversion
         
     Returns:
-        pandas.DataFrame: Cleaned DataFrame with problematic rows removed
+        pandas.DataFrame: New DataFrame with optimized dtypes
     """
+    optimized = {}
     
-    # Make a copy to avoid modifying the original
-    cleaned_df = df.copy()
-    
-    # There's a contradiction in the test case:
-    # - It expects row 4 with None title and Price 5000 to be kept
-    # - But it also checks that no rows have NaN titles
+    for column in df.columns:
+        series = df[column]
+        dtype = series.dtype
+        
+        if isinstance(dtype, pd.CategoricalDtype):
+            # Drop categories that are no longer used after filtering
+            optimized[column] = series.cat.remove_unused_categories()
+        elif pd.api.types.is_bool_dtype(dtype):
+            optimized[column] = series.astype("boolean")
+        elif pd.api.types.is_integer_dtype(dtype):
+            downcast = pd.to_numeric(series, downcast="integer")
+            if not isinstance(downcast.dtype, pd.api.extensions.ExtensionDtype):
+                downcast = downcast.astype(f"Int{downcast.dtype.itemsize * 8}")
+            optimized[column] = downcast
+        elif pd.api.types.is_float_dtype(dtype):
+            values = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            as_float32 = values.astype(np.float32)
+            if np.array_equal(as_float32.astype(np.float64), values, equal_nan=True):
+                optimized[column] = pd.Series(as_float32, index=series.index)
+            else:
+                optimized[column] = series
+        elif pd.api.types.is_object_dtype(dtype) and pd.api.types.infer_dtype(series, skipna=True) in ("string", "empty"):
+            distinct = series.nunique(dropna=True)
+            if len(series) and distinct / len(series) <= category_threshold:
+                optimized[column] = series.astype("category")
+            else:
+                optimized[column] = series.astype("string")
+        else:
+            optimized[column] = series
     
-    # Let's look at the assertion for row with Price 5000:
-    # self.assertIn(5000, cleaned_df["Price"].values)
+    return pd.DataFrame(optimized, index=df.index)
+
+def clean_existing_dataframe(df, inplace=False):
+    """
+    Clean an existing DataFrame by removing rows with problematic data patterns.
     
-    # First, handle rows with problematic prices
-    # Remove rows with NaN prices
-    cleaned_df = cleaned_df[cleaned_df["Price"].notna()]
+    Rows with a missing or "NaN" string price and rows with an empty title are
+    dropped using a single combined mask; missing titles are replaced with
+    "Unknown Product" so those rows are kept.
     
-    # Remove rows with string "NaN" prices
-    str_nan_price_mask = cleaned_df["Price"].apply(lambda x: isinstance(x, str) and x == "NaN")
-    cleaned_df = cleaned_df[~str_nan_price_mask]
+    Args:
+        df (pandas.DataFrame): DataFrame to clean
+        inplace (bool): Modify df itself instead of returning a cleaned copy
+        
+    Returns:
+        pandas.DataFrame: Cleaned DataFrame with problematic rows removed
+        (df itself when inplace is True)
+    """
+    price = df["Price"]
+    title = df["Title"]
     
-    # For rows with None/NaN titles but valid prices (like row 4),
-    # let's replace the None with a placeholder value to keep the row
-    cleaned_df["Title"] = cleaned_df["Title"].fillna("Unknown Product")
+    # Build one mask for every row-level rule instead of filtering step by step
+    keep = price.notna().to_numpy()
+    if not pd.api.types.is_numeric_dtype(price.dtype):
+        # Only non-numeric columns can hold the string "NaN"
+        keep &= price.ne("NaN").to_numpy(dtype=bool, na_value=True)
+    keep &= title.ne("").to_numpy(dtype=bool, na_value=True)
     
-    # Now filter out empty titles
-    cleaned_df = cleaned_df[cleaned_df["Title"] != ""]
+    if inplace:
+        cleaned_df = df
+        if not keep.all():
+            cleaned_df.reset_index(drop=True, inplace=True)
+            cleaned_df.drop(index=np.flatnonzero(~keep), inplace=True)
+        cleaned_df.reset_index(drop=True, inplace=True)
+    else:
+        # take() copies the kept rows once and, unlike boolean indexing,
+        # does not mark the result as a view of df
+        cleaned_df = df.take(np.flatnonzero(keep))
+        cleaned_df.index = pd.RangeIndex(len(cleaned_df))
     
-    # Reset the index for consistency
-    cleaned_df = cleaned_df.reset_index(drop=True)
+    # Keep rows with a valid price but a missing title under a placeholder name
+    title = cleaned_df["Title"]
+    if title.hasnans:
+        if isinstance(title.dtype, pd.CategoricalDtype) and "Unknown Product" not in title.cat.categories:
+            title = title.cat.add_categories("Unknown Product")
+        cleaned_df["Title"] = title.fillna("Unknown Product")
     
-    return cleaned_df
\ No newline at end of file
+    return cleaned_df
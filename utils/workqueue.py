@@ -0,0 +1,330 @@
+import os
+import time
+import uuid
+import socket
+import sqlite3
+
+import requests
+
+from utils.extract import HEADERS, parse_page, response_body
+from utils.records import save_raw_products, load_raw_products
+
+# Page states: pending -> leased -> done | missing (404 / past the end) | failed (out of attempts)
+PENDING, LEASED, DONE, MISSING, FAILED = "pending", "leased", "done", "missing", "failed"
+
+
+class CrawlQueue:
+    """
+    Shared queue of catalog pages leased to crawl workers.
+
+    Backed by a crawl_pages table in SQLite (sqlite:///path, for a single
+    host or tests) or PostgreSQL (postgresql://..., for several machines).
+    A worker leases one page at a time for lease_seconds; a page whose lease
+    expires (the worker died or hung) can be leased again by anyone.
+    Completing a page only counts if the worker still holds its lease.
+    """
+
+    def __init__(self, url, job="default"):
+        self.url = url
+        self.job = job
+        if url.startswith("sqlite:///"):
+            self.backend = "sqlite"
+            # Autocommit mode; claim() opens its own BEGIN IMMEDIATE transaction
+            self.conn = sqlite3.connect(url[len("sqlite:///"):], timeout=30, isolation_level=None)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            # With WAL, NORMAL only risks the last commits on power loss, never corruption
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        elif url.split("://", 1)[0] in ("postgresql", "postgres"):
+            from utils import load
+
+            self.backend = "postgres"
+            load._import_postgres_driver()
+            self.conn = load.psycopg2.connect(url)
+            self.conn.autocommit = True
+        else:
+            raise ValueError(f"Unsupported queue URL: {url} (use sqlite:///... or postgresql://...)")
+        self._create_table()
+
+    def _execute(self, sql, params=()):
+        if self.backend == "postgres":
+            sql = sql.replace("?", "%s")
+        cursor = self.conn.cursor()
+        cursor.execute(sql, params)
+        return cursor
+
+    def _create_table(self):
+        self._execute("""
+            CREATE TABLE IF NOT EXISTS crawl_pages (
+                job TEXT NOT NULL,
+                page INTEGER NOT NULL,
+                status TEXT NOT NULL,
+                worker TEXT,
+                lease_expires DOUBLE PRECISION,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                products INTEGER,
+                result_path TEXT,
+                error TEXT,
+                updated_at DOUBLE PRECISION,
+                PRIMARY KEY (job, page)
+            )
+        """)
+
+    def enqueue(self, pages):
+        """Add page numbers to the queue; pages already queued are left untouched."""
+        now = time.time()
+        for page in pages:
+            self._execute(
+                "INSERT INTO crawl_pages (job, page, status, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (job, page) DO NOTHING",
+                (self.job, page, PENDING, now),
+            )
+
+    def reset(self):
+        """Remove every page of the job, so the next enqueue starts a fresh crawl."""
+        self._execute("DELETE FROM crawl_pages WHERE job = ?", (self.job,))
+
+    def _begin(self):
+        if self.backend == "postgres":
+            self.conn.autocommit = False
+        else:
+            # Take the write lock up front so two workers cannot select the same page
+            self._execute("BEGIN IMMEDIATE")
+
+    def _end(self, commit=True):
+        if self.backend == "postgres":
+            if commit:
+                self.conn.commit()
+            else:
+                self.conn.rollback()
+            self.conn.autocommit = True
+        else:
+            self._execute("COMMIT" if commit else "ROLLBACK")
+
+    def claim(self, worker, lease_seconds=60):
+        """
+        Lease the lowest pending page, or one whose lease has expired.
+
+        Returns:
+            Tuple (page, attempts) or None if nothing can be leased right now
+        """
+        now = time.time()
+        select = (
+            "SELECT page, attempts FROM crawl_pages WHERE job = ? "
+            "AND (status = ? OR (status = ? AND lease_expires < ?)) ORDER BY page LIMIT 1"
+        )
+        if self.backend == "postgres":
+            # Concurrent workers skip rows another transaction is claiming instead of waiting
+            select += " FOR UPDATE SKIP LOCKED"
+
+        self._begin()
+        try:
+            row = self._execute(select, (self.job, PENDING, LEASED, now)).fetchone()
+            if row is not None:
+                self._execute(
+                    "UPDATE crawl_pages SET status = ?, worker = ?, lease_expires = ?, attempts = ?, "
+                    "updated_at = ? WHERE job = ? AND page = ?",
+                    (LEASED, worker, now + lease_seconds, row[1] + 1, now, self.job, row[0]),
+                )
+        except Exception:
+            self._end(commit=False)
+            raise
+        self._end()
+        return None if row is None else (row[0], row[1] + 1)
+
+    def _finish(self, page, worker, status, **fields):
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        cursor = self._execute(
+            f"UPDATE crawl_pages SET status = ?, lease_expires = NULL, updated_at = ?"
+            f"{', ' + assignments if assignments else ''} "
+            "WHERE job = ? AND page = ? AND worker = ? AND status = ?",
+            (status, time.time(), *fields.values(), self.job, page, worker, LEASED),
+        )
+        return cursor.rowcount == 1
+
+    def complete(self, page, worker, products, result_path):
+        """Mark a leased page done; returns False if the lease was lost to another worker."""
+        return self._finish(page, worker, DONE, products=products, result_path=result_path)
+
+    def mark_missing(self, page, worker):
+        """Mark a leased page as past the end of the catalog (404 / no products)."""
+        return self._finish(page, worker, MISSING)
+
+    def fail(self, page, worker, error, attempts, max_attempts=3):
+        """Give a failed page back to the queue, or mark it failed once it is out of attempts."""
+        status = FAILED if attempts >= max_attempts else PENDING
+        return self._finish(page, worker, status, error=str(error)[:500])
+
+    def requeue_expired(self):
+        """
+        Return pages whose lease expired (dead or hung workers) to the queue.
+
+        Returns:
+            List of (page, worker) pairs that were re-queued
+        """
+        now = time.time()
+        expired = self._execute(
+            "SELECT page, worker FROM crawl_pages WHERE job = ? AND status = ? AND lease_expires < ?",
+            (self.job, LEASED, now),
+        ).fetchall()
+        for page, worker in expired:
+            self._execute(
+                "UPDATE crawl_pages SET status = ?, lease_expires = NULL, updated_at = ? "
+                "WHERE job = ? AND page = ? AND worker = ? AND status = ? AND lease_expires < ?",
+                (PENDING, now, self.job, page, worker, LEASED, now),
+            )
+        return [tuple(row) for row in expired]
+
+    def counts(self):
+        """Number of pages per status."""
+        rows = self._execute(
+            "SELECT status, COUNT(*) FROM crawl_pages WHERE job = ? GROUP BY status", (self.job,)).fetchall()
+        counts = {status: 0 for status in (PENDING, LEASED, DONE, MISSING, FAILED)}
+        counts.update(dict(rows))
+        return counts
+
+    def done_pages(self):
+        """List of (page, result_path) of completed pages in page order."""
+        return [tuple(row) for row in self._execute(
+            "SELECT page, result_path FROM crawl_pages WHERE job = ? AND status = ? ORDER BY page",
+            (self.job, DONE),
+        ).fetchall()]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+
+
+def run_worker(queue_url, results_dir, base_url, first_page_url, job="default", worker_id=None,
+               lease_seconds=60, max_attempts=3, poll_interval=0.5, max_pages=None):
+    """
+    Crawl pages leased from the queue until none are left.
+
+    Each page is fetched, run through the extractor and written to
+    results_dir/page-<n>.jsonl before it is marked done. A page with a next
+    button enqueues the following page, so the crawl also covers pages past
+    the initially seeded range. The worker waits while other workers still
+    hold leases (they may enqueue more pages) and exits when nothing is
+    pending or leased.
+
+    Args:
+        queue_url: sqlite:///... or postgresql://... URL of the shared queue
+        results_dir: Directory for per-page result files (shared by all workers)
+        base_url: Format URL for page 2 onwards
+        first_page_url: URL of page 1
+        job: Crawl job name (several crawls can share one queue table)
+        worker_id: Unique worker name (default: host-pid-random)
+        lease_seconds: How long a page stays leased before another worker may take it
+        max_attempts: Attempts per page before it is marked failed
+        poll_interval: Seconds between polls while other workers hold leases
+        max_pages: Stop after this many pages (optional)
+
+    Returns:
+        Dictionary with pages, products, missing, errors and lost_leases counts
+    """
+    worker_id = worker_id or default_worker_id()
+    os.makedirs(results_dir, exist_ok=True)
+    stats = {"pages": 0, "products": 0, "missing": 0, "errors": 0, "lost_leases": 0}
+
+    with CrawlQueue(queue_url, job) as queue, requests.Session() as session:
+        while max_pages is None or stats["pages"] + stats["missing"] < max_pages:
+            lease = queue.claim(worker_id, lease_seconds)
+            if lease is None:
+                counts = queue.counts()
+                if not counts[PENDING] and not counts[LEASED]:
+                    break
+                time.sleep(poll_interval)
+                continue
+
+            page, attempts = lease
+            url = first_page_url if page == 1 else base_url.format(page)
+            try:
+                response = session.get(url, headers=HEADERS, timeout=10)
+                if response.status_code == 404:
+                    queue.mark_missing(page, worker_id)
+                    stats["missing"] += 1
+                    continue
+                response.raise_for_status()
+
+                products, has_next = parse_page(response_body(response))
+                if not products:
+                    queue.mark_missing(page, worker_id)
+                    stats["missing"] += 1
+                    continue
+
+                result_path = os.path.join(results_dir, f"page-{page:05d}.jsonl")
+                tmp_path = f"{result_path}.{worker_id}.tmp"
+                save_raw_products(products, tmp_path)
+                os.replace(tmp_path, result_path)
+
+                if has_next:
+                    queue.enqueue([page + 1])
+                if queue.complete(page, worker_id, len(products), result_path):
+                    stats["pages"] += 1
+                    stats["products"] += len(products)
+                else:
+                    stats["lost_leases"] += 1
+            except Exception as e:
+                print(f"[worker {worker_id}] Page {page} failed (attempt {attempts}): {e}")
+                queue.fail(page, worker_id, e, attempts, max_attempts)
+                stats["errors"] += 1
+
+    return stats
+
+
+def wait_for_crawl(queue_url, job="default", poll_interval=1.0, timeout=None):
+    """
+    Coordinator loop: re-queue pages held by dead workers until the crawl is finished.
+
+    Args:
+        queue_url: URL of the shared queue
+        job: Crawl job name
+        poll_interval: Seconds between checks
+        timeout: Give up after this many seconds (optional)
+
+    Returns:
+        Final per-status page counts
+    """
+    started = time.monotonic()
+    with CrawlQueue(queue_url, job) as queue:
+        while True:
+            for page, worker in queue.requeue_expired():
+                print(f"[coordinator] Lease of page {page} by {worker} expired, re-queued")
+            counts = queue.counts()
+            if not counts[PENDING] and not counts[LEASED]:
+                return counts
+            if timeout is not None and time.monotonic() - started > timeout:
+                print(f"[coordinator] Timed out with {counts[PENDING]} pending and {counts[LEASED]} leased pages")
+                return counts
+            time.sleep(poll_interval)
+
+
+def merge_results(queue_url, raw_path=None, job="default"):
+    """
+    Merge the per-page results of finished pages in page order.
+
+    Args:
+        queue_url: URL of the shared queue
+        raw_path: Write the merged raw products to this JSON Lines file (optional)
+        job: Crawl job name
+
+    Returns:
+        List of RawProduct records, in page order
+    """
+    with CrawlQueue(queue_url, job) as queue:
+        done_pages = queue.done_pages()
+
+    products = []
+    for _, result_path in done_pages:
+        products.extend(load_raw_products(result_path))
+    if raw_path:
+        save_raw_products(products, raw_path)
+    return products